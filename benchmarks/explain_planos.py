@@ -0,0 +1,95 @@
+"""
+Compara os planos de execução (EXPLAIN) das consultas de data antigas e novas
+
+Uso (a partir da raiz do projeto, com o banco configurado e populado):
+    python -m benchmarks.explain_planos
+
+Para cada consulta mostra o tipo de acesso, o índice escolhido e as linhas
+estimadas. Com a coluna envolvida em DATE() o MySQL não consegue usar um
+índice de faixa e lê a tabela inteira (ALL) ou todas as linhas do status;
+com o intervalo semiaberto o acesso passa a ser "range".
+"""
+import time
+from datetime import date, timedelta
+from core.database import DatabaseManager
+from core.migrations import Migrations
+
+hoje = date.today()
+
+CONSULTAS = [
+    (
+        "Tarefas pendentes de hoje",
+        """
+            SELECT * FROM tarefas
+            WHERE status = 'Pendente' AND DATE(data_hora) = CURDATE()
+        """,
+        """
+            SELECT * FROM tarefas
+            WHERE status = 'Pendente'
+            AND data_hora >= CURDATE() AND data_hora < CURDATE() + INTERVAL 1 DAY
+        """,
+        None,
+    ),
+    (
+        "Tarefas de hoje (qualquer status)",
+        "SELECT * FROM tarefas WHERE DATE(data_hora) = CURDATE()",
+        """
+            SELECT * FROM tarefas
+            WHERE data_hora >= CURDATE() AND data_hora < CURDATE() + INTERVAL 1 DAY
+        """,
+        None,
+    ),
+    (
+        "Vendas por período",
+        """
+            SELECT DATE(criado_em) AS data, SUM(valor) AS total
+            FROM oportunidades
+            WHERE etapa = 'Fechado' AND DATE(criado_em) BETWEEN %s AND %s
+            GROUP BY DATE(criado_em)
+        """,
+        """
+            SELECT DATE(criado_em) AS data, SUM(valor) AS total
+            FROM oportunidades
+            WHERE etapa = 'Fechado' AND criado_em >= %s AND criado_em < %s
+            GROUP BY DATE(criado_em)
+        """,
+        ((hoje - timedelta(days=30), hoje), (hoje - timedelta(days=30), hoje + timedelta(days=1))),
+    ),
+]
+
+
+def explicar(query: str, params=None) -> list:
+    """Retorna as linhas do EXPLAIN da consulta"""
+    return DatabaseManager.execute_query(f"EXPLAIN {query}", params, fetch=True)
+
+
+def cronometrar(query: str, params=None, repeticoes: int = 20) -> float:
+    """Tempo médio de execução da consulta em milissegundos"""
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        DatabaseManager.execute_query(query, params, fetch=True)
+    return (time.perf_counter() - inicio) * 1000 / repeticoes
+
+
+def formatar_plano(linhas: list) -> str:
+    return "; ".join(
+        f"type={linha.get('type')} key={linha.get('key')} rows={linha.get('rows')}"
+        for linha in linhas
+    )
+
+
+def main():
+    DatabaseManager.create_connection_pool()
+    Migrations.run_migrations()
+
+    for titulo, antiga, nova, params in CONSULTAS:
+        params_antiga, params_nova = params if params else (None, None)
+        print(f"\n{titulo}")
+        print(f"  antes : {formatar_plano(explicar(antiga, params_antiga))}")
+        print(f"          {cronometrar(antiga, params_antiga):.2f} ms")
+        print(f"  depois: {formatar_plano(explicar(nova, params_nova))}")
+        print(f"          {cronometrar(nova, params_nova):.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Compara o mapeamento de linhas em entidades: dict por linha x tuplas
+
+Uso (a partir da raiz do projeto; não precisa de banco):
+    python -m benchmarks.mapeamento [linhas]
+
+Simula o resultado de uma listagem de oportunidades e mede:
+  - dict: o cursor(dictionary=True) montando um dict por linha, seguido de
+    _row_to_entity com um row.get() por campo (caminho antigo);
+  - tuplas: o mapeador de repositories.mapeamento, com os índices das
+    colunas calculados uma vez;
+e a memória por entidade com e sem __slots__.
+"""
+import sys
+import time
+import tracemalloc
+from dataclasses import fields, make_dataclass
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from models.oportunidade import Oportunidade
+from repositories.mapeamento import criar_mapeador
+from repositories.oportunidade_repository import OportunidadeRepository
+
+COLUNAS = (
+    'id', 'cliente_id', 'titulo', 'etapa', 'valor', 'probabilidade',
+    'data_prevista_fechamento', 'responsavel', 'observacoes', 'criado_em',
+    'atualizado_em', 'cliente_nome',
+)
+
+
+def gerar_linhas(quantidade: int) -> list:
+    agora = datetime.now()
+    return [
+        (i, i % 500 + 1, f"Oportunidade {i}", 'Proposta', Decimal('1500.00') + i, i % 100,
+         date.today() + timedelta(days=i % 60), 'Ana', '', agora, agora, f"Cliente {i % 500}")
+        for i in range(1, quantidade + 1)
+    ]
+
+
+def cronometrar(funcao, repeticoes: int = 5) -> float:
+    """Melhor tempo, em milissegundos, entre as repetições"""
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor * 1000
+
+
+def memoria_por_entidade(classe, linhas: list) -> float:
+    """Bytes alocados por entidade mapeada (inclui o float de valor)"""
+    mapear = criar_mapeador(classe, COLUNAS, OportunidadeRepository.CONVERSORES)
+    tracemalloc.start()
+    entidades = [mapear(linha) for linha in linhas]
+    atual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del entidades
+    return atual / len(linhas)
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    linhas = gerar_linhas(quantidade)
+    repo = OportunidadeRepository()
+    mapear = repo._mapeador(COLUNAS)
+
+    def caminho_dict():
+        return [repo._row_to_entity(dict(zip(COLUNAS, linha))) for linha in linhas]
+
+    def caminho_tuplas():
+        return [mapear(linha) for linha in linhas]
+
+    assert caminho_dict() == caminho_tuplas()
+
+    tempo_dict = cronometrar(caminho_dict)
+    tempo_tuplas = cronometrar(caminho_tuplas)
+    print(f"\n{quantidade} linhas de oportunidades")
+    print(f"  dict + _row_to_entity : {tempo_dict:8.1f} ms")
+    print(f"  tuplas + mapeador     : {tempo_tuplas:8.1f} ms   ({tempo_dict / tempo_tuplas:.2f}x)")
+
+    sem_slots = make_dataclass(
+        'OportunidadeSemSlots', [(f.name, f.type, f.default) for f in fields(Oportunidade)]
+    )
+    print("\nMemória por entidade")
+    print(f"  sem __slots__ : {memoria_por_entidade(sem_slots, linhas):6.0f} bytes")
+    print(f"  com __slots__ : {memoria_por_entidade(Oportunidade, linhas):6.0f} bytes")
+
+
+if __name__ == "__main__":
+    main()
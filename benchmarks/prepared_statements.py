@@ -0,0 +1,75 @@
+"""
+Compara a latência por consulta com e sem o cache de prepared statements
+
+Uso (a partir da raiz do projeto, com o banco configurado e populado):
+    python -m benchmarks.prepared_statements [repeticoes]
+
+Executa as consultas mais frequentes da aplicação (busca por ID, mudança de
+etapa e listagem de tarefas pendentes de hoje) com o pool padrão e depois
+com DB_PREPARED_STATEMENTS ativo, e mostra o tempo médio de cada uma.
+"""
+import sys
+import time
+from core.database import DatabaseManager
+from core.migrations import Migrations
+from repositories.cliente_repository import ClienteRepository
+from repositories.oportunidade_repository import OportunidadeRepository
+from repositories.tarefa_repository import TarefaRepository
+
+
+def preparar_casos() -> list:
+    """Monta as operações medidas a partir de registros existentes"""
+    cliente_repo = ClienteRepository()
+    oportunidade_repo = OportunidadeRepository()
+    tarefa_repo = TarefaRepository()
+
+    cliente_ids = [c.id for c in cliente_repo.listar_pagina(limite=50).itens]
+    oportunidades = oportunidade_repo.listar_pagina(limite=50).itens
+    if not cliente_ids or not oportunidades:
+        raise SystemExit("Banco vazio: rode seed_database.py antes do benchmark")
+
+    return [
+        ("buscar_por_id (clientes)",
+         lambda i: cliente_repo.buscar_por_id(cliente_ids[i % len(cliente_ids)])),
+        # Regrava a etapa atual: mede o UPDATE sem alterar os dados
+        ("atualizar_etapa (oportunidades)",
+         lambda i: oportunidade_repo.atualizar_etapa(
+             oportunidades[i % len(oportunidades)].id, oportunidades[i % len(oportunidades)].etapa)),
+        ("buscar_pendentes_hoje (tarefas)",
+         lambda i: tarefa_repo.buscar_pendentes_hoje()),
+    ]
+
+
+def cronometrar(operacao, repeticoes: int) -> float:
+    """Tempo médio da operação em milissegundos"""
+    operacao(0)  # aquecimento (prepara o statement no modo com cache)
+    inicio = time.perf_counter()
+    for i in range(repeticoes):
+        operacao(i)
+    return (time.perf_counter() - inicio) * 1000 / repeticoes
+
+
+def medir(prepared_statements: bool, repeticoes: int) -> dict:
+    DatabaseManager.create_connection_pool(prepared_statements=prepared_statements)
+    return {nome: cronometrar(operacao, repeticoes) for nome, operacao in preparar_casos()}
+
+
+def main():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    DatabaseManager.create_connection_pool()
+    Migrations.run_migrations()
+
+    sem_cache = medir(False, repeticoes)
+    com_cache = medir(True, repeticoes)
+
+    print(f"\n{repeticoes} execuções por consulta (tempo médio)")
+    for nome, antes in sem_cache.items():
+        depois = com_cache[nome]
+        print(f"  {nome:34} sem cache: {antes:6.3f} ms   com cache: {depois:6.3f} ms"
+              f"   ({antes / depois:4.2f}x)")
+    print(f"\nCache: {DatabaseManager._prepared_cache.estatisticas()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,25 +3,50 @@ Gerenciamento de conexão com banco de dados MySQL
 """
 import mysql.connector
 from mysql.connector import Error, pooling
-from typing import Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterable, Iterator, Optional, Tuple
 import logging
-from core.settings import DB_CONFIG
+from core.settings import (DB_CONFIG, DB_PREPARED_STATEMENTS, DB_PREPARED_CACHE_TAMANHO,
+                           DB_QUERY_CACHE, DB_QUERY_CACHE_TTL, DB_QUERY_CACHE_TAMANHO)
+from core.prepared_statements import CachePreparedStatements
+from core.query_cache import CacheConsultas, eh_leitura, tabelas_da_query
 
 logger = logging.getLogger(__name__)
 
+# Tabelas alteradas dentro da transaction() corrente, invalidadas de novo no commit
+_tabelas_transacao: ContextVar[Optional[set]] = ContextVar('tabelas_transacao', default=None)
+
+
+def _copiar_linhas(linhas: list) -> list:
+    """Cópia das linhas guardadas no cache, para que quem recebe possa alterá-las"""
+    return [dict(linha) if isinstance(linha, dict) else linha for linha in linhas]
+
+
 class DatabaseManager:
     """Gerenciador de conexões com MySQL"""
     
     _connection_pool: Optional[pooling.MySQLConnectionPool] = None
+    _prepared_cache: Optional[CachePreparedStatements] = None
+    _query_cache: Optional[CacheConsultas] = None
     
     @classmethod
-    def create_connection_pool(cls, pool_size: int = 5):
+    def create_connection_pool(cls, pool_size: int = 5,
+                               prepared_statements: bool = DB_PREPARED_STATEMENTS,
+                               cache_consultas: bool = DB_QUERY_CACHE):
         """Cria um pool de conexões MySQL"""
         try:
+            cls._prepared_cache = (
+                CachePreparedStatements(DB_PREPARED_CACHE_TAMANHO) if prepared_statements else None
+            )
+            cls._query_cache = (
+                CacheConsultas(DB_QUERY_CACHE_TAMANHO, DB_QUERY_CACHE_TTL) if cache_consultas else None
+            )
             cls._connection_pool = pooling.MySQLConnectionPool(
                 pool_name="crm_pool",
                 pool_size=pool_size,
-                pool_reset_session=True,
+                # Reiniciar a sessão na devolução desaloca os prepared statements
+                pool_reset_session=not prepared_statements,
                 **DB_CONFIG
             )
             logger.info(f"Pool de conexões criado com sucesso (tamanho: {pool_size})")
@@ -48,6 +73,25 @@ class DatabaseManager:
                 logger.error(f"Erro ao criar conexão direta: {fallback_error}")
                 raise
     
+    @classmethod
+    def _devolver(cls, conn):
+        """Devolve ao pool uma conexão usada fora de transaction().
+        
+        Com prepared statements o pool não reinicia a sessão na devolução, e
+        com autocommit=False uma leitura deixa a transação aberta: o rollback
+        a encerra, senão a próxima consulta nessa conexão reaproveitaria o
+        snapshot (REPEATABLE READ) antigo e não veria alterações recentes.
+        """
+        if not conn.is_connected():
+            return
+        try:
+            if cls._prepared_cache is not None and conn.in_transaction:
+                conn.rollback()
+        except Error as e:
+            logger.error(f"Erro ao encerrar transação de leitura: {e}")
+        finally:
+            conn.close()
+    
     @classmethod
     def test_connection(cls) -> bool:
         """Testa a conexão com o banco de dados"""
@@ -59,63 +103,295 @@ class DatabaseManager:
                 version = cursor.fetchone()
                 logger.info(f"Conectado ao MySQL versão: {version[0]}")
                 cursor.close()
-                conn.close()
+                cls._devolver(conn)
                 return True
         except Error as e:
             logger.error(f"Erro ao testar conexão: {e}")
             return False
     
     @classmethod
-    def execute_query(cls, query: str, params: tuple = None, fetch: bool = False):
-        """Executa uma query e retorna o resultado se fetch=True"""
-        conn = None
-        cursor = None
+    @contextmanager
+    def transaction(cls):
+        """Unidade de trabalho: uma conexão e um único commit.
+        
+        Uso:
+            with DatabaseManager.transaction() as conn:
+                repo.criar(entidade, conn=conn)
+                interacao_repo.criar(interacao, conn=conn)
+        
+        Faz commit ao sair do bloco e rollback se uma exceção escapar dele.
+        """
+        conn = cls.get_connection()
+        token = _tabelas_transacao.set(set())
         try:
-            conn = cls.get_connection()
-            cursor = conn.cursor(dictionary=True)
+            yield conn
+            conn.commit()
+            # Outras conexões podem ter guardado no cache o estado anterior
+            # ao commit entre a escrita e este ponto
+            cls.invalidar_cache(_tabelas_transacao.get())
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            _tabelas_transacao.reset(token)
+            if conn.is_connected():
+                conn.close()
+    
+    @classmethod
+    def execute_query(cls, query: str, params: tuple = None, fetch: bool = False, conn=None):
+        """Executa uma query e retorna o resultado se fetch=True
+        
+        Se conn for informada (ver transaction()), a query roda nessa conexão
+        e o commit/rollback fica a cargo de quem abriu a transação. Leituras
+        fora de transação passam pelo cache de consultas, se ativo.
+        """
+        propria = conn is None
+        chave = cls._chave_cache(query, params, 'dict') if propria and fetch else None
+        if chave:
+            encontrado, linhas = cls._query_cache.obter(chave)
+            if encontrado:
+                return _copiar_linhas(linhas)
+            geracao = cls._query_cache.geracao()
+        
+        cursor_avulso = None
+        try:
+            if propria:
+                conn = cls.get_connection()
             
-            if params:
-                cursor.execute(query, params)
-            else:
-                cursor.execute(query)
+            cursor = cls._executar_preparado(conn, query, params)
+            if cursor is None:
+                cursor = cursor_avulso = conn.cursor(dictionary=True)
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
             
             if fetch:
                 result = cursor.fetchall()
+                if chave:
+                    cls._query_cache.guardar(chave, tabelas_da_query(query),
+                                             _copiar_linhas(result), geracao=geracao)
             else:
-                conn.commit()
+                if propria:
+                    conn.commit()
                 result = cursor.lastrowid if cursor.lastrowid else True
             
+            cls._registrar_escrita(query)
             return result
         except Error as e:
-            if conn:
+            if propria and conn:
                 conn.rollback()
             logger.error(f"Erro ao executar query: {e}")
             raise
         finally:
-            if cursor:
-                cursor.close()
-            if conn and conn.is_connected():
-                conn.close()
+            if cursor_avulso:
+                cursor_avulso.close()
+            if propria and conn:
+                cls._devolver(conn)
     
     @classmethod
-    def execute_many(cls, query: str, params_list: list):
-        """Executa uma query múltiplas vezes com diferentes parâmetros"""
+    def fetch_rows(cls, query: str, params: tuple = None, conn=None,
+                   usar_cache: bool = True) -> Tuple[tuple, list]:
+        """Executa uma consulta e retorna (nomes das colunas, linhas como tuplas).
+        
+        Evita o dict por linha do cursor(dictionary=True); usado pelas
+        listagens dos repositories com repositories.mapeamento. usar_cache=False
+        sempre vai ao banco (ex.: consultas que detectam alterações externas).
+        """
+        propria = conn is None
+        chave = cls._chave_cache(query, params, 'tupla') if propria and usar_cache else None
+        if chave:
+            encontrado, resultado = cls._query_cache.obter(chave)
+            if encontrado:
+                colunas, linhas = resultado
+                return colunas, list(linhas)
+            geracao = cls._query_cache.geracao()
+        
+        cursor_avulso = None
+        try:
+            if propria:
+                conn = cls.get_connection()
+            
+            cursor = cls._executar_preparado(conn, query, params, dicionario=False)
+            if cursor is None:
+                cursor = cursor_avulso = conn.cursor()
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+            
+            linhas = cursor.fetchall()
+            colunas = tuple(cursor.column_names)
+            if chave:
+                cls._query_cache.guardar(chave, tabelas_da_query(query),
+                                         (colunas, list(linhas)), geracao=geracao)
+            return colunas, linhas
+        except Error as e:
+            logger.error(f"Erro ao executar query: {e}")
+            raise
+        finally:
+            if cursor_avulso:
+                cursor_avulso.close()
+            if propria and conn:
+                cls._devolver(conn)
+    
+    @classmethod
+    def execute_queries(cls, queries: list) -> list:
+        """Executa várias consultas de leitura em uma única conexão.
+
+        Recebe uma lista de tuplas (query, params) e retorna uma lista com o
+        resultado (fetchall) de cada consulta, na mesma ordem. Consultas
+        presentes no cache de consultas não vão ao banco.
+        """
         conn = None
+        cursor_avulso = None
+        try:
+            resultados = []
+            for query, params in queries:
+                chave = cls._chave_cache(query, params, 'dict')
+                if chave:
+                    encontrado, linhas = cls._query_cache.obter(chave)
+                    if encontrado:
+                        resultados.append(_copiar_linhas(linhas))
+                        continue
+                    geracao = cls._query_cache.geracao()
+                
+                if conn is None:
+                    conn = cls.get_connection()
+                cursor = cls._executar_preparado(conn, query, params)
+                if cursor is None:
+                    if cursor_avulso is None:
+                        cursor_avulso = conn.cursor(dictionary=True)
+                    cursor = cursor_avulso
+                    if params:
+                        cursor.execute(query, params)
+                    else:
+                        cursor.execute(query)
+                linhas = cursor.fetchall()
+                if chave:
+                    cls._query_cache.guardar(chave, tabelas_da_query(query),
+                                             _copiar_linhas(linhas), geracao=geracao)
+                resultados.append(linhas)
+
+            return resultados
+        except Error as e:
+            logger.error(f"Erro ao executar consultas: {e}")
+            raise
+        finally:
+            if cursor_avulso:
+                cursor_avulso.close()
+            if conn:
+                cls._devolver(conn)
+
+    @classmethod
+    def stream(cls, query: str, params: tuple = None, batch_size: int = 1000) -> Iterator[dict]:
+        """Gera as linhas de uma consulta em lotes, sem carregar o resultado inteiro.
+        
+        Usa um cursor sem buffer: o servidor envia as linhas conforme são
+        lidas com fetchmany. A conexão fica reservada enquanto o gerador
+        estiver aberto e é devolvida ao pool quando ele termina, é fechado
+        (close() ou saída antecipada de um for) ou quando ocorre um erro.
+        """
+        conn = cls.get_connection()
         cursor = None
         try:
-            conn = cls.get_connection()
+            cursor = conn.cursor(dictionary=True, buffered=False)
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
+            
+            while True:
+                linhas = cursor.fetchmany(batch_size)
+                if not linhas:
+                    break
+                yield from linhas
+        except Error as e:
+            logger.error(f"Erro ao ler consulta em streaming: {e}")
+            raise
+        finally:
+            try:
+                # Linhas não lidas impedem o reuso da conexão: descarta o resto
+                if conn.unread_result:
+                    conn.consume_results()
+                if cursor:
+                    cursor.close()
+            except Error as e:
+                logger.error(f"Erro ao encerrar consulta em streaming: {e}")
+            finally:
+                cls._devolver(conn)
+    
+    @classmethod
+    def _executar_preparado(cls, conn, query: str, params: tuple = None, dicionario: bool = True):
+        """Executa via cache de prepared statements, se ativo.
+        
+        Retorna o cursor (pertencente ao cache, não deve ser fechado) ou None
+        quando o cache está desligado ou a query não pode ser preparada.
+        """
+        if cls._prepared_cache is None:
+            return None
+        return cls._prepared_cache.executar(conn, query, params, dicionario)
+    
+    @classmethod
+    def _chave_cache(cls, query: str, params: tuple, tipo: str) -> Optional[tuple]:
+        """Chave da consulta no cache de consultas, ou None se ela não deve
+        passar pelo cache (cache desligado ou query que não é leitura)"""
+        if cls._query_cache is None or not eh_leitura(query):
+            return None
+        return cls._query_cache.chave(query, params, tipo)
+    
+    @classmethod
+    def _registrar_escrita(cls, query: str):
+        """Invalida no cache as tabelas alteradas por uma escrita"""
+        if cls._query_cache is None or eh_leitura(query):
+            return
+        tabelas = tabelas_da_query(query)
+        cls.invalidar_cache(tabelas)
+        pendentes = _tabelas_transacao.get()
+        if pendentes is not None:
+            pendentes.update(tabelas)
+    
+    @classmethod
+    def invalidar_cache(cls, tabelas: Iterable[str]):
+        """Descarta do cache de consultas os resultados que leem as tabelas"""
+        if cls._query_cache is not None and tabelas:
+            cls._query_cache.invalidar_tabelas(tabelas)
+    
+    @classmethod
+    def estatisticas_cache(cls) -> dict:
+        """Contadores do cache de consultas (vazio se o cache estiver desligado)"""
+        if cls._query_cache is None:
+            return {}
+        return cls._query_cache.estatisticas()
+    
+    @classmethod
+    def limpar_cache(cls):
+        """Descarta todos os resultados do cache de consultas"""
+        if cls._query_cache is not None:
+            cls._query_cache.limpar()
+    
+    @classmethod
+    def execute_many(cls, query: str, params_list: list, conn=None):
+        """Executa uma query múltiplas vezes com diferentes parâmetros"""
+        propria = conn is None
+        cursor = None
+        try:
+            if propria:
+                conn = cls.get_connection()
             cursor = conn.cursor()
             cursor.executemany(query, params_list)
-            conn.commit()
+            if propria:
+                conn.commit()
+            cls._registrar_escrita(query)
             return True
         except Error as e:
-            if conn:
+            if propria and conn:
                 conn.rollback()
             logger.error(f"Erro ao executar query múltipla: {e}")
             raise
         finally:
             if cursor:
                 cursor.close()
-            if conn and conn.is_connected():
-                conn.close()
+            if propria and conn:
+                cls._devolver(conn)
 
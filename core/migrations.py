@@ -1,5 +1,9 @@
 """
 Scripts de criação e atualização das tabelas do banco de dados MySQL
+
+As migrações são passos numerados e idempotentes. A versão aplicada fica
+registrada na tabela schema_version; na inicialização basta uma consulta
+para descobrir a versão atual e aplicar apenas os passos pendentes.
 """
 import logging
 from core.database import DatabaseManager
@@ -7,6 +11,157 @@ from mysql.connector import Error
 
 logger = logging.getLogger(__name__)
 
+# Erros que indicam que o passo já foi aplicado (tornam ALTERs idempotentes)
+ER_DUP_FIELDNAME = 1060  # coluna já existe
+ER_DUP_KEYNAME = 1061  # índice já existe
+ER_NO_SUCH_TABLE = 1146
+
+ERROS_IGNORAVEIS = (ER_DUP_FIELDNAME, ER_DUP_KEYNAME)
+
+TABELAS_INICIAIS = [
+    """
+        CREATE TABLE IF NOT EXISTS clientes (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            nome VARCHAR(255) NOT NULL,
+            email VARCHAR(255),
+            telefone VARCHAR(20),
+            empresa VARCHAR(255),
+            cnpj_cpf VARCHAR(18),
+            endereco_rua VARCHAR(255),
+            endereco_numero VARCHAR(20),
+            endereco_bairro VARCHAR(100),
+            endereco_cidade VARCHAR(100),
+            endereco_estado VARCHAR(2),
+            endereco_cep VARCHAR(10),
+            observacoes TEXT,
+            criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            INDEX idx_nome (nome(191)),
+            INDEX idx_email (email(191)),
+            INDEX idx_empresa (empresa(191)),
+            INDEX idx_cidade (endereco_cidade)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+    """
+        CREATE TABLE IF NOT EXISTS oportunidades (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            cliente_id INT NOT NULL,
+            titulo VARCHAR(255) NOT NULL,
+            etapa ENUM('Lead', 'Qualificação', 'Proposta', 'Negociação', 'Fechado', 'Perdido') NOT NULL DEFAULT 'Lead',
+            valor DECIMAL(15, 2) DEFAULT 0.00,
+            probabilidade INT DEFAULT 0 CHECK (probabilidade >= 0 AND probabilidade <= 100),
+            data_prevista_fechamento DATE,
+            responsavel VARCHAR(255),
+            observacoes TEXT,
+            criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (cliente_id) REFERENCES clientes(id) ON DELETE CASCADE,
+            INDEX idx_cliente (cliente_id),
+            INDEX idx_etapa (etapa),
+            INDEX idx_data_fechamento (data_prevista_fechamento)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+    """
+        CREATE TABLE IF NOT EXISTS tarefas (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            cliente_id INT NOT NULL,
+            descricao VARCHAR(500) NOT NULL,
+            tipo ENUM('Ligação', 'Email', 'Reunião', 'WhatsApp', 'Visita', 'Outro') DEFAULT 'Outro',
+            data_hora DATETIME NOT NULL,
+            status ENUM('Pendente', 'Concluída') DEFAULT 'Pendente',
+            prioridade ENUM('Baixa', 'Média', 'Alta') DEFAULT 'Média',
+            observacoes TEXT,
+            criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            concluida_em TIMESTAMP NULL,
+            FOREIGN KEY (cliente_id) REFERENCES clientes(id) ON DELETE CASCADE,
+            INDEX idx_cliente (cliente_id),
+            INDEX idx_data_hora (data_hora),
+            INDEX idx_status (status),
+            INDEX idx_prioridade (prioridade)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+    """
+        CREATE TABLE IF NOT EXISTS interacoes (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            cliente_id INT NOT NULL,
+            tipo VARCHAR(50) NOT NULL,
+            descricao TEXT,
+            criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (cliente_id) REFERENCES clientes(id) ON DELETE CASCADE,
+            INDEX idx_cliente (cliente_id),
+            INDEX idx_tipo (tipo),
+            INDEX idx_criado_em (criado_em)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+    """
+        CREATE TABLE IF NOT EXISTS usuarios (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            nome VARCHAR(255) NOT NULL,
+            email VARCHAR(191) UNIQUE NOT NULL,
+            senha_hash VARCHAR(255) NOT NULL,
+            nivel_acesso ENUM('Admin', 'Vendedor', 'Visualizador') DEFAULT 'Vendedor',
+            ativo TINYINT(1) DEFAULT 1,
+            criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+]
+
+# Passos de migração em ordem: (versão, descrição, comandos SQL)
+MIGRACOES = [
+    (1, "Tabelas iniciais", TABELAS_INICIAIS),
+    (2, "Índice FULLTEXT para busca de clientes", [
+        """
+        ALTER TABLE clientes
+        ADD FULLTEXT INDEX ft_clientes_busca (nome, email, empresa, endereco_cidade)
+        """,
+    ]),
+    (3, "Índice (status, data_hora) em tarefas", [
+        "ALTER TABLE tarefas ADD INDEX idx_status_data_hora (status, data_hora)",
+    ]),
+    (4, "Índices compostos por etapa em oportunidades", [
+        "ALTER TABLE oportunidades ADD INDEX idx_etapa_criado_em (etapa, criado_em)",
+        """
+        ALTER TABLE oportunidades
+        ADD INDEX idx_etapa_data_fechamento (etapa, data_prevista_fechamento)
+        """,
+    ]),
+    (5, "Índice de atualizado_em em clientes", [
+        "ALTER TABLE clientes ADD INDEX idx_atualizado_em (atualizado_em)",
+    ]),
+    # Cobre a ordenação de proximas_fechamento (data, probabilidade DESC);
+    # índices descendentes exigem MySQL 8 (versões anteriores ignoram o DESC)
+    (6, "Índice de fechamento por etapa e probabilidade em oportunidades", [
+        """
+        ALTER TABLE oportunidades
+        ADD INDEX idx_etapa_fechamento_prob (etapa, data_prevista_fechamento, probabilidade DESC)
+        """,
+    ]),
+    # Assinaturas do monitor de alterações (AlteracoesService): MAX(atualizado_em)
+    # precisa da coluna indexada nas tabelas monitoradas
+    (7, "Coluna atualizado_em em tarefas e índices de atualizado_em", [
+        """
+        ALTER TABLE tarefas
+        ADD COLUMN atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        """,
+        "ALTER TABLE tarefas ADD INDEX idx_atualizado_em (atualizado_em)",
+        "ALTER TABLE oportunidades ADD INDEX idx_atualizado_em (atualizado_em)",
+    ]),
+    # Exclusões registradas por BaseRepository.excluir, lidas por
+    # alteradas_desde para retirar das listagens as linhas apagadas
+    (8, "Registro de exclusões", [
+        """
+        CREATE TABLE IF NOT EXISTS exclusoes (
+            id BIGINT AUTO_INCREMENT PRIMARY KEY,
+            tabela VARCHAR(64) NOT NULL,
+            registro_id INT NOT NULL,
+            excluido_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            INDEX idx_tabela_excluido_em (tabela, excluido_em)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """,
+    ]),
+]
+
+
 class Migrations:
     """Gerencia as migrações do banco de dados"""
     
@@ -33,204 +188,86 @@ class Migrations:
             return False
     
     @staticmethod
-    def table_exists(table_name: str) -> bool:
-        """Verifica se uma tabela existe"""
-        conn = None
-        cursor = None
+    def versao_atual(cursor) -> int:
+        """Retorna a versão do schema (0 se a tabela schema_version não existe)"""
         try:
-            conn = DatabaseManager.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT COUNT(*) 
-                FROM information_schema.tables 
-                WHERE table_schema = DATABASE() 
-                AND table_name = %s
-            """, (table_name,))
+            cursor.execute("SELECT MAX(versao) FROM schema_version")
             result = cursor.fetchone()
-            return result[0] > 0
+            return result[0] or 0
         except Error as e:
-            logger.error(f"Erro ao verificar existência da tabela '{table_name}': {e}")
-            return False
-        finally:
-            if cursor:
-                cursor.close()
-            if conn and conn.is_connected():
-                conn.close()
+            if e.errno == ER_NO_SUCH_TABLE:
+                return 0
+            raise
     
     @staticmethod
-    def all_tables_exist() -> bool:
-        """Verifica se todas as tabelas necessárias existem"""
-        required_tables = ['clientes', 'oportunidades', 'tarefas', 'interacoes', 'usuarios']
-        for table in required_tables:
-            if not Migrations.table_exists(table):
-                return False
-        return True
+    def versao_mais_recente() -> int:
+        """Retorna a versão do último passo de migração conhecido"""
+        return MIGRACOES[-1][0]
     
     @staticmethod
-    def create_tables():
-        """Cria todas as tabelas do sistema"""
-        Migrations.create_database_if_not_exists()
-        
-        # Verificar se todas as tabelas já existem
-        if Migrations.all_tables_exist():
-            logger.info("Todas as tabelas já existem. Migrações não necessárias.")
-            return True
-        
-        tables = {
-            'clientes': """
-                CREATE TABLE IF NOT EXISTS clientes (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    nome VARCHAR(255) NOT NULL,
-                    email VARCHAR(255),
-                    telefone VARCHAR(20),
-                    empresa VARCHAR(255),
-                    cnpj_cpf VARCHAR(18),
-                    endereco_rua VARCHAR(255),
-                    endereco_numero VARCHAR(20),
-                    endereco_bairro VARCHAR(100),
-                    endereco_cidade VARCHAR(100),
-                    endereco_estado VARCHAR(2),
-                    endereco_cep VARCHAR(10),
-                    observacoes TEXT,
-                    criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                    INDEX idx_nome (nome(191)),
-                    INDEX idx_email (email(191)),
-                    INDEX idx_empresa (empresa(191)),
-                    INDEX idx_cidade (endereco_cidade)
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-            """,
-            'oportunidades': """
-                CREATE TABLE IF NOT EXISTS oportunidades (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    cliente_id INT NOT NULL,
-                    titulo VARCHAR(255) NOT NULL,
-                    etapa ENUM('Lead', 'Qualificação', 'Proposta', 'Negociação', 'Fechado', 'Perdido') NOT NULL DEFAULT 'Lead',
-                    valor DECIMAL(15, 2) DEFAULT 0.00,
-                    probabilidade INT DEFAULT 0 CHECK (probabilidade >= 0 AND probabilidade <= 100),
-                    data_prevista_fechamento DATE,
-                    responsavel VARCHAR(255),
-                    observacoes TEXT,
-                    criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                    FOREIGN KEY (cliente_id) REFERENCES clientes(id) ON DELETE CASCADE,
-                    INDEX idx_cliente (cliente_id),
-                    INDEX idx_etapa (etapa),
-                    INDEX idx_data_fechamento (data_prevista_fechamento)
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-            """,
-            'tarefas': """
-                CREATE TABLE IF NOT EXISTS tarefas (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    cliente_id INT NOT NULL,
-                    descricao VARCHAR(500) NOT NULL,
-                    tipo ENUM('Ligação', 'Email', 'Reunião', 'WhatsApp', 'Visita', 'Outro') DEFAULT 'Outro',
-                    data_hora DATETIME NOT NULL,
-                    status ENUM('Pendente', 'Concluída') DEFAULT 'Pendente',
-                    prioridade ENUM('Baixa', 'Média', 'Alta') DEFAULT 'Média',
-                    observacoes TEXT,
-                    criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    concluida_em TIMESTAMP NULL,
-                    FOREIGN KEY (cliente_id) REFERENCES clientes(id) ON DELETE CASCADE,
-                    INDEX idx_cliente (cliente_id),
-                    INDEX idx_data_hora (data_hora),
-                    INDEX idx_status (status),
-                    INDEX idx_prioridade (prioridade)
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-            """,
-            'interacoes': """
-                CREATE TABLE IF NOT EXISTS interacoes (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    cliente_id INT NOT NULL,
-                    tipo VARCHAR(50) NOT NULL,
-                    descricao TEXT,
-                    criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (cliente_id) REFERENCES clientes(id) ON DELETE CASCADE,
-                    INDEX idx_cliente (cliente_id),
-                    INDEX idx_tipo (tipo),
-                    INDEX idx_criado_em (criado_em)
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-            """,
-            'usuarios': """
-                CREATE TABLE IF NOT EXISTS usuarios (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    nome VARCHAR(255) NOT NULL,
-                    email VARCHAR(191) UNIQUE NOT NULL,
-                    senha_hash VARCHAR(255) NOT NULL,
-                    nivel_acesso ENUM('Admin', 'Vendedor', 'Visualizador') DEFAULT 'Vendedor',
-                    ativo TINYINT(1) DEFAULT 1,
-                    criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-            """
-        }
-        
+    def _executar_comando(cursor, sql: str):
+        """Executa um comando de migração ignorando erros de 'já existe'"""
+        try:
+            cursor.execute(sql)
+        except Error as e:
+            if e.errno in ERROS_IGNORAVEIS:
+                logger.debug(f"Comando já aplicado anteriormente: {e}")
+                return
+            raise
+    
+    @staticmethod
+    def run_migrations():
+        """Aplica os passos de migração pendentes (apenas se necessário)"""
         conn = None
         cursor = None
+        versao = 0
         try:
             conn = DatabaseManager.get_connection()
             cursor = conn.cursor()
             
-            tabelas_criadas = []
-            tabelas_com_erro = []
+            versao = Migrations.versao_atual(cursor)
+            if versao >= Migrations.versao_mais_recente():
+                logger.info(f"Banco de dados já está atualizado (versão {versao}).")
+                return True
             
-            for table_name, create_sql in tables.items():
-                try:
-                    # Verificar se a tabela já existe antes de criar
-                    if Migrations.table_exists(table_name):
-                        logger.debug(f"Tabela '{table_name}' já existe, pulando criação")
-                        tabelas_criadas.append(table_name)
-                        continue
-                    
-                    cursor.execute(create_sql)
-                    conn.commit()
-                    logger.info(f"Tabela '{table_name}' criada com sucesso")
-                    tabelas_criadas.append(table_name)
-                except Error as e:
-                    logger.error(f"Erro ao criar tabela '{table_name}': {e}")
-                    tabelas_com_erro.append((table_name, str(e)))
-                    conn.rollback()
-                    # Continua tentando criar as outras tabelas
-                    continue
+            logger.info(f"Iniciando migrações do banco de dados (versão atual: {versao})...")
+            if versao == 0:
+                Migrations.create_database_if_not_exists()
             
-            # Se houve erros, mas algumas tabelas foram criadas, avisar
-            if tabelas_com_erro:
-                logger.warning(f"Algumas tabelas tiveram erros: {tabelas_com_erro}")
-                # Se nenhuma tabela foi criada, retornar False
-                if not tabelas_criadas:
-                    return False
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS schema_version (
+                    versao INT PRIMARY KEY,
+                    descricao VARCHAR(255) NOT NULL,
+                    aplicado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+            """)
             
-            # Se chegou aqui e não houve erros críticos, está OK
-            if not tabelas_com_erro:
-                logger.info("Todas as tabelas foram criadas/verificadas com sucesso")
-            else:
-                logger.warning(f"Migrações concluídas com avisos. Tabelas criadas: {len(tabelas_criadas)}, Erros: {len(tabelas_com_erro)}")
+            for numero, descricao, comandos in MIGRACOES:
+                if numero <= versao:
+                    continue
+                
+                logger.info(f"Aplicando migração {numero}: {descricao}")
+                for sql in comandos:
+                    Migrations._executar_comando(cursor, sql)
+                cursor.execute(
+                    "INSERT INTO schema_version (versao, descricao) VALUES (%s, %s)",
+                    (numero, descricao)
+                )
+                conn.commit()
+                versao = numero
             
+            logger.info(f"Migrações concluídas com sucesso (versão {versao})")
             return True
             
         except Error as e:
             if conn:
                 conn.rollback()
-            logger.error(f"Erro ao criar tabelas: {e}")
-            return False
+            logger.error(f"Falha na migração para a versão {versao + 1}: {e}")
+            # Com as tabelas iniciais criadas o sistema funciona; passos
+            # posteriores (índices) serão tentados de novo na próxima execução
+            return versao >= 1
         finally:
             if cursor:
                 cursor.close()
             if conn and conn.is_connected():
                 conn.close()
-    
-    @staticmethod
-    def run_migrations():
-        """Executa todas as migrações (apenas se necessário)"""
-        # Verificar se todas as tabelas já existem
-        if Migrations.all_tables_exist():
-            logger.info("Banco de dados já está configurado. Todas as tabelas existem.")
-            return True
-        
-        logger.info("Iniciando migrações do banco de dados...")
-        if Migrations.create_tables():
-            logger.info("Migrações concluídas com sucesso")
-            return True
-        else:
-            logger.error("Falha ao executar migrações")
-            return False
-
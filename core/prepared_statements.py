@@ -0,0 +1,104 @@
+"""
+Cache de prepared statements por conexão do pool
+"""
+import threading
+import weakref
+from collections import OrderedDict
+from mysql.connector import Error
+
+ER_UNSUPPORTED_PS = 1295
+
+
+class _CacheConexao:
+    """Cursores preparados de uma conexão física, em ordem de uso (LRU)"""
+
+    def __init__(self, connection_id: int):
+        self.connection_id = connection_id
+        self.cursores: OrderedDict = OrderedDict()  # (sql, dicionario) -> (sql, cursor)
+
+
+class CachePreparedStatements:
+    """Mantém statements preparados no servidor, um cursor por texto SQL.
+
+    O cache fica associado à conexão física (não ao PooledMySQLConnection,
+    que é recriado a cada checkout), então sobrevive às devoluções ao pool
+    desde que o pool não reinicie a sessão. Cada conexão guarda no máximo
+    `tamanho` statements; o menos usado é desalocado quando o limite é
+    ultrapassado. Se a conexão for refeita (connection_id diferente), os
+    statements antigos são descartados.
+    """
+
+    def __init__(self, tamanho: int = 64):
+        self.tamanho = tamanho
+        self._por_conexao = weakref.WeakKeyDictionary()
+        self._nao_preparaveis = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def executar(self, conn, query: str, params: tuple = None, dicionario: bool = True):
+        """Executa a query em um cursor preparado da conexão e o retorna.
+        
+        O cursor pertence ao cache e não deve ser fechado por quem chama.
+        Retorna None se o servidor não aceitar a query como prepared
+        statement; nesse caso quem chama deve usar um cursor comum. Com
+        dicionario=False as linhas vêm como tuplas.
+        """
+        if query in self._nao_preparaveis:
+            return None
+
+        cache = self._cache_da_conexao(conn)
+        chave = (query, dicionario)
+        entrada = cache.cursores.get(chave)
+        if entrada is None:
+            self.misses += 1
+            # O cursor preparado só reaproveita o statement quando recebe o
+            # mesmo objeto str, por isso a query guardada é reutilizada
+            cursor = self._conexao_fisica(conn).cursor(prepared=True, dictionary=dicionario)
+            entrada = (query, cursor)
+            cache.cursores[chave] = entrada
+            if len(cache.cursores) > self.tamanho:
+                _, (_, antigo) = cache.cursores.popitem(last=False)
+                self._fechar(antigo)
+                self.evictions += 1
+        else:
+            self.hits += 1
+            cache.cursores.move_to_end(chave)
+
+        sql, cursor = entrada
+        try:
+            cursor.execute(sql, params or ())
+        except Error as e:
+            cache.cursores.pop(chave, None)
+            self._fechar(cursor)
+            if e.errno == ER_UNSUPPORTED_PS:
+                self._nao_preparaveis.add(query)
+                return None
+            raise
+        return cursor
+
+    def estatisticas(self) -> dict:
+        """Contadores de acertos, faltas e descartes do cache"""
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+    def _cache_da_conexao(self, conn) -> _CacheConexao:
+        fisica = self._conexao_fisica(conn)
+        with self._lock:
+            cache = self._por_conexao.get(fisica)
+            if cache is None or cache.connection_id != fisica.connection_id:
+                cache = _CacheConexao(fisica.connection_id)
+                self._por_conexao[fisica] = cache
+            return cache
+
+    @staticmethod
+    def _conexao_fisica(conn):
+        # PooledMySQLConnection embrulha a conexão real em _cnx
+        return getattr(conn, '_cnx', conn)
+
+    @staticmethod
+    def _fechar(cursor):
+        try:
+            cursor.close()
+        except Error:
+            pass
@@ -0,0 +1,146 @@
+"""
+Cache de resultados de consultas de leitura
+"""
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+# Tabelas citadas por uma consulta (FROM/JOIN) ou alteradas por uma escrita
+# (INSERT INTO, UPDATE, DELETE FROM, REPLACE INTO, ALTER/TRUNCATE TABLE)
+_TABELA_RE = re.compile(r'\b(?:FROM|JOIN|INTO|UPDATE|TABLE)\s+`?(\w+)`?', re.IGNORECASE)
+
+# Consultas que não alteram dados e podem ter o resultado guardado
+_LEITURA_RE = re.compile(r'^\s*(?:SELECT|SHOW|WITH)\b', re.IGNORECASE)
+
+
+def normalizar_sql(query: str) -> str:
+    """Colapsa espaços e quebras de linha, para que a mesma consulta escrita
+    com indentação diferente ocupe uma única entrada"""
+    return ' '.join(query.split())
+
+
+def tabelas_da_query(query: str) -> Set[str]:
+    """Nomes (em minúsculas) das tabelas citadas na query"""
+    return {nome.lower() for nome in _TABELA_RE.findall(query)}
+
+
+def eh_leitura(query: str) -> bool:
+    """Indica se a query apenas lê dados"""
+    return _LEITURA_RE.match(query) is not None
+
+
+class CacheConsultas:
+    """Resultados de consultas recentes, em memória, com validade e limite.
+
+    A chave é o SQL normalizado mais os parâmetros. Cada entrada expira após
+    `ttl` segundos (ou o ttl informado ao guardar) e, acima de `tamanho`
+    entradas, a menos usada é descartada. As entradas são marcadas com as
+    tabelas lidas pela consulta; uma escrita em uma tabela remove todas as
+    entradas marcadas com ela (invalidar_tabelas).
+
+    Uma leitura que começou antes de uma invalidação não deve guardar o que
+    leu: quem consulta obtém geracao() antes de ir ao banco e a repassa a
+    guardar(), que descarta o resultado se houve invalidação nesse meio tempo.
+    """
+
+    def __init__(self, tamanho: int = 500, ttl: float = 30.0):
+        self.tamanho = tamanho
+        self.ttl = ttl
+        self._entradas: OrderedDict = OrderedDict()  # chave -> (expira_em, tabelas, valor)
+        self._por_tabela: Dict[str, set] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expiradas = 0
+        self.invalidacoes = 0
+        self._geracao = 0
+
+    @staticmethod
+    def chave(query: str, params: Optional[tuple] = None, tipo: str = '') -> Optional[tuple]:
+        """Chave de cache da consulta; None se os parâmetros não forem hasheáveis"""
+        chave = (tipo, normalizar_sql(query), tuple(params) if params else ())
+        try:
+            hash(chave)
+        except TypeError:
+            return None
+        return chave
+
+    def obter(self, chave: tuple) -> Tuple[bool, Any]:
+        """Retorna (encontrado, valor) para a chave"""
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is None:
+                self.misses += 1
+                return False, None
+            expira_em, _, valor = entrada
+            if expira_em <= time.monotonic():
+                self._remover(chave)
+                self.expiradas += 1
+                self.misses += 1
+                return False, None
+            self._entradas.move_to_end(chave)
+            self.hits += 1
+            return True, valor
+
+    def geracao(self) -> int:
+        """Contador de invalidações, para uso com guardar()"""
+        return self._geracao
+
+    def guardar(self, chave: tuple, tabelas: Iterable[str], valor: Any,
+                ttl: Optional[float] = None, geracao: Optional[int] = None):
+        """Guarda o resultado marcado com as tabelas que ele lê"""
+        tabelas = frozenset(tabelas)
+        expira_em = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if geracao is not None and geracao != self._geracao:
+                return
+            if chave in self._entradas:
+                self._remover(chave)
+            self._entradas[chave] = (expira_em, tabelas, valor)
+            for tabela in tabelas:
+                self._por_tabela.setdefault(tabela, set()).add(chave)
+            while len(self._entradas) > self.tamanho:
+                antiga = next(iter(self._entradas))
+                self._remover(antiga)
+                self.evictions += 1
+
+    def invalidar_tabelas(self, tabelas: Iterable[str]):
+        """Remove as entradas que leem qualquer uma das tabelas"""
+        with self._lock:
+            self._geracao += 1
+            for tabela in tabelas:
+                for chave in self._por_tabela.pop(tabela, ()):
+                    if chave in self._entradas:
+                        self._remover(chave)
+                        self.invalidacoes += 1
+
+    def limpar(self):
+        """Remove todas as entradas (os contadores são mantidos)"""
+        with self._lock:
+            self._geracao += 1
+            self._entradas.clear()
+            self._por_tabela.clear()
+
+    def estatisticas(self) -> dict:
+        """Contadores do cache; hits equivale a idas ao banco economizadas"""
+        with self._lock:
+            return {
+                'entradas': len(self._entradas),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expiradas': self.expiradas,
+                'invalidacoes': self.invalidacoes,
+            }
+
+    def _remover(self, chave: tuple):
+        _, tabelas, _ = self._entradas.pop(chave)
+        for tabela in tabelas:
+            chaves = self._por_tabela.get(tabela)
+            if chaves is not None:
+                chaves.discard(chave)
+                if not chaves:
+                    del self._por_tabela[tabela]
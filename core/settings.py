@@ -19,11 +19,32 @@ DB_CONFIG = {
     'autocommit': False
 }
 
+# Prepared statements reaproveitados por conexão do pool (opcional)
+DB_PREPARED_STATEMENTS = os.getenv('DB_PREPARED_STATEMENTS', '0') == '1'
+DB_PREPARED_CACHE_TAMANHO = int(os.getenv('DB_PREPARED_CACHE_TAMANHO', 64))
+
+# Cache de resultados de leitura (opcional). Escritas feitas por esta aplicação
+# invalidam as tabelas afetadas na hora; alterações de outras estações e
+# consultas que dependem de NOW()/CURDATE() podem ficar até o TTL defasadas.
+DB_QUERY_CACHE = os.getenv('DB_QUERY_CACHE', '0') == '1'
+DB_QUERY_CACHE_TTL = float(os.getenv('DB_QUERY_CACHE_TTL', 30))
+DB_QUERY_CACHE_TAMANHO = int(os.getenv('DB_QUERY_CACHE_TAMANHO', 500))
+
+# Intervalo (segundos) da verificação de alterações feitas por outras
+# estações; as views exibidas recarregam só o que leu as tabelas alteradas.
+# 0 desliga a verificação.
+MONITOR_ALTERACOES_INTERVALO = float(os.getenv('MONITOR_ALTERACOES_INTERVALO', 15))
+
 # Configurações da aplicação
 APP_NAME = "CRM Desktop"
 APP_VERSION = "1.0.0"
 APP_AUTHOR = "Sistema CRM"
 
+# Registro de interações em segundo plano (ver services/auditoria_assincrona.py).
+# Desligado por padrão: nesse modo a interação não participa da transação da
+# operação que a gerou.
+AUDITORIA_ASSINCRONA = os.getenv('AUDITORIA_ASSINCRONA', '0') == '1'
+
 # Caminhos de recursos
 RESOURCES_DIR = BASE_DIR / 'resources'
 ICONS_DIR = RESOURCES_DIR / 'icons'
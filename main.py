@@ -4,7 +4,7 @@ Ponto de entrada da aplicação CRM Desktop
 import sys
 import logging
 from PySide6.QtWidgets import QApplication
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 
 # Configurar logging
 logging.basicConfig(
@@ -14,7 +14,7 @@ logging.basicConfig(
 
 from core.database import DatabaseManager
 from core.migrations import Migrations
-from core.settings import APP_NAME
+from core.settings import APP_NAME, AUDITORIA_ASSINCRONA, MONITOR_ALTERACOES_INTERVALO
 
 # Importar repositories
 from repositories.cliente_repository import ClienteRepository
@@ -24,9 +24,13 @@ from repositories.interacao_repository import InteracaoRepository
 
 # Importar services
 from services.cliente_service import ClienteService
+from services.cliente_directory import ClienteDirectory
 from services.oportunidade_service import OportunidadeService
 from services.tarefa_service import TarefaService
 from services.relatorio_service import RelatorioService
+from services.auditoria_assincrona import AuditoriaAssincrona
+from services.alteracoes_service import AlteracoesService
+from utils.monitor_alteracoes import MonitorAlteracoes
 
 # Importar UI
 from ui.main_window import MainWindow
@@ -69,17 +73,27 @@ def criar_services():
     tarefa_repo = TarefaRepository()
     interacao_repo = InteracaoRepository()
     
+    # Registro de interações: síncrono (mesma transação) ou em segundo plano
+    auditoria = AuditoriaAssincrona(interacao_repo) if AUDITORIA_ASSINCRONA else None
+    registro_interacoes = auditoria or interacao_repo
+    
+    # Nomes de clientes em memória, um único diretório para toda a aplicação
+    diretorio_clientes = ClienteDirectory(cliente_repo)
+    
     # Services
-    cliente_service = ClienteService(cliente_repo, interacao_repo)
-    oportunidade_service = OportunidadeService(oportunidade_repo, interacao_repo)
-    tarefa_service = TarefaService(tarefa_repo, interacao_repo)
+    cliente_service = ClienteService(cliente_repo, registro_interacoes, diretorio_clientes)
+    oportunidade_service = OportunidadeService(oportunidade_repo, registro_interacoes)
+    tarefa_service = TarefaService(tarefa_repo, registro_interacoes)
     relatorio_service = RelatorioService(cliente_repo, oportunidade_repo, tarefa_repo)
+    alteracoes_service = AlteracoesService(cliente_repo, oportunidade_repo, tarefa_repo)
     
     return {
         'cliente_service': cliente_service,
         'oportunidade_service': oportunidade_service,
         'tarefa_service': tarefa_service,
-        'relatorio_service': relatorio_service
+        'relatorio_service': relatorio_service,
+        'alteracoes_service': alteracoes_service,
+        'auditoria': auditoria
     }
 
 
@@ -104,21 +118,20 @@ def main():
     # Criar janela principal
     window = MainWindow()
     
-    # Criar e adicionar views
-    dashboard_view = DashboardView(
+    # Views registradas como fábricas: cada uma é construída na primeira exibição
+    window.adicionar_view(lambda: DashboardView(
         services['relatorio_service'],
         services['tarefa_service'],
         services['oportunidade_service'],
         services['cliente_service']
-    )
-    clientes_view = ClientesView(services['cliente_service'])
-    oportunidades_view = OportunidadesView(services['oportunidade_service'], services['cliente_service'])
-    tarefas_view = TarefasView(services['tarefa_service'], services['cliente_service'])
-    
-    window.adicionar_view(dashboard_view, "Dashboard")
-    window.adicionar_view(clientes_view, "Clientes")
-    window.adicionar_view(oportunidades_view, "Oportunidades")
-    window.adicionar_view(tarefas_view, "Tarefas")
+    ), "Dashboard")
+    window.adicionar_view(lambda: ClientesView(services['cliente_service']), "Clientes")
+    window.adicionar_view(lambda: OportunidadesView(
+        services['oportunidade_service'], services['cliente_service']
+    ), "Oportunidades")
+    window.adicionar_view(lambda: TarefasView(
+        services['tarefa_service'], services['cliente_service']
+    ), "Tarefas")
     
     # Conectar botões do menu
     window.btn_dashboard.clicked.connect(lambda: window.mostrar_view(0))
@@ -126,11 +139,30 @@ def main():
     window.btn_oportunidades.clicked.connect(lambda: window.mostrar_view(2))
     window.btn_tarefas.clicked.connect(lambda: window.mostrar_view(3))
     
-    # Mostrar janela
+    # Alterações feitas por outras estações: as views recarregam só o que
+    # depende das tabelas alteradas
+    if MONITOR_ALTERACOES_INTERVALO > 0:
+        monitor = MonitorAlteracoes(services['alteracoes_service'],
+                                    MONITOR_ALTERACOES_INTERVALO, window)
+        diretorio = services['cliente_service'].diretorio
+        monitor.tabelas_alteradas.connect(
+            lambda tabelas: 'clientes' in tabelas and diretorio.invalidar())
+        monitor.tabelas_alteradas.connect(window.aplicar_alteracoes)
+        window.dados_alterados.connect(monitor.sincronizar)
+        monitor.iniciar()
+    
+    # Mostrar janela; o dashboard carrega depois que ela já foi desenhada
     window.show()
+    QTimer.singleShot(0, lambda: window.mostrar_view(0))
     
     # Executar aplicação
-    sys.exit(app.exec())
+    codigo = app.exec()
+    
+    # Gravar interações que ainda estejam na fila
+    if services['auditoria']:
+        services['auditoria'].encerrar()
+    
+    sys.exit(codigo)
 
 
 if __name__ == "__main__":
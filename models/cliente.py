@@ -6,7 +6,7 @@ from datetime import datetime
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Cliente:
     id: Optional[int] = None
     nome: str = ""
@@ -49,3 +49,14 @@ class Cliente:
         """Cria um objeto Cliente a partir de um dicionário"""
         return cls(**data)
 
+
+@dataclass(slots=True)
+class ClienteResumo:
+    """Colunas exibidas na listagem de clientes (sem endereço e observações)"""
+    id: Optional[int] = None
+    nome: str = ""
+    email: str = ""
+    telefone: str = ""
+    empresa: str = ""
+    endereco_cidade: str = ""
+    criado_em: Optional[datetime] = None
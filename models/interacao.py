@@ -6,7 +6,7 @@ from datetime import datetime
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Interacao:
     id: Optional[int] = None
     cliente_id: int = 0
@@ -6,7 +6,7 @@ from datetime import datetime, date
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Oportunidade:
     id: Optional[int] = None
     cliente_id: int = 0
@@ -19,6 +19,7 @@ class Oportunidade:
     observacoes: str = ""
     criado_em: Optional[datetime] = None
     atualizado_em: Optional[datetime] = None
+    cliente_nome: str = ""  # Preenchido via JOIN nas listagens (não persistido)
     
     def to_dict(self) -> dict:
         """Converte o objeto para dicionário"""
@@ -33,7 +34,8 @@ class Oportunidade:
             'responsavel': self.responsavel,
             'observacoes': self.observacoes,
             'criado_em': self.criado_em,
-            'atualizado_em': self.atualizado_em
+            'atualizado_em': self.atualizado_em,
+            'cliente_nome': self.cliente_nome
         }
     
     @classmethod
@@ -41,3 +43,15 @@ class Oportunidade:
         """Cria um objeto Oportunidade a partir de um dicionário"""
         return cls(**data)
 
+
+@dataclass(slots=True)
+class OportunidadeResumo:
+    """Colunas exibidas na listagem de oportunidades (sem observações)"""
+    id: Optional[int] = None
+    cliente_id: int = 0
+    titulo: str = ""
+    etapa: str = "Lead"
+    valor: float = 0.0
+    probabilidade: int = 0
+    data_prevista_fechamento: Optional[date] = None
+    responsavel: str = ""
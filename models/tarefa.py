@@ -6,7 +6,7 @@ from datetime import datetime
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Tarefa:
     id: Optional[int] = None
     cliente_id: int = 0
@@ -18,6 +18,8 @@ class Tarefa:
     observacoes: str = ""
     criado_em: Optional[datetime] = None
     concluida_em: Optional[datetime] = None
+    atualizado_em: Optional[datetime] = None
+    cliente_nome: str = ""  # Preenchido via JOIN nas listagens (não persistido)
     
     def to_dict(self) -> dict:
         """Converte o objeto para dicionário"""
@@ -31,7 +33,9 @@ class Tarefa:
             'prioridade': self.prioridade,
             'observacoes': self.observacoes,
             'criado_em': self.criado_em,
-            'concluida_em': self.concluida_em
+            'concluida_em': self.concluida_em,
+            'atualizado_em': self.atualizado_em,
+            'cliente_nome': self.cliente_nome
         }
     
     @classmethod
@@ -39,3 +43,14 @@ class Tarefa:
         """Cria um objeto Tarefa a partir de um dicionário"""
         return cls(**data)
 
+
+@dataclass(slots=True)
+class TarefaResumo:
+    """Colunas exibidas na listagem de tarefas (sem observações)"""
+    id: Optional[int] = None
+    cliente_id: int = 0
+    descricao: str = ""
+    tipo: str = "Outro"
+    data_hora: Optional[datetime] = None
+    status: str = "Pendente"
+    prioridade: str = "Média"
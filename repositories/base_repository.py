@@ -1,53 +1,551 @@
 """
 Repository base com operações CRUD genéricas
 """
-from typing import List, Optional, TypeVar, Generic
+import re
+import json
+import base64
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field, fields
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, Generic, Iterable, Iterator, List, Optional, Set, Tuple, TypeVar
 from abc import ABC, abstractmethod
 from core.database import DatabaseManager
+from repositories.mapeamento import criar_mapeador
 
 T = TypeVar('T', bound=object)
 
+# Nomes de coluna aceitos em filtros e agregações (evita injeção de SQL)
+_COLUNA_RE = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+# Operadores aceitos nos filtros no formato coluna__operador=valor
+_OPERADORES = {
+    'ne': '<>',
+    'gt': '>',
+    'gte': '>=',
+    'lt': '<',
+    'lte': '<=',
+}
+
+# Folga aplicada à marca d'água de alteradas_desde: atualizado_em é gravado
+# na hora da escrita, mas a linha só fica visível no commit da transação.
+# Limite: uma transação que leve mais que a margem entre gravar a linha e o
+# commit não é vista pela sincronização incremental; a alteração só aparece
+# quando a listagem for recarregada (ou a linha alterada de novo). As escritas
+# da aplicação são transações curtas; cargas em lote demoradas devem tocar
+# atualizado_em no fim ou ser seguidas de uma recarga.
+MARGEM_ALTERACOES = timedelta(seconds=5)
+
+
+# Mapa de identidade da operação corrente: (tabela, id) -> entidade
+_mapa_identidade: ContextVar[Optional[dict]] = ContextVar('mapa_identidade', default=None)
+
+
+@contextmanager
+def mapa_identidade():
+    """Ativa um mapa de identidade enquanto o bloco executa.
+    
+    Dentro do bloco, buscar_por_id e buscar_por_ids retornam o mesmo objeto
+    para um id já carregado, sem nova consulta. O mapa vale só para a thread
+    (contexto) atual e é descartado ao sair do bloco; blocos aninhados
+    reaproveitam o mapa externo. Leituras com uma conexão explícita (dentro
+    de uma transação) ignoram o mapa e sempre vão ao banco. Não mantenha o
+    bloco aberto durante diálogos modais: o loop de eventos aninhado
+    executaria outras leituras com o mesmo mapa.
+    """
+    if _mapa_identidade.get() is not None:
+        yield
+        return
+    token = _mapa_identidade.set({})
+    try:
+        yield
+    finally:
+        _mapa_identidade.reset(token)
+
+
+@dataclass
+class Pagina(Generic[T]):
+    """Página de resultados de uma listagem paginada por cursor"""
+    itens: List[T] = field(default_factory=list)
+    proximo_cursor: Optional[str] = None
+
+
+@dataclass
+class Alteracoes(Generic[T]):
+    """Alterações de uma listagem desde uma marca d'água (ver alteradas_desde)"""
+    itens: List[T] = field(default_factory=list)  # incluídos ou alterados
+    removidos: Set[int] = field(default_factory=set)  # ids que saíram da listagem
+    marca: Optional[datetime] = None  # marca para a próxima consulta
+
 
 class BaseRepository(ABC, Generic[T]):
     """Classe base para repositories"""
     
+    # Ordenações aceitas por listar_pagina: nome -> (coluna indexada, direção).
+    # O id é sempre usado como critério de desempate.
+    ORDENACOES: Dict[str, Tuple[str, str]] = {
+        'id': ('id', 'DESC'),
+    }
+    
+    # Dataclass da entidade e conversões por coluna usadas no mapeamento de
+    # tuplas (_consultar). Os campos são casados com as colunas pelo nome.
+    ENTIDADE: type = None
+    CONVERSORES: Dict[str, Callable[[Any], Any]] = {}
+    
+    # Dataclass enxuto das listagens (listar_resumos): só as colunas exibidas
+    # nas tabelas. Usa os mesmos nomes de campo da entidade.
+    RESUMO: type = None
+    
+    # Quantidade máxima de ids por consulta WHERE id IN (...) em buscar_por_ids
+    TAMANHO_LOTE_IDS = 500
+    
+    # Tabelas cujas linhas são apagadas em cascata junto com a entidade:
+    # (tabela, coluna da chave estrangeira). excluir registra essas exclusões
+    # também, para que alteradas_desde as enxergue.
+    DEPENDENTES: Tuple[Tuple[str, str], ...] = ()
+    
     def __init__(self, table_name: str):
         self.table_name = table_name
+        self._mapeadores: Dict[tuple, Callable[[tuple], Any]] = {}
     
     @abstractmethod
     def _row_to_entity(self, row: dict) -> T:
         """Converte uma linha do banco em entidade"""
         pass
     
-    def buscar_por_id(self, id: int) -> Optional[T]:
+    def _consultar(self, query: str, params: tuple = None, conn=None, classe: type = None) -> list:
+        """Executa a consulta e converte as linhas (tuplas) em entidades.
+        
+        classe permite mapear para outro dataclass (ex.: RESUMO); o padrão é
+        ENTIDADE.
+        """
+        colunas, linhas = DatabaseManager.fetch_rows(query, params, conn=conn)
+        mapear = self._mapeador(colunas, classe or self.ENTIDADE)
+        return [mapear(linha) for linha in linhas]
+    
+    def _mapeador(self, colunas: tuple, classe: type = None) -> Callable[[tuple], Any]:
+        """Mapeador de tuplas para as colunas informadas (gerado uma vez)"""
+        classe = classe or self.ENTIDADE
+        mapear = self._mapeadores.get((classe, colunas))
+        if mapear is None:
+            mapear = criar_mapeador(classe, colunas, self.CONVERSORES)
+            self._mapeadores[(classe, colunas)] = mapear
+        return mapear
+    
+    def _select(self) -> str:
+        """SELECT base das consultas que retornam entidades.
+        
+        Repositories podem sobrescrever para incluir colunas de tabelas
+        relacionadas (JOIN). As colunas da própria tabela devem ser sempre
+        qualificadas com o nome da tabela.
+        """
+        return f"SELECT * FROM {self.table_name}"
+    
+    def _colunas_resumo(self, excluir: Tuple[str, ...] = ()) -> str:
+        """Colunas da tabela correspondentes aos campos de RESUMO.
+        
+        excluir lista campos que não pertencem à tabela (ex.: vindos de JOIN).
+        """
+        return ", ".join(
+            f"{self.table_name}.{campo.name}"
+            for campo in fields(self.RESUMO) if campo.name not in excluir
+        )
+    
+    def _select_resumo(self) -> str:
+        """SELECT das listagens enxutas, projetando apenas as colunas de RESUMO"""
+        return f"SELECT {self._colunas_resumo()} FROM {self.table_name}"
+    
+    def buscar_por_id(self, id: int, conn=None) -> Optional[T]:
         """Busca uma entidade por ID"""
-        query = f"SELECT * FROM {self.table_name} WHERE id = %s"
+        # Dentro de uma transação (conn explícita) a leitura é sempre do banco
+        mapa = _mapa_identidade.get() if conn is None else None
+        if mapa is not None and (self.table_name, id) in mapa:
+            return mapa[(self.table_name, id)]
+        
+        query = f"{self._select()} WHERE {self.table_name}.id = %s"
         try:
-            result = DatabaseManager.execute_query(query, (id,), fetch=True)
-            if result:
-                return self._row_to_entity(result[0])
-            return None
+            result = self._consultar(query, (id,), conn=conn)
         except Exception as e:
             print(f"Erro ao buscar por ID: {e}")
             return None
+        
+        entidade = result[0] if result else None
+        if mapa is not None and entidade is not None:
+            mapa[(self.table_name, id)] = entidade
+        return entidade
+    
+    def buscar_por_ids(self, ids: Iterable[int], conn=None) -> Dict[int, T]:
+        """Busca várias entidades por ID, em lotes de WHERE id IN (...).
+        
+        Retorna um dicionário id -> entidade; ids inexistentes ficam de fora.
+        """
+        mapa = _mapa_identidade.get() if conn is None else None
+        encontradas: Dict[int, T] = {}
+        pendentes = []
+        for id in dict.fromkeys(ids):
+            if id is None:
+                continue
+            if mapa is not None and (self.table_name, id) in mapa:
+                encontradas[id] = mapa[(self.table_name, id)]
+            else:
+                pendentes.append(id)
+        
+        for inicio in range(0, len(pendentes), self.TAMANHO_LOTE_IDS):
+            lote = pendentes[inicio:inicio + self.TAMANHO_LOTE_IDS]
+            marcadores = ", ".join(["%s"] * len(lote))
+            query = f"{self._select()} WHERE {self.table_name}.id IN ({marcadores})"
+            try:
+                entidades = self._consultar(query, tuple(lote), conn=conn)
+            except Exception as e:
+                print(f"Erro ao buscar por IDs: {e}")
+                continue
+            for entidade in entidades:
+                encontradas[entidade.id] = entidade
+                if mapa is not None:
+                    mapa[(self.table_name, entidade.id)] = entidade
+        
+        return encontradas
+    
+    def _esquecer(self, id: int):
+        """Remove a entidade do mapa de identidade ativo (após escrita)"""
+        mapa = _mapa_identidade.get()
+        if mapa is not None:
+            mapa.pop((self.table_name, id), None)
     
     def listar_todos(self) -> List[T]:
         """Lista todas as entidades"""
-        query = f"SELECT * FROM {self.table_name} ORDER BY id DESC"
+        query = f"{self._select()} ORDER BY {self.table_name}.id DESC"
         try:
-            result = DatabaseManager.execute_query(query, fetch=True)
-            return [self._row_to_entity(row) for row in result]
+            return self._consultar(query)
         except Exception as e:
             print(f"Erro ao listar todos: {e}")
             return []
     
-    def excluir(self, id: int) -> bool:
-        """Exclui uma entidade por ID"""
-        query = f"DELETE FROM {self.table_name} WHERE id = %s"
+    def listar_pagina(self, cursor: Optional[str] = None, limite: int = 100,
+                      ordem: str = 'id', **filtros) -> Pagina[T]:
+        """Lista uma página de entidades usando paginação por chave (keyset).
+        
+        Em vez de OFFSET, a consulta continua a partir da última linha da
+        página anterior, identificada pelo cursor devolvido em
+        Pagina.proximo_cursor. O custo de cada página independe da sua posição.
+        """
+        return self._listar_pagina(self._select(), self.ENTIDADE, cursor, limite, ordem, filtros)
+    
+    def listar_resumos(self, cursor: Optional[str] = None, limite: int = 100,
+                       ordem: str = 'id', **filtros) -> Pagina:
+        """Como listar_pagina, mas só com as colunas exibidas nas tabelas (RESUMO)"""
+        return self._listar_pagina(self._select_resumo(), self.RESUMO, cursor, limite, ordem, filtros)
+    
+    def _listar_pagina(self, select: str, classe: type, cursor: Optional[str], limite: int,
+                       ordem: str, filtros: dict) -> Pagina:
+        coluna, direcao, ordenacao = self._ordenacao(ordem)
+        
+        condicoes, params = self._montar_condicoes(filtros)
+        if cursor:
+            valor, ultimo_id = self._decodificar_cursor(cursor)
+            condicao, params_cursor = self._condicao_keyset(coluna, direcao, valor, ultimo_id)
+            condicoes.append(condicao)
+            params.extend(params_cursor)
+        
+        where = "WHERE " + " AND ".join(condicoes) if condicoes else ""
+        
+        # Busca uma linha a mais para saber se existe próxima página
+        query = f"""
+            {select}
+            {where}
+            ORDER BY {ordenacao}
+            LIMIT %s
+        """
+        params.append(limite + 1)
+        try:
+            itens = self._consultar(query, tuple(params), classe=classe)
+        except Exception as e:
+            print(f"Erro ao listar página: {e}")
+            return Pagina()
+        
+        proximo_cursor = None
+        if len(itens) > limite:
+            itens = itens[:limite]
+            ultima = itens[-1]
+            proximo_cursor = self._codificar_cursor(getattr(ultima, coluna), ultima.id)
+        
+        return Pagina(itens, proximo_cursor)
+    
+    def percorrer_paginas(self, tamanho: int = 500, ordem: str = 'id', **filtros) -> Iterator[T]:
+        """Percorre todas as entidades página a página, sem carregar a tabela inteira"""
+        cursor = None
+        while True:
+            pagina = self.listar_pagina(cursor, tamanho, ordem, **filtros)
+            yield from pagina.itens
+            if not pagina.proximo_cursor:
+                break
+            cursor = pagina.proximo_cursor
+    
+    def iterar_todos(self, ordem: str = 'id', tamanho_lote: int = 1000, **filtros) -> Iterator[T]:
+        """Percorre as entidades em uma única consulta lida aos poucos (streaming).
+        
+        Ao contrário de percorrer_paginas, mantém uma conexão ocupada enquanto
+        o iterador estiver aberto; use para exportações e relatórios que
+        consomem o resultado de uma vez.
+        """
+        _, _, ordenacao = self._ordenacao(ordem)
+        where, params = self._montar_where(filtros)
+        query = f"{self._select()} {where} ORDER BY {ordenacao}"
+        for row in DatabaseManager.stream(query, params, tamanho_lote):
+            yield self._row_to_entity(row)
+    
+    def _ordenacao(self, ordem: str) -> Tuple[str, str, str]:
+        """Retorna (coluna, direção, cláusula ORDER BY) de uma ordenação suportada"""
+        if ordem not in self.ORDENACOES:
+            raise ValueError(f"Ordenação inválida: {ordem}")
+        coluna, direcao = self.ORDENACOES[ordem]
+        
+        # id como desempate garante uma ordem total (necessária ao keyset)
+        ordenacao = f"{self.table_name}.id {direcao}"
+        if coluna != 'id':
+            ordenacao = f"{self.table_name}.{coluna} {direcao}, {ordenacao}"
+        return coluna, direcao, ordenacao
+    
+    def _condicao_keyset(self, coluna: str, direcao: str, valor, ultimo_id: int) -> Tuple[str, list]:
+        """Monta o predicado que continua a listagem após (valor, ultimo_id).
+        
+        O MySQL ordena NULL antes dos demais valores em ASC e depois em DESC,
+        por isso colunas anuláveis precisam de tratamento explícito.
+        """
+        col = f"{self.table_name}.{coluna}"
+        col_id = f"{self.table_name}.id"
+        op = '>' if direcao == 'ASC' else '<'
+        
+        if coluna == 'id':
+            return f"{col_id} {op} %s", [ultimo_id]
+        
+        if direcao == 'ASC':
+            if valor is None:
+                return f"(({col} IS NULL AND {col_id} > %s) OR {col} IS NOT NULL)", [ultimo_id]
+            return f"({col} > %s OR ({col} = %s AND {col_id} > %s))", [valor, valor, ultimo_id]
+        
+        if valor is None:
+            return f"({col} IS NULL AND {col_id} < %s)", [ultimo_id]
+        return (
+            f"({col} < %s OR ({col} = %s AND {col_id} < %s) OR {col} IS NULL)",
+            [valor, valor, ultimo_id]
+        )
+    
+    @staticmethod
+    def _codificar_cursor(valor, ultimo_id: int) -> str:
+        """Codifica a posição (valor da ordenação, id) em um token opaco"""
+        if isinstance(valor, datetime):
+            valor = {'datetime': valor.isoformat()}
+        elif isinstance(valor, date):
+            valor = {'date': valor.isoformat()}
+        elif isinstance(valor, Decimal):
+            valor = {'decimal': str(valor)}
+        dados = json.dumps([valor, ultimo_id]).encode('utf-8')
+        return base64.urlsafe_b64encode(dados).decode('ascii')
+    
+    @staticmethod
+    def _decodificar_cursor(cursor: str) -> Tuple[Any, int]:
+        """Decodifica um token gerado por _codificar_cursor"""
+        try:
+            valor, ultimo_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Cursor de paginação inválido: {cursor}") from e
+        
+        if isinstance(valor, dict):
+            if 'datetime' in valor:
+                valor = datetime.fromisoformat(valor['datetime'])
+            elif 'date' in valor:
+                valor = date.fromisoformat(valor['date'])
+            elif 'decimal' in valor:
+                valor = Decimal(valor['decimal'])
+        return valor, ultimo_id
+    
+    def contar(self, **filtros) -> int:
+        """Conta as entidades que atendem aos filtros (COUNT no MySQL)"""
+        resultado = self._agregar("COUNT(*)", filtros)
+        return int(resultado or 0)
+    
+    def somar(self, coluna: str, **filtros) -> float:
+        """Soma uma coluna das entidades que atendem aos filtros (SUM no MySQL)"""
+        self._validar_coluna(coluna)
+        resultado = self._agregar(f"SUM({coluna})", filtros)
+        return float(resultado or 0.0)
+    
+    def agrupar_contagem(self, coluna: str, **filtros) -> Dict[Any, int]:
+        """Conta as entidades agrupadas pelos valores de uma coluna (GROUP BY no MySQL)"""
+        self._validar_coluna(coluna)
+        where, params = self._montar_where(filtros)
+        query = f"""
+            SELECT {coluna} AS valor, COUNT(*) AS quantidade
+            FROM {self.table_name}
+            {where}
+            GROUP BY {coluna}
+        """
+        try:
+            result = DatabaseManager.execute_query(query, params, fetch=True)
+            return {row['valor']: int(row['quantidade']) for row in result}
+        except Exception as e:
+            print(f"Erro ao agrupar contagem: {e}")
+            return {}
+    
+    def sql_assinatura(self) -> str:
+        """SELECT de uma linha que muda sempre que a tabela muda:
+        (tabela, COUNT(*), MAX(id), MAX(atualizado_em)).
+        
+        MAX(id) e MAX(atualizado_em) são lidos direto da ponta dos índices;
+        COUNT(*) percorre o menor índice e detecta exclusões. Exige a coluna
+        atualizado_em indexada (ver core/migrations.py).
+        """
+        return (f"SELECT '{self.table_name}' AS tabela, COUNT(*) AS total, "
+                f"MAX(id) AS ultimo_id, MAX(atualizado_em) AS ultima_alteracao "
+                f"FROM {self.table_name}")
+    
+    def _agregar(self, expressao: str, filtros: dict):
+        """Executa uma expressão de agregação e retorna o valor escalar"""
+        where, params = self._montar_where(filtros)
+        query = f"SELECT {expressao} AS resultado FROM {self.table_name} {where}"
+        try:
+            result = DatabaseManager.execute_query(query, params, fetch=True)
+            return result[0]['resultado'] if result else None
+        except Exception as e:
+            print(f"Erro ao executar agregação: {e}")
+            return None
+    
+    def _montar_where(self, filtros: dict) -> Tuple[str, tuple]:
+        """Monta a cláusula WHERE parametrizada a partir dos filtros"""
+        condicoes, params = self._montar_condicoes(filtros)
+        if not condicoes:
+            return "", ()
+        return "WHERE " + " AND ".join(condicoes), tuple(params)
+    
+    def _montar_condicoes(self, filtros: dict) -> Tuple[List[str], list]:
+        """Converte os filtros em condições SQL e seus parâmetros.
+        
+        Cada filtro tem o formato coluna=valor ou coluna__operador=valor, com
+        os operadores ne, gt, gte, lt, lte, in, not_in e contem. Listas e
+        tuplas usadas com igualdade viram IN e None vira IS NULL. O filtro
+        especial ou={...} recebe outro dict de filtros e os combina com OR.
+        """
+        condicoes = []
+        params = []
+        for chave, valor in filtros.items():
+            if chave == 'ou':
+                alternativas, params_ou = self._montar_condicoes(valor)
+                if alternativas:
+                    condicoes.append("(" + " OR ".join(alternativas) + ")")
+                    params.extend(params_ou)
+                continue
+            
+            coluna, _, operador = chave.partition('__')
+            self._validar_coluna(coluna)
+            coluna = f"{self.table_name}.{coluna}"
+            
+            if not operador and isinstance(valor, (list, tuple, set)):
+                operador = 'in'
+            
+            if operador in ('in', 'not_in'):
+                valores = list(valor)
+                if not valores:
+                    # IN () vazio: nenhuma linha (in) ou todas as linhas (not_in)
+                    condicoes.append("1 = 0" if operador == 'in' else "1 = 1")
+                    continue
+                marcadores = ', '.join(['%s'] * len(valores))
+                negacao = 'NOT ' if operador == 'not_in' else ''
+                condicoes.append(f"{coluna} {negacao}IN ({marcadores})")
+                params.extend(valores)
+            elif operador == 'contem':
+                condicoes.append(f"{coluna} LIKE %s")
+                params.append(f"%{self._escapar_like(valor)}%")
+            elif not operador:
+                if valor is None:
+                    condicoes.append(f"{coluna} IS NULL")
+                else:
+                    condicoes.append(f"{coluna} = %s")
+                    params.append(valor)
+            elif operador in _OPERADORES:
+                condicoes.append(f"{coluna} {_OPERADORES[operador]} %s")
+                params.append(valor)
+            else:
+                raise ValueError(f"Operador de filtro inválido: {operador}")
+        
+        return condicoes, params
+    
+    @staticmethod
+    def _escapar_like(termo: str) -> str:
+        """Escapa os curingas do LIKE para buscar o texto literal"""
+        return termo.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    
+    @staticmethod
+    def _validar_coluna(coluna: str):
+        """Garante que o nome da coluna é um identificador simples"""
+        if not _COLUNA_RE.match(coluna):
+            raise ValueError(f"Nome de coluna inválido: {coluna}")
+    
+    def alteradas_desde(self, marca: Optional[datetime], **filtros) -> Optional[Alteracoes]:
+        """Alterações da listagem (RESUMO com os filtros) desde a marca.
+        
+        itens traz as linhas incluídas ou alteradas que atendem aos filtros;
+        removidos, os ids excluídos (tabela exclusoes) e os alterados que
+        deixaram de atender aos filtros. A nova marca é o horário do servidor
+        no início da leitura; sem marca, só ela é retornada. As consultas usam
+        os índices de atualizado_em e de exclusoes, em uma única conexão e
+        fora do cache de consultas. Retorna None em caso de erro.
+        """
         try:
-            DatabaseManager.execute_query(query, (id,))
+            with DatabaseManager.transaction() as conn:
+                _, linhas = DatabaseManager.fetch_rows("SELECT NOW()", conn=conn)
+                nova_marca = linhas[0][0]
+                if marca is None:
+                    return Alteracoes(marca=nova_marca)
+                desde = marca - MARGEM_ALTERACOES
+                
+                condicoes, params = self._montar_condicoes(filtros)
+                where = " AND ".join([f"{self.table_name}.atualizado_em >= %s"] + condicoes)
+                itens = self._consultar(f"{self._select_resumo()} WHERE {where}",
+                                        (desde, *params), conn=conn, classe=self.RESUMO)
+                
+                _, alteradas = DatabaseManager.fetch_rows(
+                    f"SELECT id FROM {self.table_name} WHERE atualizado_em >= %s",
+                    (desde,), conn=conn
+                )
+                _, excluidas = DatabaseManager.fetch_rows(
+                    "SELECT registro_id FROM exclusoes WHERE tabela = %s AND excluido_em >= %s",
+                    (self.table_name, desde), conn=conn
+                )
+        except Exception as e:
+            print(f"Erro ao buscar alterações: {e}")
+            return None
+        
+        mantidos = {item.id for item in itens}
+        removidos = {linha[0] for linha in alteradas if linha[0] not in mantidos}
+        removidos.update(linha[0] for linha in excluidas)
+        return Alteracoes(itens, removidos, nova_marca)
+    
+    def excluir(self, id: int, conn=None) -> bool:
+        """Exclui uma entidade por ID, registrando a exclusão em exclusoes"""
+        self._esquecer(id)
+        try:
+            if conn is None:
+                with DatabaseManager.transaction() as conn:
+                    self._excluir(id, conn)
+            else:
+                self._excluir(id, conn)
             return True
         except Exception as e:
             print(f"Erro ao excluir: {e}")
             return False
+    
+    def _excluir(self, id: int, conn):
+        """Registra as exclusões (da entidade e dos dependentes) e apaga a linha"""
+        for tabela, coluna in self.DEPENDENTES:
+            DatabaseManager.execute_query(
+                f"INSERT INTO exclusoes (tabela, registro_id) SELECT %s, id FROM {tabela} WHERE {coluna} = %s",
+                (tabela, id), conn=conn
+            )
+        DatabaseManager.execute_query(
+            "INSERT INTO exclusoes (tabela, registro_id) VALUES (%s, %s)",
+            (self.table_name, id), conn=conn
+        )
+        DatabaseManager.execute_query(f"DELETE FROM {self.table_name} WHERE id = %s", (id,), conn=conn)
 
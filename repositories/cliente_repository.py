@@ -1,15 +1,41 @@
 """
 Repository para Cliente
 """
-from typing import List, Optional
-from models.cliente import Cliente
+import re
+from typing import List, Optional, Tuple
+from models.cliente import Cliente, ClienteResumo
 from repositories.base_repository import BaseRepository
 from core.database import DatabaseManager
 
+# Tamanho mínimo de palavra indexada pelo FULLTEXT do InnoDB (innodb_ft_min_token_size)
+TAMANHO_MINIMO_FULLTEXT = 3
+
+# Stopwords padrão do InnoDB: exigi-las com "+" no modo booleano zera o resultado
+STOPWORDS_FULLTEXT = frozenset([
+    'a', 'about', 'an', 'are', 'as', 'at', 'be', 'by', 'com', 'de', 'en', 'for',
+    'from', 'how', 'i', 'in', 'is', 'it', 'la', 'of', 'on', 'or', 'that', 'the',
+    'this', 'to', 'was', 'what', 'when', 'where', 'who', 'will', 'with', 'und',
+    'www'
+])
+
+# Erro do MySQL quando não existe índice FULLTEXT para as colunas do MATCH
+ER_FT_MATCHING_KEY_NOT_FOUND = 1191
+
 
 class ClienteRepository(BaseRepository[Cliente]):
     """Repository para operações CRUD de Cliente"""
     
+    ORDENACOES = {
+        'id': ('id', 'DESC'),
+        'nome': ('nome', 'ASC'),
+    }
+    
+    ENTIDADE = Cliente
+    RESUMO = ClienteResumo
+    
+    # Apagadas pelo ON DELETE CASCADE junto com o cliente
+    DEPENDENTES = (('oportunidades', 'cliente_id'), ('tarefas', 'cliente_id'))
+    
     def __init__(self):
         super().__init__('clientes')
     
@@ -33,7 +59,7 @@ class ClienteRepository(BaseRepository[Cliente]):
             atualizado_em=row.get('atualizado_em')
         )
     
-    def criar(self, cliente: Cliente) -> int:
+    def criar(self, cliente: Cliente, conn=None) -> int:
         """Cria um novo cliente e retorna o ID"""
         query = """
             INSERT INTO clientes (nome, email, telefone, empresa, cnpj_cpf,
@@ -48,13 +74,13 @@ class ClienteRepository(BaseRepository[Cliente]):
             cliente.endereco_cep, cliente.observacoes
         )
         try:
-            result = DatabaseManager.execute_query(query, params)
+            result = DatabaseManager.execute_query(query, params, conn=conn)
             return result
         except Exception as e:
             print(f"Erro ao criar cliente: {e}")
             raise
     
-    def atualizar(self, cliente: Cliente) -> bool:
+    def atualizar(self, cliente: Cliente, conn=None) -> bool:
         """Atualiza um cliente existente"""
         query = """
             UPDATE clientes SET
@@ -70,26 +96,105 @@ class ClienteRepository(BaseRepository[Cliente]):
             cliente.endereco_bairro, cliente.endereco_cidade, cliente.endereco_estado,
             cliente.endereco_cep, cliente.observacoes, cliente.id
         )
+        self._esquecer(cliente.id)
         try:
-            DatabaseManager.execute_query(query, params)
+            DatabaseManager.execute_query(query, params, conn=conn)
             return True
         except Exception as e:
             print(f"Erro ao atualizar cliente: {e}")
             return False
     
-    def buscar(self, termo: str) -> List[Cliente]:
-        """Busca clientes por nome, email, empresa ou cidade"""
-        query = """
-            SELECT * FROM clientes
+    def listar_nomes(self) -> List[tuple]:
+        """Tuplas (id, nome, empresa) de todos os clientes"""
+        try:
+            _, linhas = DatabaseManager.fetch_rows("SELECT id, nome, empresa FROM clientes")
+            return linhas
+        except Exception as e:
+            print(f"Erro ao listar nomes de clientes: {e}")
+            return []
+    
+    def buscar(self, termo: str, resumo: bool = False) -> list:
+        """Busca clientes por nome, email, empresa ou cidade.
+        
+        Usa o índice FULLTEXT (MATCH ... AGAINST com prefixo, ordenado por
+        relevância). Termos curtos demais para o FULLTEXT caem para LIKE 'x%',
+        que aproveita os índices de nome, email, empresa e cidade. Com
+        resumo=True retorna ClienteResumo, lendo só as colunas da listagem.
+        """
+        palavras = self._palavras_fulltext(termo)
+        if not palavras:
+            return self._buscar_prefixo(termo.strip(), resumo)
+        
+        try:
+            return self._buscar_fulltext(palavras, resumo)
+        except Exception as e:
+            if getattr(e, 'errno', None) == ER_FT_MATCHING_KEY_NOT_FOUND:
+                # Banco ainda sem o índice FULLTEXT (migração pendente)
+                return self._buscar_contem(termo.strip(), resumo)
+            print(f"Erro ao buscar clientes: {e}")
+            return []
+    
+    @staticmethod
+    def _palavras_fulltext(termo: str) -> List[str]:
+        """Extrai do termo as palavras que o índice FULLTEXT consegue encontrar"""
+        palavras = re.split(r'\W+', termo.lower())
+        return [
+            p for p in palavras
+            if len(p) >= TAMANHO_MINIMO_FULLTEXT and p not in STOPWORDS_FULLTEXT
+        ]
+    
+    def _projecao(self, resumo: bool) -> Tuple[str, type]:
+        """Colunas e classe de retorno das buscas (completa ou resumo)"""
+        if resumo:
+            return self._colunas_resumo(), ClienteResumo
+        return "*", Cliente
+    
+    def _buscar_fulltext(self, palavras: List[str], resumo: bool = False) -> list:
+        """Busca ranqueada via MATCH ... AGAINST em modo booleano"""
+        # Todas as palavras são obrigatórias e casam por prefixo
+        expressao = ' '.join(f"+{p}*" for p in palavras)
+        colunas, classe = self._projecao(resumo)
+        query = f"""
+            SELECT {colunas},
+                   MATCH(nome, email, empresa, endereco_cidade)
+                   AGAINST (%s IN BOOLEAN MODE) AS relevancia
+            FROM clientes
+            WHERE MATCH(nome, email, empresa, endereco_cidade)
+                  AGAINST (%s IN BOOLEAN MODE)
+            ORDER BY relevancia DESC, nome
+        """
+        return self._consultar(query, (expressao, expressao), classe=classe)
+    
+    def _buscar_prefixo(self, termo: str, resumo: bool = False) -> list:
+        """Busca por prefixo (LIKE 'x%'), que usa os índices das colunas"""
+        if not termo:
+            return []
+        colunas, classe = self._projecao(resumo)
+        query = f"""
+            SELECT {colunas} FROM clientes
             WHERE nome LIKE %s OR email LIKE %s OR empresa LIKE %s OR endereco_cidade LIKE %s
             ORDER BY nome
         """
-        termo_like = f"%{termo}%"
+        termo_like = self._escapar_like(termo) + '%'
         params = (termo_like, termo_like, termo_like, termo_like)
         try:
-            result = DatabaseManager.execute_query(query, params, fetch=True)
-            return [self._row_to_entity(row) for row in result]
+            return self._consultar(query, params, classe=classe)
+        except Exception as e:
+            print(f"Erro ao buscar clientes por prefixo: {e}")
+            return []
+    
+    def _buscar_contem(self, termo: str, resumo: bool = False) -> list:
+        """Busca por substring (LIKE '%x%'); percorre a tabela inteira"""
+        colunas, classe = self._projecao(resumo)
+        query = f"""
+            SELECT {colunas} FROM clientes
+            WHERE nome LIKE %s OR email LIKE %s OR empresa LIKE %s OR endereco_cidade LIKE %s
+            ORDER BY nome
+        """
+        termo_like = f"%{self._escapar_like(termo)}%"
+        params = (termo_like, termo_like, termo_like, termo_like)
+        try:
+            return self._consultar(query, params, classe=classe)
         except Exception as e:
             print(f"Erro ao buscar clientes: {e}")
             return []
-
@@ -10,6 +10,13 @@ from core.database import DatabaseManager
 class InteracaoRepository(BaseRepository[Interacao]):
     """Repository para operações CRUD de Interacao"""
     
+    ORDENACOES = {
+        'id': ('id', 'DESC'),
+        'criado_em': ('criado_em', 'DESC'),
+    }
+    
+    ENTIDADE = Interacao
+    
     def __init__(self):
         super().__init__('interacoes')
     
@@ -23,7 +30,7 @@ class InteracaoRepository(BaseRepository[Interacao]):
             criado_em=row.get('criado_em')
         )
     
-    def criar(self, interacao: Interacao) -> int:
+    def criar(self, interacao: Interacao, conn=None) -> int:
         """Cria uma nova interação e retorna o ID"""
         query = """
             INSERT INTO interacoes (cliente_id, tipo, descricao)
@@ -31,12 +38,35 @@ class InteracaoRepository(BaseRepository[Interacao]):
         """
         params = (interacao.cliente_id, interacao.tipo, interacao.descricao)
         try:
-            result = DatabaseManager.execute_query(query, params)
+            result = DatabaseManager.execute_query(query, params, conn=conn)
             return result
         except Exception as e:
             print(f"Erro ao criar interação: {e}")
             raise
     
+    def criar_lote(self, interacoes: List[Interacao], conn=None) -> int:
+        """Insere várias interações em um único INSERT e retorna a quantidade"""
+        if not interacoes:
+            return 0
+        
+        valores = ", ".join(["(%s, %s, %s, COALESCE(%s, NOW()))"] * len(interacoes))
+        query = f"""
+            INSERT INTO interacoes (cliente_id, tipo, descricao, criado_em)
+            VALUES {valores}
+        """
+        params = tuple(
+            valor
+            for interacao in interacoes
+            for valor in (interacao.cliente_id, interacao.tipo,
+                          interacao.descricao, interacao.criado_em)
+        )
+        try:
+            DatabaseManager.execute_query(query, params, conn=conn)
+            return len(interacoes)
+        except Exception as e:
+            print(f"Erro ao criar lote de interações: {e}")
+            raise
+    
     def buscar_por_cliente(self, cliente_id: int) -> List[Interacao]:
         """Busca interações de um cliente ordenadas por data"""
         query = """
@@ -45,8 +75,7 @@ class InteracaoRepository(BaseRepository[Interacao]):
             ORDER BY criado_em DESC
         """
         try:
-            result = DatabaseManager.execute_query(query, (cliente_id,), fetch=True)
-            return [self._row_to_entity(row) for row in result]
+            return self._consultar(query, (cliente_id,))
         except Exception as e:
             print(f"Erro ao buscar interações por cliente: {e}")
             return []
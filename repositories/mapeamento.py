@@ -0,0 +1,58 @@
+"""
+Mapeamento de linhas (tuplas) do banco para entidades
+"""
+from dataclasses import MISSING, fields
+from operator import itemgetter
+from typing import Any, Callable, Dict, Sequence
+
+
+def texto_ou_vazio(valor) -> str:
+    """Converte NULL em string vazia (colunas vindas de LEFT JOIN)"""
+    return valor or ''
+
+
+def criar_mapeador(classe: type, colunas: Sequence[str],
+                   conversores: Dict[str, Callable[[Any], Any]] = None) -> Callable[[tuple], Any]:
+    """Gera uma função que converte uma tupla do cursor em uma instância de classe.
+
+    Os índices de cada campo do dataclass são calculados uma única vez a
+    partir dos nomes das colunas (cursor.column_names), então cada linha custa
+    apenas um itemgetter e a construção posicional da entidade, sem montar um
+    dict por linha. Campos sem coluna correspondente recebem o valor padrão do
+    dataclass; colunas sem campo correspondente são ignoradas.
+    """
+    conversores = conversores or {}
+    posicoes = {nome: i for i, nome in enumerate(colunas)}
+
+    indices = []
+    extras = []
+    conversoes = []
+    for ordem, campo in enumerate(fields(classe)):
+        if campo.name in posicoes:
+            indices.append(posicoes[campo.name])
+        else:
+            # Valores padrão vão ao final da linha: linha + extras
+            indices.append(len(colunas) + len(extras))
+            extras.append(campo.default if campo.default is not MISSING else None)
+        if campo.name in conversores:
+            conversoes.append((ordem, conversores[campo.name]))
+
+    extras = tuple(extras)
+    if len(indices) == 1:
+        unico = indices[0]
+        pegar = lambda linha: (linha[unico],)
+    else:
+        pegar = itemgetter(*indices)
+
+    if not conversoes:
+        if not extras:
+            return lambda linha: classe(*pegar(linha))
+        return lambda linha: classe(*pegar(linha + extras))
+
+    def mapear(linha: tuple):
+        valores = list(pegar(linha + extras) if extras else pegar(linha))
+        for ordem, converter in conversoes:
+            valores[ordem] = converter(valores[ordem])
+        return classe(*valores)
+
+    return mapear
@@ -2,15 +2,25 @@
 Repository para Oportunidade
 """
 from typing import List, Optional
-from datetime import date
-from models.oportunidade import Oportunidade
-from repositories.base_repository import BaseRepository
+from datetime import date, datetime
+from models.oportunidade import Oportunidade, OportunidadeResumo
+from repositories.base_repository import Alteracoes, BaseRepository, Pagina
+from repositories.mapeamento import texto_ou_vazio
 from core.database import DatabaseManager
 
 
 class OportunidadeRepository(BaseRepository[Oportunidade]):
     """Repository para operações CRUD de Oportunidade"""
     
+    ORDENACOES = {
+        'id': ('id', 'DESC'),
+        'data_prevista_fechamento': ('data_prevista_fechamento', 'ASC'),
+    }
+    
+    ENTIDADE = Oportunidade
+    RESUMO = OportunidadeResumo
+    CONVERSORES = {'valor': float, 'cliente_nome': texto_ou_vazio}
+    
     def __init__(self):
         super().__init__('oportunidades')
     
@@ -27,10 +37,19 @@ class OportunidadeRepository(BaseRepository[Oportunidade]):
             responsavel=row.get('responsavel', ''),
             observacoes=row.get('observacoes', ''),
             criado_em=row.get('criado_em'),
-            atualizado_em=row.get('atualizado_em')
+            atualizado_em=row.get('atualizado_em'),
+            cliente_nome=row.get('cliente_nome') or ''
         )
     
-    def criar(self, oportunidade: Oportunidade) -> int:
+    def _select(self) -> str:
+        """SELECT com o nome do cliente, evitando uma consulta por linha na UI"""
+        return """
+            SELECT oportunidades.*, clientes.nome AS cliente_nome
+            FROM oportunidades
+            LEFT JOIN clientes ON clientes.id = oportunidades.cliente_id
+        """
+    
+    def criar(self, oportunidade: Oportunidade, conn=None) -> int:
         """Cria uma nova oportunidade e retorna o ID"""
         query = """
             INSERT INTO oportunidades (cliente_id, titulo, etapa, valor, probabilidade,
@@ -44,13 +63,13 @@ class OportunidadeRepository(BaseRepository[Oportunidade]):
             oportunidade.observacoes
         )
         try:
-            result = DatabaseManager.execute_query(query, params)
+            result = DatabaseManager.execute_query(query, params, conn=conn)
             return result
         except Exception as e:
             print(f"Erro ao criar oportunidade: {e}")
             raise
     
-    def atualizar(self, oportunidade: Oportunidade) -> bool:
+    def atualizar(self, oportunidade: Oportunidade, conn=None) -> bool:
         """Atualiza uma oportunidade existente"""
         query = """
             UPDATE oportunidades SET
@@ -65,8 +84,9 @@ class OportunidadeRepository(BaseRepository[Oportunidade]):
             oportunidade.data_prevista_fechamento, oportunidade.responsavel,
             oportunidade.observacoes, oportunidade.id
         )
+        self._esquecer(oportunidade.id)
         try:
-            DatabaseManager.execute_query(query, params)
+            DatabaseManager.execute_query(query, params, conn=conn)
             return True
         except Exception as e:
             print(f"Erro ao atualizar oportunidade: {e}")
@@ -74,29 +94,101 @@ class OportunidadeRepository(BaseRepository[Oportunidade]):
     
     def buscar_por_cliente(self, cliente_id: int) -> List[Oportunidade]:
         """Busca oportunidades de um cliente"""
-        query = "SELECT * FROM oportunidades WHERE cliente_id = %s ORDER BY criado_em DESC"
+        query = f"""
+            {self._select()}
+            WHERE oportunidades.cliente_id = %s
+            ORDER BY oportunidades.criado_em DESC
+        """
         try:
-            result = DatabaseManager.execute_query(query, (cliente_id,), fetch=True)
-            return [self._row_to_entity(row) for row in result]
+            return self._consultar(query, (cliente_id,))
         except Exception as e:
             print(f"Erro ao buscar oportunidades por cliente: {e}")
             return []
     
     def buscar_por_etapa(self, etapa: str) -> List[Oportunidade]:
         """Busca oportunidades por etapa"""
-        query = "SELECT * FROM oportunidades WHERE etapa = %s ORDER BY data_prevista_fechamento"
+        query = f"""
+            {self._select()}
+            WHERE oportunidades.etapa = %s
+            ORDER BY oportunidades.data_prevista_fechamento
+        """
         try:
-            result = DatabaseManager.execute_query(query, (etapa,), fetch=True)
-            return [self._row_to_entity(row) for row in result]
+            return self._consultar(query, (etapa,))
         except Exception as e:
             print(f"Erro ao buscar oportunidades por etapa: {e}")
             return []
     
-    def atualizar_etapa(self, id: int, nova_etapa: str) -> bool:
+    def proximas_fechamento(self, etapas: List[str], prob_min: int = 0,
+                            limite: int = 5) -> List[OportunidadeResumo]:
+        """Oportunidades das etapas com fechamento previsto a partir de hoje e
+        probabilidade mínima, por data e maior probabilidade.
+        
+        Cada etapa é lida em ordem no índice (etapa, data_prevista_fechamento,
+        probabilidade DESC) com seu próprio LIMIT; o UNION ALL ordena no
+        máximo limite linhas por etapa, qualquer que seja o tamanho da tabela.
+        """
+        if not etapas:
+            return []
+        
+        por_etapa = f"""
+            ({self._select_resumo()}
+            WHERE oportunidades.etapa = %s
+            AND oportunidades.data_prevista_fechamento >= CURDATE()
+            AND oportunidades.probabilidade >= %s
+            ORDER BY oportunidades.data_prevista_fechamento, oportunidades.probabilidade DESC
+            LIMIT %s)
+        """
+        query = f"""
+            SELECT * FROM ({" UNION ALL ".join([por_etapa] * len(etapas))}) AS proximas
+            ORDER BY data_prevista_fechamento, probabilidade DESC
+            LIMIT %s
+        """
+        params = []
+        for etapa in etapas:
+            params.extend((etapa, prob_min, limite))
+        params.append(limite)
+        try:
+            return self._consultar(query, tuple(params), classe=OportunidadeResumo)
+        except Exception as e:
+            print(f"Erro ao buscar oportunidades próximas do fechamento: {e}")
+            return []
+    
+    def buscar_filtrado(self, texto: str = None, etapa: str = None, limite: int = 100,
+                        cursor: Optional[str] = None, ordem: str = 'id') -> Pagina[OportunidadeResumo]:
+        """Página de OportunidadeResumo com o texto no título ou no responsável
+        (LIKE no MySQL), opcionalmente só de uma etapa"""
+        return self.listar_resumos(cursor, limite, ordem, **self._filtros_busca(texto, etapa))
+    
+    def contar_filtrado(self, texto: str = None, etapa: str = None) -> int:
+        """Conta as oportunidades que atendem aos mesmos filtros de buscar_filtrado"""
+        return self.contar(**self._filtros_busca(texto, etapa))
+    
+    def alteradas_filtradas(self, marca: Optional[datetime], texto: str = None,
+                            etapa: str = None) -> Optional[Alteracoes]:
+        """alteradas_desde com os mesmos filtros de buscar_filtrado"""
+        return self.alteradas_desde(marca, **self._filtros_busca(texto, etapa))
+    
+    @staticmethod
+    def _filtros_busca(texto, etapa) -> dict:
+        """Converte os parâmetros de busca em filtros do BaseRepository"""
+        filtros = {}
+        if etapa:
+            filtros['etapa'] = etapa
+        if texto:
+            filtros['ou'] = {'titulo__contem': texto, 'responsavel__contem': texto}
+        return filtros
+    
+    def somar_valor_ponderado(self, **filtros) -> float:
+        """Soma valor * probabilidade das oportunidades que atendem aos filtros"""
+        resultado = self._agregar("SUM(valor * probabilidade / 100)", filtros)
+        return float(resultado or 0.0)
+    
+    def atualizar_etapa(self, id: int, nova_etapa: str, conn=None) -> bool:
         """Atualiza apenas a etapa de uma oportunidade"""
         query = "UPDATE oportunidades SET etapa = %s WHERE id = %s"
+        self._esquecer(id)
         try:
-            DatabaseManager.execute_query(query, (nova_etapa, id))
+            DatabaseManager.execute_query(query, (nova_etapa, id), conn=conn)
             return True
         except Exception as e:
             print(f"Erro ao atualizar etapa: {e}")
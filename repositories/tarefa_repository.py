@@ -1,16 +1,26 @@
 """
 Repository para Tarefa
 """
-from typing import List, Optional
+from typing import List, Optional, Tuple, Union
 from datetime import datetime
-from models.tarefa import Tarefa
-from repositories.base_repository import BaseRepository
+from models.tarefa import Tarefa, TarefaResumo
+from repositories.base_repository import Alteracoes, BaseRepository, Pagina
+from repositories.mapeamento import texto_ou_vazio
 from core.database import DatabaseManager
 
 
 class TarefaRepository(BaseRepository[Tarefa]):
     """Repository para operações CRUD de Tarefa"""
     
+    ORDENACOES = {
+        'id': ('id', 'DESC'),
+        'data_hora': ('data_hora', 'ASC'),
+    }
+    
+    ENTIDADE = Tarefa
+    RESUMO = TarefaResumo
+    CONVERSORES = {'cliente_nome': texto_ou_vazio}
+    
     def __init__(self):
         super().__init__('tarefas')
     
@@ -26,10 +36,20 @@ class TarefaRepository(BaseRepository[Tarefa]):
             prioridade=row.get('prioridade', 'Média'),
             observacoes=row.get('observacoes', ''),
             criado_em=row.get('criado_em'),
-            concluida_em=row.get('concluida_em')
+            concluida_em=row.get('concluida_em'),
+            atualizado_em=row.get('atualizado_em'),
+            cliente_nome=row.get('cliente_nome') or ''
         )
     
-    def criar(self, tarefa: Tarefa) -> int:
+    def _select(self) -> str:
+        """SELECT com o nome do cliente, evitando uma consulta por linha na UI"""
+        return """
+            SELECT tarefas.*, clientes.nome AS cliente_nome
+            FROM tarefas
+            LEFT JOIN clientes ON clientes.id = tarefas.cliente_id
+        """
+    
+    def criar(self, tarefa: Tarefa, conn=None) -> int:
         """Cria uma nova tarefa e retorna o ID"""
         query = """
             INSERT INTO tarefas (cliente_id, descricao, tipo, data_hora, status, prioridade, observacoes)
@@ -40,13 +60,13 @@ class TarefaRepository(BaseRepository[Tarefa]):
             tarefa.data_hora, tarefa.status, tarefa.prioridade, tarefa.observacoes
         )
         try:
-            result = DatabaseManager.execute_query(query, params)
+            result = DatabaseManager.execute_query(query, params, conn=conn)
             return result
         except Exception as e:
             print(f"Erro ao criar tarefa: {e}")
             raise
     
-    def atualizar(self, tarefa: Tarefa) -> bool:
+    def atualizar(self, tarefa: Tarefa, conn=None) -> bool:
         """Atualiza uma tarefa existente"""
         query = """
             UPDATE tarefas SET
@@ -59,8 +79,9 @@ class TarefaRepository(BaseRepository[Tarefa]):
             tarefa.data_hora, tarefa.status, tarefa.prioridade,
             tarefa.observacoes, tarefa.id
         )
+        self._esquecer(tarefa.id)
         try:
-            DatabaseManager.execute_query(query, params)
+            DatabaseManager.execute_query(query, params, conn=conn)
             return True
         except Exception as e:
             print(f"Erro ao atualizar tarefa: {e}")
@@ -68,60 +89,133 @@ class TarefaRepository(BaseRepository[Tarefa]):
     
     def buscar_por_cliente(self, cliente_id: int) -> List[Tarefa]:
         """Busca tarefas de um cliente"""
-        query = "SELECT * FROM tarefas WHERE cliente_id = %s ORDER BY data_hora DESC"
+        query = f"""
+            {self._select()}
+            WHERE tarefas.cliente_id = %s
+            ORDER BY tarefas.data_hora DESC
+        """
         try:
-            result = DatabaseManager.execute_query(query, (cliente_id,), fetch=True)
-            return [self._row_to_entity(row) for row in result]
+            return self._consultar(query, (cliente_id,))
         except Exception as e:
             print(f"Erro ao buscar tarefas por cliente: {e}")
             return []
     
     def buscar_por_status(self, status: str) -> List[Tarefa]:
         """Busca tarefas por status"""
-        query = "SELECT * FROM tarefas WHERE status = %s ORDER BY data_hora"
+        query = f"""
+            {self._select()}
+            WHERE tarefas.status = %s
+            ORDER BY tarefas.data_hora
+        """
         try:
-            result = DatabaseManager.execute_query(query, (status,), fetch=True)
-            return [self._row_to_entity(row) for row in result]
+            return self._consultar(query, (status,))
         except Exception as e:
             print(f"Erro ao buscar tarefas por status: {e}")
             return []
     
     def buscar_pendentes_hoje(self) -> List[Tarefa]:
         """Busca tarefas pendentes de hoje"""
-        query = """
-            SELECT * FROM tarefas
-            WHERE status = 'Pendente' AND DATE(data_hora) = CURDATE()
-            ORDER BY data_hora
+        query = f"""
+            {self._select()}
+            WHERE tarefas.status = 'Pendente'
+            AND tarefas.data_hora >= CURDATE() AND tarefas.data_hora < CURDATE() + INTERVAL 1 DAY
+            ORDER BY tarefas.data_hora
         """
         try:
-            result = DatabaseManager.execute_query(query, fetch=True)
-            return [self._row_to_entity(row) for row in result]
+            return self._consultar(query)
         except Exception as e:
             print(f"Erro ao buscar tarefas pendentes hoje: {e}")
             return []
     
     def buscar_atrasadas(self) -> List[Tarefa]:
         """Busca tarefas pendentes atrasadas"""
-        query = """
-            SELECT * FROM tarefas
-            WHERE status = 'Pendente' AND data_hora < NOW()
-            ORDER BY data_hora
+        query = f"""
+            {self._select()}
+            WHERE tarefas.status = 'Pendente' AND tarefas.data_hora < NOW()
+            ORDER BY tarefas.data_hora
         """
         try:
-            result = DatabaseManager.execute_query(query, fetch=True)
-            return [self._row_to_entity(row) for row in result]
+            return self._consultar(query)
         except Exception as e:
             print(f"Erro ao buscar tarefas atrasadas: {e}")
             return []
     
-    def marcar_concluida(self, id: int) -> bool:
+    def proximas(self, dias: int = 5, limite: int = 5) -> List[TarefaResumo]:
+        """Próximas tarefas pendentes, de hoje até hoje + dias, por data/hora.
+        
+        Faixa no índice (status, data_hora) já na ordem do ORDER BY: o LIMIT
+        encerra a leitura, então o custo não depende do tamanho da tabela.
+        """
+        query = f"""
+            {self._select_resumo()}
+            WHERE tarefas.status = 'Pendente'
+            AND tarefas.data_hora >= CURDATE()
+            AND tarefas.data_hora < CURDATE() + INTERVAL %s DAY
+            ORDER BY tarefas.data_hora
+            LIMIT %s
+        """
+        try:
+            return self._consultar(query, (dias + 1, limite), classe=TarefaResumo)
+        except Exception as e:
+            print(f"Erro ao buscar próximas tarefas: {e}")
+            return []
+    
+    def buscar_filtrado(self, texto: str = None, status: Union[str, List[str]] = None,
+                        prioridade: str = None,
+                        intervalo_data: Tuple[Optional[datetime], Optional[datetime]] = None,
+                        limite: int = 100, cursor: Optional[str] = None,
+                        ordem: str = 'data_hora', resumo: bool = False) -> Pagina:
+        """Busca uma página de tarefas combinando todos os filtros no MySQL.
+        
+        O intervalo de datas é semiaberto [inicio, fim), o que permite ao
+        índice (status, data_hora) restringir a faixa de linhas lidas. Com
+        resumo=True a página traz TarefaResumo em vez de Tarefa.
+        """
+        filtros = self._filtros_busca(texto, status, prioridade, intervalo_data)
+        if resumo:
+            return self.listar_resumos(cursor, limite, ordem, **filtros)
+        return self.listar_pagina(cursor, limite, ordem, **filtros)
+    
+    def contar_filtrado(self, texto: str = None, status: Union[str, List[str]] = None,
+                        prioridade: str = None,
+                        intervalo_data: Tuple[Optional[datetime], Optional[datetime]] = None) -> int:
+        """Conta as tarefas que atendem aos mesmos filtros de buscar_filtrado"""
+        return self.contar(**self._filtros_busca(texto, status, prioridade, intervalo_data))
+    
+    def alteradas_filtradas(self, marca: Optional[datetime], texto: str = None,
+                            status: Union[str, List[str]] = None, prioridade: str = None,
+                            intervalo_data: Tuple[Optional[datetime], Optional[datetime]] = None
+                            ) -> Optional[Alteracoes]:
+        """alteradas_desde com os mesmos filtros de buscar_filtrado"""
+        return self.alteradas_desde(marca, **self._filtros_busca(texto, status, prioridade, intervalo_data))
+    
+    @staticmethod
+    def _filtros_busca(texto, status, prioridade, intervalo_data) -> dict:
+        """Converte os parâmetros de busca em filtros do BaseRepository"""
+        filtros = {}
+        if status is not None and status != '':
+            filtros['status'] = status
+        if prioridade:
+            filtros['prioridade'] = prioridade
+        if intervalo_data:
+            inicio, fim = intervalo_data
+            if inicio:
+                filtros['data_hora__gte'] = inicio
+            if fim:
+                filtros['data_hora__lt'] = fim
+        if texto:
+            filtros['descricao__contem'] = texto
+        return filtros
+    
+    def marcar_concluida(self, id: int, conn=None) -> bool:
         """Marca uma tarefa como concluída"""
         query = """
             UPDATE tarefas SET status = 'Concluída', concluida_em = NOW()
             WHERE id = %s
         """
+        self._esquecer(id)
         try:
-            DatabaseManager.execute_query(query, (id,))
+            DatabaseManager.execute_query(query, (id,), conn=conn)
             return True
         except Exception as e:
             print(f"Erro ao marcar tarefa como concluída: {e}")
@@ -0,0 +1,53 @@
+"""
+Service de detecção de alterações nas tabelas
+"""
+import threading
+from typing import Dict, Set
+from core.database import DatabaseManager
+from repositories.base_repository import BaseRepository
+
+
+class AlteracoesService:
+    """Descobre quais tabelas mudaram desde a última verificação.
+    
+    Cada verificação lê, em uma única consulta, a assinatura de cada tabela
+    monitorada (COUNT(*), MAX(id), MAX(atualizado_em); ver
+    BaseRepository.sql_assinatura) e compara com a anterior. Inclusões,
+    edições e exclusões feitas por qualquer estação alteram a assinatura. A
+    consulta não passa pelo cache de consultas, e as tabelas alteradas são
+    invalidadas nele.
+    """
+    
+    def __init__(self, *repos: BaseRepository):
+        self.repos = repos
+        self._assinaturas: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+    
+    def assinaturas(self) -> Dict[str, tuple]:
+        """Assinatura atual de cada tabela monitorada ({} em caso de erro)"""
+        query = " UNION ALL ".join(repo.sql_assinatura() for repo in self.repos)
+        try:
+            _, linhas = DatabaseManager.fetch_rows(query, usar_cache=False)
+            return {linha[0]: tuple(linha[1:]) for linha in linhas}
+        except Exception as e:
+            print(f"Erro ao verificar alterações: {e}")
+            return {}
+    
+    def verificar(self) -> Set[str]:
+        """Tabelas alteradas desde a verificação anterior.
+        
+        A primeira verificação (e uma que falhe) só registra o estado atual e
+        retorna um conjunto vazio.
+        """
+        atuais = self.assinaturas()
+        if not atuais:
+            return set()
+        with self._lock:
+            anteriores, self._assinaturas = self._assinaturas, atuais
+        if not anteriores:
+            return set()
+        alteradas = {tabela for tabela, assinatura in atuais.items()
+                     if anteriores.get(tabela) != assinatura}
+        if alteradas:
+            DatabaseManager.invalidar_cache(alteradas)
+        return alteradas
@@ -0,0 +1,104 @@
+"""
+Registro de interações em segundo plano (write-behind)
+"""
+import queue
+import threading
+from datetime import datetime
+from typing import List
+from models.interacao import Interacao
+from repositories.interacao_repository import InteracaoRepository
+
+_FIM = object()
+
+
+class AuditoriaAssincrona:
+    """Fila de interações gravada em lotes por uma thread de fundo.
+
+    Pode substituir o InteracaoRepository nos services: criar() apenas
+    enfileira a interação e retorna, e a thread grava o que acumulou com um
+    INSERT de várias linhas por lote. A fila é limitada; quando está cheia,
+    criar() espera por espaço (backpressure) e, se a espera passar do limite,
+    grava a interação diretamente. encerrar() deve ser chamado na saída da
+    aplicação para gravar o que ainda estiver na fila.
+    """
+
+    CAPACIDADE = 1000
+    TAMANHO_LOTE = 200
+    INTERVALO_SEGUNDOS = 0.5
+    ESPERA_MAXIMA_SEGUNDOS = 2.0
+
+    def __init__(self, interacao_repo: InteracaoRepository, capacidade: int = CAPACIDADE,
+                 tamanho_lote: int = TAMANHO_LOTE):
+        self.interacao_repo = interacao_repo
+        self.tamanho_lote = tamanho_lote
+        self._fila: queue.Queue = queue.Queue(maxsize=capacidade)
+        self._encerrada = False
+        # Une a checagem de _encerrada ao put: nada entra na fila depois do _FIM
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._executar, name="auditoria", daemon=True)
+        self._thread.start()
+
+    def criar(self, interacao: Interacao, conn=None) -> None:
+        """Enfileira a interação (conn é ignorada: a gravação é posterior)"""
+        if interacao.criado_em is None:
+            interacao.criado_em = datetime.now()
+
+        with self._lock:
+            if not self._encerrada:
+                try:
+                    self._fila.put(interacao, timeout=self.ESPERA_MAXIMA_SEGUNDOS)
+                    return
+                except queue.Full:
+                    pass
+
+        self.interacao_repo.criar(interacao)
+
+    def pendentes(self) -> int:
+        """Quantidade aproximada de interações aguardando gravação"""
+        return self._fila.qsize()
+
+    def encerrar(self, timeout: float = 10.0):
+        """Grava as interações pendentes e finaliza a thread"""
+        with self._lock:
+            if self._encerrada:
+                return
+            self._encerrada = True
+            self._fila.put(_FIM)
+        self._thread.join(timeout)
+
+    def _executar(self):
+        while True:
+            try:
+                primeiro = self._fila.get(timeout=self.INTERVALO_SEGUNDOS)
+            except queue.Empty:
+                continue
+            if primeiro is _FIM:
+                return
+
+            lote = [primeiro]
+            fim = False
+            while len(lote) < self.tamanho_lote:
+                try:
+                    item = self._fila.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _FIM:
+                    fim = True
+                    break
+                lote.append(item)
+
+            self._gravar(lote)
+            if fim:
+                return
+
+    def _gravar(self, lote: List[Interacao]):
+        try:
+            self.interacao_repo.criar_lote(lote)
+        except Exception:
+            # Uma linha inválida (ex.: cliente já excluído) derruba o INSERT
+            # inteiro; grava uma a uma para não perder as demais
+            for interacao in lote:
+                try:
+                    self.interacao_repo.criar(interacao)
+                except Exception as e:
+                    print(f"Erro ao gravar interação em segundo plano: {e}")
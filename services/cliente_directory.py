@@ -0,0 +1,105 @@
+"""
+Diretório de nomes de clientes compartilhado pela aplicação
+"""
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from repositories.cliente_repository import ClienteRepository
+
+
+class ClienteDirectory:
+    """Mapa em memória id -> (nome, empresa) de todos os clientes.
+
+    Carregado uma vez com uma consulta que projeta só essas colunas e mantido
+    por atualizar(), que aplica apenas os clientes incluídos, alterados ou
+    excluídos desde a última leitura (ClienteRepository.alteradas_desde, com
+    a mesma folga de commit e as exclusões registradas). nome(), empresa() e
+    listar() leem só a memória e podem ser chamados ao desenhar a tabela;
+    quem exibe os nomes chama atualizar() antes, fora do paint. O
+    ClienteService invalida o diretório a cada escrita; alterações feitas por
+    outras estações entram no primeiro atualizar() após INTERVALO_ATUALIZACAO.
+    """
+
+    INTERVALO_ATUALIZACAO = 60  # segundos
+
+    def __init__(self, cliente_repo: ClienteRepository):
+        self.cliente_repo = cliente_repo
+        self._entradas: Dict[int, Tuple[str, str]] = {}
+        self._marca: Optional[datetime] = None
+        self._carregado = False
+        self._desatualizado = False
+        self._ultima_leitura = 0.0
+        # _lock protege as entradas e é mantido só por instantes (o paint o
+        # usa); _lock_atualizacao serializa as leituras no banco
+        self._lock = threading.Lock()
+        self._lock_atualizacao = threading.Lock()
+
+    def nome(self, cliente_id: int) -> str:
+        """Nome do cliente ('' se não existir ou ainda não carregado)"""
+        with self._lock:
+            entrada = self._entradas.get(cliente_id)
+        return entrada[0] if entrada else ''
+
+    def empresa(self, cliente_id: int) -> str:
+        """Empresa do cliente ('' se não existir ou ainda não carregado)"""
+        with self._lock:
+            entrada = self._entradas.get(cliente_id)
+        return entrada[1] if entrada else ''
+
+    def listar(self) -> List[Tuple[int, str]]:
+        """Pares (id, nome) de todos os clientes, dos mais recentes aos mais antigos"""
+        with self._lock:
+            return [(id, self._entradas[id][0]) for id in sorted(self._entradas, reverse=True)]
+
+    def invalidar(self):
+        """Marca o diretório para atualização incremental no próximo atualizar()"""
+        self._desatualizado = True
+
+    def remover(self, cliente_id: int):
+        """Retira um cliente excluído sem esperar pelo próximo atualizar()"""
+        with self._lock:
+            self._entradas.pop(cliente_id, None)
+
+    def recarregar(self):
+        """Descarta o conteúdo e lê todos os clientes novamente"""
+        with self._lock_atualizacao:
+            self._carregado = False
+        self.atualizar()
+
+    def atualizar(self):
+        """Lê do banco o que mudou, se o diretório estiver desatualizado ou expirado"""
+        with self._lock_atualizacao:
+            expirado = time.monotonic() - self._ultima_leitura > self.INTERVALO_ATUALIZACAO
+            if self._carregado and not self._desatualizado and not expirado:
+                return
+
+            self._desatualizado = False
+            self._ultima_leitura = time.monotonic()
+            if not self._carregado:
+                self._carregar_todos()
+                return
+
+            alteracoes = self.cliente_repo.alteradas_desde(self._marca)
+            if alteracoes is None:
+                self._desatualizado = True
+                return
+            with self._lock:
+                for cliente in alteracoes.itens:
+                    self._entradas[cliente.id] = (cliente.nome or '', cliente.empresa or '')
+                for id in alteracoes.removidos:
+                    self._entradas.pop(id, None)
+            self._marca = alteracoes.marca
+
+    def _carregar_todos(self):
+        # Marca lida antes da carga: o que mudar durante ela entra no próximo atualizar()
+        alteracoes = self.cliente_repo.alteradas_desde(None)
+        if alteracoes is None:
+            self._desatualizado = True
+            return
+        entradas = {id: (nome or '', empresa or '')
+                    for id, nome, empresa in self.cliente_repo.listar_nomes()}
+        with self._lock:
+            self._entradas = entradas
+        self._marca = alteracoes.marca
+        self._carregado = True
@@ -1,20 +1,27 @@
 """
 Service para Cliente - Regras de negócio
 """
-from typing import List, Optional
-from models.cliente import Cliente
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from core.database import DatabaseManager
+from models.cliente import Cliente, ClienteResumo
 from models.interacao import Interacao
+from repositories.base_repository import Alteracoes, Pagina
 from repositories.cliente_repository import ClienteRepository
 from repositories.interacao_repository import InteracaoRepository
+from services.cliente_directory import ClienteDirectory
 from utils.validators import Validators
 
 
 class ClienteService:
     """Service com regras de negócio para Cliente"""
     
-    def __init__(self, cliente_repo: ClienteRepository, interacao_repo: InteracaoRepository):
+    def __init__(self, cliente_repo: ClienteRepository, interacao_repo: InteracaoRepository,
+                 diretorio: Optional[ClienteDirectory] = None):
         self.cliente_repo = cliente_repo
         self.interacao_repo = interacao_repo
+        # Nomes de clientes em memória, compartilhado pelas telas
+        self.diretorio = diretorio or ClienteDirectory(cliente_repo)
     
     def criar_cliente(self, cliente: Cliente) -> int:
         """Cria um novo cliente com validações"""
@@ -29,16 +36,17 @@ class ClienteService:
             if not Validators.validar_cpf_cnpj(cliente.cnpj_cpf):
                 raise ValueError("CPF/CNPJ inválido")
         
-        # Criar cliente
-        cliente_id = self.cliente_repo.criar(cliente)
-        
-        # Registrar interação
-        self.interacao_repo.criar(Interacao(
-            cliente_id=cliente_id,
-            tipo="cliente_criado",
-            descricao=f"Cliente {cliente.nome} foi cadastrado"
-        ))
+        # Criar cliente e registrar interação na mesma transação
+        with DatabaseManager.transaction() as conn:
+            cliente_id = self.cliente_repo.criar(cliente, conn=conn)
+            
+            self.interacao_repo.criar(Interacao(
+                cliente_id=cliente_id,
+                tipo="cliente_criado",
+                descricao=f"Cliente {cliente.nome} foi cadastrado"
+            ), conn=conn)
         
+        self.diretorio.invalidar()
         return cliente_id
     
     def atualizar_cliente(self, cliente: Cliente) -> bool:
@@ -55,30 +63,67 @@ class ClienteService:
         if cliente.cnpj_cpf and not Validators.validar_cpf_cnpj(cliente.cnpj_cpf):
             raise ValueError("CPF/CNPJ inválido")
         
-        # Atualizar cliente
-        sucesso = self.cliente_repo.atualizar(cliente)
-        
-        if sucesso:
-            # Registrar interação
-            self.interacao_repo.criar(Interacao(
-                cliente_id=cliente.id,
-                tipo="cliente_editado",
-                descricao=f"Cliente {cliente.nome} foi atualizado"
-            ))
+        # Atualizar cliente e registrar interação na mesma transação
+        with DatabaseManager.transaction() as conn:
+            sucesso = self.cliente_repo.atualizar(cliente, conn=conn)
+            
+            if sucesso:
+                self.interacao_repo.criar(Interacao(
+                    cliente_id=cliente.id,
+                    tipo="cliente_editado",
+                    descricao=f"Cliente {cliente.nome} foi atualizado"
+                ), conn=conn)
         
+        self.diretorio.invalidar()
         return sucesso
     
     def buscar_cliente(self, id: int) -> Optional[Cliente]:
         """Busca um cliente por ID"""
         return self.cliente_repo.buscar_por_id(id)
     
+    def buscar_clientes_por_ids(self, ids: Iterable[int]) -> Dict[int, Cliente]:
+        """Busca vários clientes por ID (id -> cliente)"""
+        return self.cliente_repo.buscar_por_ids(ids)
+    
     def listar_clientes(self) -> List[Cliente]:
         """Lista todos os clientes"""
         return self.cliente_repo.listar_todos()
     
-    def buscar_clientes(self, termo: str) -> List[Cliente]:
-        """Busca clientes por termo"""
-        return self.cliente_repo.buscar(termo)
+    def listar_nomes_clientes(self) -> List[Tuple[int, str]]:
+        """Pares (id, nome) de todos os clientes, lidos do diretório em memória"""
+        self.diretorio.atualizar()
+        return self.diretorio.listar()
+    
+    def nome_cliente(self, id: int) -> str:
+        """Nome do cliente, lido do diretório em memória"""
+        self.diretorio.atualizar()
+        return self.diretorio.nome(id)
+    
+    def listar_clientes_pagina(self, cursor: Optional[str] = None, limite: int = 100,
+                               ordem: str = 'id', **filtros) -> Pagina[Cliente]:
+        """Lista uma página de clientes a partir do cursor"""
+        return self.cliente_repo.listar_pagina(cursor, limite, ordem, **filtros)
+    
+    def listar_clientes_resumo(self, cursor: Optional[str] = None, limite: int = 100,
+                               ordem: str = 'id', **filtros) -> Pagina[ClienteResumo]:
+        """Lista uma página de clientes só com as colunas da listagem"""
+        return self.cliente_repo.listar_resumos(cursor, limite, ordem, **filtros)
+    
+    def alteracoes_clientes(self, marca: Optional[datetime]) -> Optional[Alteracoes[ClienteResumo]]:
+        """Clientes incluídos, alterados ou excluídos desde a marca d'água"""
+        return self.cliente_repo.alteradas_desde(marca)
+    
+    def iterar_clientes(self) -> Iterator[Cliente]:
+        """Percorre todos os clientes sem carregar a tabela inteira"""
+        return self.cliente_repo.iterar_todos()
+    
+    def contar_clientes(self, **filtros) -> int:
+        """Conta os clientes que atendem aos filtros"""
+        return self.cliente_repo.contar(**filtros)
+    
+    def buscar_clientes(self, termo: str, resumo: bool = False) -> list:
+        """Busca clientes por termo (ClienteResumo se resumo=True)"""
+        return self.cliente_repo.buscar(termo, resumo)
     
     def excluir_cliente(self, id: int) -> bool:
         """Exclui um cliente"""
@@ -86,15 +131,11 @@ class ClienteService:
         if not cliente:
             return False
         
+        # Sem registro de interação: interacoes.cliente_id referencia o cliente
+        # (ON DELETE CASCADE), então o registro seria apagado junto ou violaria
+        # a chave estrangeira se inserido depois da exclusão.
         sucesso = self.cliente_repo.excluir(id)
-        
         if sucesso:
-            # Registrar interação
-            self.interacao_repo.criar(Interacao(
-                cliente_id=id,
-                tipo="cliente_excluido",
-                descricao=f"Cliente {cliente.nome} foi excluído"
-            ))
-        
+            self.diretorio.remover(id)
         return sucesso
 
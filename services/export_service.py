@@ -2,7 +2,7 @@
 Service para exportação de dados
 """
 import csv
-from typing import List
+from typing import Iterable
 from pathlib import Path
 from datetime import datetime
 from models.cliente import Cliente
@@ -14,8 +14,8 @@ class ExportService:
     """Service para exportação de dados para CSV/Excel"""
     
     @staticmethod
-    def exportar_clientes_csv(clientes: List[Cliente], caminho: str) -> bool:
-        """Exporta lista de clientes para CSV"""
+    def exportar_clientes_csv(clientes: Iterable[Cliente], caminho: str) -> bool:
+        """Exporta clientes para CSV (aceita lista ou iterador)"""
         try:
             with open(caminho, 'w', newline='', encoding='utf-8') as arquivo:
                 writer = csv.writer(arquivo)
@@ -41,8 +41,8 @@ class ExportService:
             return False
     
     @staticmethod
-    def exportar_oportunidades_csv(oportunidades: List[Oportunidade], caminho: str) -> bool:
-        """Exporta lista de oportunidades para CSV"""
+    def exportar_oportunidades_csv(oportunidades: Iterable[Oportunidade], caminho: str) -> bool:
+        """Exporta oportunidades para CSV (aceita lista ou iterador)"""
         try:
             with open(caminho, 'w', newline='', encoding='utf-8') as arquivo:
                 writer = csv.writer(arquivo)
@@ -65,8 +65,8 @@ class ExportService:
             return False
     
     @staticmethod
-    def exportar_tarefas_csv(tarefas: List[Tarefa], caminho: str) -> bool:
-        """Exporta lista de tarefas para CSV"""
+    def exportar_tarefas_csv(tarefas: Iterable[Tarefa], caminho: str) -> bool:
+        """Exporta tarefas para CSV (aceita lista ou iterador)"""
         try:
             with open(caminho, 'w', newline='', encoding='utf-8') as arquivo:
                 writer = csv.writer(arquivo)
@@ -1,10 +1,12 @@
 """
 Service para Oportunidade - Regras de negócio
 """
-from typing import List, Optional
-from datetime import date
-from models.oportunidade import Oportunidade
+from typing import Dict, Iterable, Iterator, List, Optional
+from datetime import date, datetime
+from core.database import DatabaseManager
+from models.oportunidade import Oportunidade, OportunidadeResumo
 from models.interacao import Interacao
+from repositories.base_repository import Alteracoes, Pagina
 from repositories.oportunidade_repository import OportunidadeRepository
 from repositories.interacao_repository import InteracaoRepository
 
@@ -38,15 +40,15 @@ class OportunidadeService:
         if oportunidade.data_prevista_fechamento and oportunidade.data_prevista_fechamento < date.today():
             raise ValueError("Data prevista de fechamento não pode ser no passado")
         
-        # Criar oportunidade
-        oportunidade_id = self.oportunidade_repo.criar(oportunidade)
-        
-        # Registrar interação
-        self.interacao_repo.criar(Interacao(
-            cliente_id=oportunidade.cliente_id,
-            tipo="oportunidade_criada",
-            descricao=f"Oportunidade '{oportunidade.titulo}' foi criada na etapa {oportunidade.etapa}"
-        ))
+        # Criar oportunidade e registrar interação na mesma transação
+        with DatabaseManager.transaction() as conn:
+            oportunidade_id = self.oportunidade_repo.criar(oportunidade, conn=conn)
+            
+            self.interacao_repo.criar(Interacao(
+                cliente_id=oportunidade.cliente_id,
+                tipo="oportunidade_criada",
+                descricao=f"Oportunidade '{oportunidade.titulo}' foi criada na etapa {oportunidade.etapa}"
+            ), conn=conn)
         
         return oportunidade_id
     
@@ -64,20 +66,21 @@ class OportunidadeService:
         if oportunidade.valor < 0:
             raise ValueError("Valor não pode ser negativo")
         
-        # Buscar oportunidade antiga para comparar etapa
-        oportunidade_antiga = self.oportunidade_repo.buscar_por_id(oportunidade.id)
-        etapa_anterior = oportunidade_antiga.etapa if oportunidade_antiga else None
-        
-        # Atualizar oportunidade
-        sucesso = self.oportunidade_repo.atualizar(oportunidade)
-        
-        if sucesso and etapa_anterior and oportunidade.etapa != etapa_anterior:
-            # Registrar interação de mudança de etapa
-            self.interacao_repo.criar(Interacao(
-                cliente_id=oportunidade.cliente_id,
-                tipo="oportunidade_etapa_alterada",
-                descricao=f"Oportunidade '{oportunidade.titulo}' mudou de {etapa_anterior} para {oportunidade.etapa}"
-            ))
+        with DatabaseManager.transaction() as conn:
+            # Buscar oportunidade antiga para comparar etapa
+            oportunidade_antiga = self.oportunidade_repo.buscar_por_id(oportunidade.id, conn=conn)
+            etapa_anterior = oportunidade_antiga.etapa if oportunidade_antiga else None
+            
+            # Atualizar oportunidade
+            sucesso = self.oportunidade_repo.atualizar(oportunidade, conn=conn)
+            
+            if sucesso and etapa_anterior and oportunidade.etapa != etapa_anterior:
+                # Registrar interação de mudança de etapa
+                self.interacao_repo.criar(Interacao(
+                    cliente_id=oportunidade.cliente_id,
+                    tipo="oportunidade_etapa_alterada",
+                    descricao=f"Oportunidade '{oportunidade.titulo}' mudou de {etapa_anterior} para {oportunidade.etapa}"
+                ), conn=conn)
         
         return sucesso
     
@@ -85,10 +88,42 @@ class OportunidadeService:
         """Busca uma oportunidade por ID"""
         return self.oportunidade_repo.buscar_por_id(id)
     
+    def buscar_oportunidades_por_ids(self, ids: Iterable[int]) -> Dict[int, Oportunidade]:
+        """Busca várias oportunidades por ID (id -> oportunidade)"""
+        return self.oportunidade_repo.buscar_por_ids(ids)
+    
     def listar_oportunidades(self) -> List[Oportunidade]:
         """Lista todas as oportunidades"""
         return self.oportunidade_repo.listar_todos()
     
+    def listar_oportunidades_pagina(self, cursor: Optional[str] = None, limite: int = 100,
+                                    ordem: str = 'id', **filtros) -> Pagina[Oportunidade]:
+        """Lista uma página de oportunidades a partir do cursor"""
+        return self.oportunidade_repo.listar_pagina(cursor, limite, ordem, **filtros)
+    
+    def buscar_filtrado(self, texto: str = None, etapa: str = None, limite: int = 100,
+                        cursor: Optional[str] = None, ordem: str = 'id') -> Pagina[OportunidadeResumo]:
+        """Busca uma página de oportunidades por texto (título ou responsável) e etapa"""
+        return self.oportunidade_repo.buscar_filtrado(texto, etapa, limite, cursor, ordem)
+    
+    def contar_filtrado(self, texto: str = None, etapa: str = None) -> int:
+        """Conta as oportunidades que atendem aos filtros de buscar_filtrado"""
+        return self.oportunidade_repo.contar_filtrado(texto, etapa)
+    
+    def alteracoes_filtradas(self, marca: Optional[datetime], texto: str = None,
+                             etapa: str = None) -> Optional[Alteracoes[OportunidadeResumo]]:
+        """Oportunidades incluídas, alteradas ou excluídas desde a marca d'água,
+        com os mesmos filtros de buscar_filtrado"""
+        return self.oportunidade_repo.alteradas_filtradas(marca, texto, etapa)
+    
+    def iterar_oportunidades(self) -> Iterator[Oportunidade]:
+        """Percorre todas as oportunidades sem carregar a tabela inteira"""
+        return self.oportunidade_repo.iterar_todos()
+    
+    def contar_oportunidades(self, **filtros) -> int:
+        """Conta as oportunidades que atendem aos filtros"""
+        return self.oportunidade_repo.contar(**filtros)
+    
     def buscar_por_cliente(self, cliente_id: int) -> List[Oportunidade]:
         """Busca oportunidades de um cliente"""
         return self.oportunidade_repo.buscar_por_cliente(cliente_id)
@@ -97,24 +132,30 @@ class OportunidadeService:
         """Busca oportunidades por etapa"""
         return self.oportunidade_repo.buscar_por_etapa(etapa)
     
+    def proximas_fechamento(self, etapas: List[str], prob_min: int = 0,
+                            limite: int = 5) -> List[OportunidadeResumo]:
+        """Oportunidades das etapas com fechamento mais próximo"""
+        return self.oportunidade_repo.proximas_fechamento(etapas, prob_min, limite)
+    
     def mover_etapa(self, id: int, nova_etapa: str) -> bool:
         """Move uma oportunidade para outra etapa"""
         if nova_etapa not in self.ETAPAS:
             raise ValueError(f"Etapa inválida")
         
-        oportunidade = self.oportunidade_repo.buscar_por_id(id)
-        if not oportunidade:
-            return False
-        
-        etapa_anterior = oportunidade.etapa
-        sucesso = self.oportunidade_repo.atualizar_etapa(id, nova_etapa)
-        
-        if sucesso:
-            self.interacao_repo.criar(Interacao(
-                cliente_id=oportunidade.cliente_id,
-                tipo="oportunidade_etapa_alterada",
-                descricao=f"Oportunidade '{oportunidade.titulo}' mudou de {etapa_anterior} para {nova_etapa}"
-            ))
+        with DatabaseManager.transaction() as conn:
+            oportunidade = self.oportunidade_repo.buscar_por_id(id, conn=conn)
+            if not oportunidade:
+                return False
+            
+            etapa_anterior = oportunidade.etapa
+            sucesso = self.oportunidade_repo.atualizar_etapa(id, nova_etapa, conn=conn)
+            
+            if sucesso:
+                self.interacao_repo.criar(Interacao(
+                    cliente_id=oportunidade.cliente_id,
+                    tipo="oportunidade_etapa_alterada",
+                    descricao=f"Oportunidade '{oportunidade.titulo}' mudou de {etapa_anterior} para {nova_etapa}"
+                ), conn=conn)
         
         return sucesso
     
@@ -124,20 +165,15 @@ class OportunidadeService:
     
     def calcular_valor_total_negociacao(self) -> float:
         """Calcula o valor total em negociação (oportunidades não fechadas/perdidas)"""
-        oportunidades = self.oportunidade_repo.listar_todos()
-        total = sum(
-            op.valor * (op.probabilidade / 100)
-            for op in oportunidades
-            if op.etapa not in ['Fechado', 'Perdido']
+        return self.oportunidade_repo.somar_valor_ponderado(
+            etapa__not_in=['Fechado', 'Perdido']
         )
-        return total
     
     def calcular_taxa_conversao(self) -> float:
         """Calcula a taxa de conversão (Fechado / Total)"""
-        todas = self.oportunidade_repo.listar_todos()
-        if not todas:
+        total = self.oportunidade_repo.contar()
+        if not total:
             return 0.0
         
-        fechadas = sum(1 for op in todas if op.etapa == 'Fechado')
-        return (fechadas / len(todas)) * 100
-
+        fechadas = self.oportunidade_repo.contar(etapa='Fechado')
+        return (fechadas / total) * 100
@@ -1,6 +1,7 @@
 """
 Service para geração de relatórios
 """
+from dataclasses import dataclass, field
 from typing import List, Dict
 from datetime import datetime, date, timedelta
 from repositories.cliente_repository import ClienteRepository
@@ -9,6 +10,25 @@ from repositories.tarefa_repository import TarefaRepository
 from core.database import DatabaseManager
 
 
+@dataclass
+class DashboardSnapshot:
+    """Métricas do dashboard calculadas em uma única ida ao banco"""
+    total_clientes: int = 0
+    total_oportunidades: int = 0
+    oportunidades_abertas: int = 0
+    oportunidades_fechadas: int = 0
+    oportunidades_perdidas: int = 0
+    oportunidades_por_etapa: Dict[str, int] = field(default_factory=dict)
+    valor_negociacao: float = 0.0
+    valor_fechado: float = 0.0
+    taxa_conversao: float = 0.0
+    total_tarefas: int = 0
+    tarefas_concluidas: int = 0
+    tarefas_pendentes: int = 0
+    tarefas_pendentes_hoje: int = 0
+    tarefas_atrasadas: int = 0
+
+
 class RelatorioService:
     """Service para geração de relatórios e métricas"""
     
@@ -19,36 +39,92 @@ class RelatorioService:
         self.oportunidade_repo = oportunidade_repo
         self.tarefa_repo = tarefa_repo
     
+    def snapshot(self) -> DashboardSnapshot:
+        """Calcula todas as métricas do dashboard com agregações no MySQL"""
+        query_totais = """
+            SELECT
+                (SELECT COUNT(*) FROM clientes) AS total_clientes,
+                (SELECT COUNT(*) FROM tarefas) AS total_tarefas,
+                (SELECT COUNT(*) FROM tarefas WHERE status = 'Concluída') AS tarefas_concluidas,
+                (SELECT COUNT(*) FROM tarefas WHERE status = 'Pendente') AS tarefas_pendentes,
+                (SELECT COUNT(*) FROM tarefas
+                 WHERE status = 'Pendente'
+                 AND data_hora >= CURDATE() AND data_hora < CURDATE() + INTERVAL 1 DAY) AS tarefas_pendentes_hoje,
+                (SELECT COUNT(*) FROM tarefas
+                 WHERE status = 'Pendente' AND data_hora < NOW()) AS tarefas_atrasadas
+        """
+        query_etapas = """
+            SELECT etapa, COUNT(*) AS quantidade, SUM(valor) AS valor,
+                   SUM(valor * probabilidade / 100) AS valor_ponderado
+            FROM oportunidades
+            GROUP BY etapa
+        """
+        try:
+            totais, etapas = DatabaseManager.execute_queries([
+                (query_totais, None),
+                (query_etapas, None)
+            ])
+        except Exception as e:
+            print(f"Erro ao calcular métricas do dashboard: {e}")
+            return DashboardSnapshot()
+        
+        linha = totais[0] if totais else {}
+        snapshot = DashboardSnapshot(
+            total_clientes=int(linha.get('total_clientes') or 0),
+            total_tarefas=int(linha.get('total_tarefas') or 0),
+            tarefas_concluidas=int(linha.get('tarefas_concluidas') or 0),
+            tarefas_pendentes=int(linha.get('tarefas_pendentes') or 0),
+            tarefas_pendentes_hoje=int(linha.get('tarefas_pendentes_hoje') or 0),
+            tarefas_atrasadas=int(linha.get('tarefas_atrasadas') or 0)
+        )
+        
+        for row in etapas:
+            etapa = row['etapa']
+            quantidade = int(row['quantidade'] or 0)
+            snapshot.oportunidades_por_etapa[etapa] = quantidade
+            snapshot.total_oportunidades += quantidade
+            if etapa == 'Fechado':
+                snapshot.oportunidades_fechadas = quantidade
+                snapshot.valor_fechado = float(row['valor'] or 0)
+            elif etapa == 'Perdido':
+                snapshot.oportunidades_perdidas = quantidade
+            else:
+                snapshot.oportunidades_abertas += quantidade
+                snapshot.valor_negociacao += float(row['valor_ponderado'] or 0)
+        
+        if snapshot.total_oportunidades:
+            snapshot.taxa_conversao = (
+                snapshot.oportunidades_fechadas / snapshot.total_oportunidades
+            ) * 100
+        
+        return snapshot
+    
     def total_clientes(self) -> int:
         """Retorna o total de clientes"""
-        return len(self.cliente_repo.listar_todos())
+        return self.cliente_repo.contar()
     
     def total_oportunidades_abertas(self) -> int:
         """Retorna o total de oportunidades abertas (não fechadas/perdidas)"""
-        todas = self.oportunidade_repo.listar_todos()
-        return sum(1 for op in todas if op.etapa not in ['Fechado', 'Perdido'])
+        return self.oportunidade_repo.contar(etapa__not_in=['Fechado', 'Perdido'])
     
     def valor_total_negociacao(self) -> float:
         """Retorna o valor total em negociação"""
-        oportunidades = self.oportunidade_repo.listar_todos()
-        total = sum(
-            op.valor * (op.probabilidade / 100)
-            for op in oportunidades
-            if op.etapa not in ['Fechado', 'Perdido']
+        return self.oportunidade_repo.somar_valor_ponderado(
+            etapa__not_in=['Fechado', 'Perdido']
         )
-        return total
     
     def total_tarefas_pendentes_hoje(self) -> int:
         """Retorna o total de tarefas pendentes de hoje"""
-        return len(self.tarefa_repo.buscar_pendentes_hoje())
+        hoje = datetime.combine(date.today(), datetime.min.time())
+        return self.tarefa_repo.contar(
+            status='Pendente',
+            data_hora__gte=hoje,
+            data_hora__lt=hoje + timedelta(days=1)
+        )
     
     def oportunidades_por_etapa(self) -> Dict[str, int]:
         """Retorna contagem de oportunidades por etapa"""
-        todas = self.oportunidade_repo.listar_todos()
-        etapas = {}
-        for op in todas:
-            etapas[op.etapa] = etapas.get(op.etapa, 0) + 1
-        return etapas
+        return self.oportunidade_repo.agrupar_contagem('etapa')
     
     def vendas_por_periodo(self, data_inicio: date, data_fim: date) -> List[Dict]:
         """Retorna vendas (oportunidades fechadas) por período"""
@@ -56,13 +132,14 @@ class RelatorioService:
             SELECT DATE(criado_em) as data, SUM(valor) as total
             FROM oportunidades
             WHERE etapa = 'Fechado'
-            AND DATE(criado_em) BETWEEN %s AND %s
+            AND criado_em >= %s AND criado_em < %s
             GROUP BY DATE(criado_em)
             ORDER BY data
         """
+        # Intervalo semiaberto: a coluna fica livre de funções e o índice é usado
         try:
             result = DatabaseManager.execute_query(
-                query, (data_inicio, data_fim), fetch=True
+                query, (data_inicio, data_fim + timedelta(days=1)), fetch=True
             )
             return result
         except Exception as e:
@@ -71,20 +148,17 @@ class RelatorioService:
     
     def tarefas_concluidas_vs_pendentes(self) -> Dict[str, int]:
         """Retorna contagem de tarefas concluídas vs pendentes"""
-        todas = self.tarefa_repo.listar_todos()
-        concluidas = sum(1 for t in todas if t.status == 'Concluída')
-        pendentes = sum(1 for t in todas if t.status == 'Pendente')
+        por_status = self.tarefa_repo.agrupar_contagem('status')
         return {
-            'concluidas': concluidas,
-            'pendentes': pendentes,
-            'total': len(todas)
+            'concluidas': por_status.get('Concluída', 0),
+            'pendentes': por_status.get('Pendente', 0),
+            'total': sum(por_status.values())
         }
     
     def taxa_conversao(self) -> float:
         """Calcula taxa de conversão"""
-        todas = self.oportunidade_repo.listar_todos()
-        if not todas:
+        por_etapa = self.oportunidade_repo.agrupar_contagem('etapa')
+        total = sum(por_etapa.values())
+        if not total:
             return 0.0
-        fechadas = sum(1 for op in todas if op.etapa == 'Fechado')
-        return (fechadas / len(todas)) * 100
-
+        return (por_etapa.get('Fechado', 0) / total) * 100
@@ -1,10 +1,12 @@
 """
 Service para Tarefa - Regras de negócio
 """
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from datetime import datetime
-from models.tarefa import Tarefa
+from core.database import DatabaseManager
+from models.tarefa import Tarefa, TarefaResumo
 from models.interacao import Interacao
+from repositories.base_repository import Alteracoes, Pagina
 from repositories.tarefa_repository import TarefaRepository
 from repositories.interacao_repository import InteracaoRepository
 
@@ -37,15 +39,15 @@ class TarefaService:
         if tarefa.prioridade not in self.PRIORIDADES:
             raise ValueError(f"Prioridade inválida")
         
-        # Criar tarefa
-        tarefa_id = self.tarefa_repo.criar(tarefa)
-        
-        # Registrar interação
-        self.interacao_repo.criar(Interacao(
-            cliente_id=tarefa.cliente_id,
-            tipo="tarefa_criada",
-            descricao=f"Tarefa '{tarefa.descricao}' foi criada"
-        ))
+        # Criar tarefa e registrar interação na mesma transação
+        with DatabaseManager.transaction() as conn:
+            tarefa_id = self.tarefa_repo.criar(tarefa, conn=conn)
+            
+            self.interacao_repo.criar(Interacao(
+                cliente_id=tarefa.cliente_id,
+                tipo="tarefa_criada",
+                descricao=f"Tarefa '{tarefa.descricao}' foi criada"
+            ), conn=conn)
         
         return tarefa_id
     
@@ -63,10 +65,27 @@ class TarefaService:
         """Busca uma tarefa por ID"""
         return self.tarefa_repo.buscar_por_id(id)
     
+    def buscar_tarefas_por_ids(self, ids: Iterable[int]) -> Dict[int, Tarefa]:
+        """Busca várias tarefas por ID (id -> tarefa)"""
+        return self.tarefa_repo.buscar_por_ids(ids)
+    
     def listar_tarefas(self) -> List[Tarefa]:
         """Lista todas as tarefas"""
         return self.tarefa_repo.listar_todos()
     
+    def listar_tarefas_pagina(self, cursor: Optional[str] = None, limite: int = 100,
+                              ordem: str = 'id', **filtros) -> Pagina[Tarefa]:
+        """Lista uma página de tarefas a partir do cursor"""
+        return self.tarefa_repo.listar_pagina(cursor, limite, ordem, **filtros)
+    
+    def iterar_tarefas(self) -> Iterator[Tarefa]:
+        """Percorre todas as tarefas sem carregar a tabela inteira"""
+        return self.tarefa_repo.iterar_todos()
+    
+    def contar_tarefas(self, **filtros) -> int:
+        """Conta as tarefas que atendem aos filtros"""
+        return self.tarefa_repo.contar(**filtros)
+    
     def buscar_por_cliente(self, cliente_id: int) -> List[Tarefa]:
         """Busca tarefas de um cliente"""
         return self.tarefa_repo.buscar_por_cliente(cliente_id)
@@ -83,21 +102,50 @@ class TarefaService:
         """Busca tarefas por status"""
         return self.tarefa_repo.buscar_por_status(status)
     
+    def proximas_tarefas(self, dias: int = 5, limite: int = 5) -> List[TarefaResumo]:
+        """Próximas tarefas pendentes dos próximos dias"""
+        return self.tarefa_repo.proximas(dias, limite)
+    
+    def buscar_filtrado(self, texto: str = None, status: Union[str, List[str]] = None,
+                        prioridade: str = None,
+                        intervalo_data: Tuple[Optional[datetime], Optional[datetime]] = None,
+                        limite: int = 100, cursor: Optional[str] = None,
+                        ordem: str = 'data_hora', resumo: bool = False) -> Pagina:
+        """Busca uma página de tarefas com filtros combinados"""
+        return self.tarefa_repo.buscar_filtrado(
+            texto, status, prioridade, intervalo_data, limite, cursor, ordem, resumo
+        )
+    
+    def contar_filtrado(self, texto: str = None, status: Union[str, List[str]] = None,
+                        prioridade: str = None,
+                        intervalo_data: Tuple[Optional[datetime], Optional[datetime]] = None) -> int:
+        """Conta as tarefas que atendem aos filtros combinados"""
+        return self.tarefa_repo.contar_filtrado(texto, status, prioridade, intervalo_data)
+    
+    def alteracoes_filtradas(self, marca: Optional[datetime], texto: str = None,
+                             status: Union[str, List[str]] = None, prioridade: str = None,
+                             intervalo_data: Tuple[Optional[datetime], Optional[datetime]] = None
+                             ) -> Optional[Alteracoes[TarefaResumo]]:
+        """Tarefas incluídas, alteradas ou excluídas desde a marca d'água,
+        com os mesmos filtros de buscar_filtrado"""
+        return self.tarefa_repo.alteradas_filtradas(marca, texto, status, prioridade, intervalo_data)
+    
     def marcar_concluida(self, id: int) -> bool:
         """Marca uma tarefa como concluída"""
-        tarefa = self.tarefa_repo.buscar_por_id(id)
-        if not tarefa:
-            return False
-        
-        sucesso = self.tarefa_repo.marcar_concluida(id)
-        
-        if sucesso:
-            # Registrar interação
-            self.interacao_repo.criar(Interacao(
-                cliente_id=tarefa.cliente_id,
-                tipo="tarefa_concluida",
-                descricao=f"Tarefa '{tarefa.descricao}' foi concluída"
-            ))
+        with DatabaseManager.transaction() as conn:
+            tarefa = self.tarefa_repo.buscar_por_id(id, conn=conn)
+            if not tarefa:
+                return False
+            
+            sucesso = self.tarefa_repo.marcar_concluida(id, conn=conn)
+            
+            if sucesso:
+                # Registrar interação
+                self.interacao_repo.criar(Interacao(
+                    cliente_id=tarefa.cliente_id,
+                    tipo="tarefa_concluida",
+                    descricao=f"Tarefa '{tarefa.descricao}' foi concluída"
+                ), conn=conn)
         
         return sucesso
     
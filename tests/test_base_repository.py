@@ -0,0 +1,144 @@
+"""
+Testes das partes do BaseRepository que não dependem do banco
+"""
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from models.tarefa import Tarefa
+from repositories.base_repository import mapa_identidade
+from repositories.tarefa_repository import TarefaRepository
+
+
+@pytest.fixture
+def repo():
+    return TarefaRepository()
+
+
+def test_montar_condicoes_igualdade_e_null(repo):
+    condicoes, params = repo._montar_condicoes({'status': 'Pendente', 'cliente_id': None})
+    assert condicoes == ["tarefas.status = %s", "tarefas.cliente_id IS NULL"]
+    assert params == ['Pendente']
+
+
+def test_montar_condicoes_operadores_de_comparacao(repo):
+    condicoes, params = repo._montar_condicoes({
+        'id__ne': 1, 'id__gt': 2, 'id__gte': 3, 'id__lt': 4, 'id__lte': 5
+    })
+    assert condicoes == ["tarefas.id <> %s", "tarefas.id > %s", "tarefas.id >= %s",
+                         "tarefas.id < %s", "tarefas.id <= %s"]
+    assert params == [1, 2, 3, 4, 5]
+
+
+def test_montar_condicoes_in_e_not_in(repo):
+    condicoes, params = repo._montar_condicoes({
+        'status': ['Pendente', 'Concluída'], 'prioridade__not_in': ('Baixa',)
+    })
+    assert condicoes == ["tarefas.status IN (%s, %s)", "tarefas.prioridade NOT IN (%s)"]
+    assert params == ['Pendente', 'Concluída', 'Baixa']
+
+
+def test_montar_condicoes_listas_vazias(repo):
+    condicoes, params = repo._montar_condicoes({'status__in': [], 'prioridade__not_in': []})
+    assert condicoes == ["1 = 0", "1 = 1"]
+    assert params == []
+
+
+def test_montar_condicoes_contem_escapa_curingas(repo):
+    condicoes, params = repo._montar_condicoes({'descricao__contem': '50%_a\\b'})
+    assert condicoes == ["tarefas.descricao LIKE %s"]
+    assert params == ['%50\\%\\_a\\\\b%']
+
+
+def test_montar_condicoes_operador_invalido(repo):
+    with pytest.raises(ValueError):
+        repo._montar_condicoes({'id__entre': (1, 2)})
+
+
+def test_montar_condicoes_coluna_invalida(repo):
+    with pytest.raises(ValueError):
+        repo._montar_condicoes({'id; DROP TABLE tarefas': 1})
+
+
+def test_montar_where_sem_filtros(repo):
+    assert repo._montar_where({}) == ("", ())
+
+
+@pytest.mark.parametrize('valor', [
+    None, 7, 'Alta', datetime(2026, 10, 18, 9, 30, 15), date(2026, 10, 18), Decimal('1234.50')
+])
+def test_cursor_ida_e_volta(valor):
+    cursor = TarefaRepository._codificar_cursor(valor, 42)
+    assert TarefaRepository._decodificar_cursor(cursor) == (valor, 42)
+    assert type(TarefaRepository._decodificar_cursor(cursor)[0]) is type(valor)
+
+
+@pytest.mark.parametrize('cursor', ['nao-e-base64!', 'bm90IGpzb24='])
+def test_cursor_invalido(cursor):
+    with pytest.raises(ValueError):
+        TarefaRepository._decodificar_cursor(cursor)
+
+
+def test_keyset_por_id(repo):
+    assert repo._condicao_keyset('id', 'DESC', 10, 10) == ("tarefas.id < %s", [10])
+    assert repo._condicao_keyset('id', 'ASC', 10, 10) == ("tarefas.id > %s", [10])
+
+
+def test_keyset_asc_com_valor_inclui_empates_pelo_id(repo):
+    condicao, params = repo._condicao_keyset('data_hora', 'ASC', 'v', 5)
+    assert condicao == ("(tarefas.data_hora > %s OR "
+                        "(tarefas.data_hora = %s AND tarefas.id > %s))")
+    assert params == ['v', 'v', 5]
+
+
+def test_keyset_asc_apos_null_segue_nos_nulos_e_depois_nos_valores(repo):
+    # Em ASC o MySQL ordena NULL primeiro
+    condicao, params = repo._condicao_keyset('data_hora', 'ASC', None, 5)
+    assert condicao == ("((tarefas.data_hora IS NULL AND tarefas.id > %s) "
+                        "OR tarefas.data_hora IS NOT NULL)")
+    assert params == [5]
+
+
+def test_keyset_desc_com_valor_inclui_os_nulos_no_fim(repo):
+    # Em DESC o MySQL ordena NULL por último
+    condicao, params = repo._condicao_keyset('data_hora', 'DESC', 'v', 5)
+    assert condicao == ("(tarefas.data_hora < %s OR (tarefas.data_hora = %s AND tarefas.id < %s) "
+                        "OR tarefas.data_hora IS NULL)")
+    assert params == ['v', 'v', 5]
+
+
+def test_keyset_desc_apos_null_fica_nos_nulos(repo):
+    condicao, params = repo._condicao_keyset('data_hora', 'DESC', None, 5)
+    assert condicao == "(tarefas.data_hora IS NULL AND tarefas.id < %s)"
+    assert params == [5]
+
+
+def test_montar_condicoes_ou_combina_alternativas(repo):
+    condicoes, params = repo._montar_condicoes({
+        'status': 'Pendente',
+        'ou': {'descricao__contem': 'x', 'prioridade': 'Alta'}
+    })
+    assert condicoes == ["tarefas.status = %s",
+                         "(tarefas.descricao LIKE %s OR tarefas.prioridade = %s)"]
+    assert params == ['Pendente', '%x%', 'Alta']
+
+
+def test_montar_condicoes_ou_vazio_nao_filtra(repo):
+    assert repo._montar_condicoes({'ou': {}}) == ([], [])
+
+
+def test_mapa_identidade_nao_e_usado_com_conexao_explicita(repo, monkeypatch):
+    consultas = []
+    
+    def consultar(query, params, conn=None, classe=None):
+        consultas.append(conn)
+        return [Tarefa(id=1)]
+    
+    monkeypatch.setattr(repo, '_consultar', consultar)
+    with mapa_identidade():
+        primeira = repo.buscar_por_id(1)
+        assert repo.buscar_por_id(1) is primeira
+        assert repo.buscar_por_id(1, conn='transacao') is not primeira
+        assert repo.buscar_por_ids([1], conn='transacao')[1] is not primeira
+    # A leitura com conexão não substitui a entidade guardada no mapa
+    assert consultas == [None, 'transacao', 'transacao']
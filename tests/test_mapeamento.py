@@ -0,0 +1,52 @@
+"""
+Testes do mapeamento de tuplas do cursor para entidades
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+from repositories.mapeamento import criar_mapeador, texto_ou_vazio
+
+
+@dataclass
+class Exemplo:
+    id: Optional[int] = None
+    nome: str = ""
+    valor: float = 0.0
+    cliente_nome: str = "sem cliente"
+
+
+@dataclass
+class Unico:
+    id: Optional[int] = None
+
+
+def test_mapeia_colunas_pelo_nome_em_qualquer_ordem():
+    mapear = criar_mapeador(Exemplo, ['valor', 'cliente_nome', 'id', 'nome'])
+    assert mapear((9.5, 'ACME', 1, 'Teste')) == Exemplo(1, 'Teste', 9.5, 'ACME')
+
+
+def test_campos_sem_coluna_recebem_o_padrao():
+    mapear = criar_mapeador(Exemplo, ['id', 'nome'])
+    assert mapear((2, 'Outro')) == Exemplo(2, 'Outro', 0.0, 'sem cliente')
+
+
+def test_colunas_sem_campo_sao_ignoradas():
+    mapear = criar_mapeador(Exemplo, ['id', 'extra', 'nome', 'valor', 'cliente_nome'])
+    assert mapear((3, 'ignorado', 'X', 1.0, 'Y')) == Exemplo(3, 'X', 1.0, 'Y')
+
+
+def test_conversores_aplicados_por_campo():
+    mapear = criar_mapeador(Exemplo, ['id', 'nome', 'valor', 'cliente_nome'],
+                            {'valor': float, 'cliente_nome': texto_ou_vazio})
+    exemplo = mapear((4, 'Conv', '12.5', None))
+    assert exemplo == Exemplo(4, 'Conv', 12.5, '')
+
+
+def test_conversores_com_campos_sem_coluna():
+    mapear = criar_mapeador(Exemplo, ['id', 'valor'], {'valor': float})
+    assert mapear((5, '3')) == Exemplo(5, '', 3.0, 'sem cliente')
+
+
+def test_dataclass_de_um_campo():
+    mapear = criar_mapeador(Unico, ['id'])
+    assert mapear((6,)) == Unico(6)
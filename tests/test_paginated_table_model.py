@@ -0,0 +1,132 @@
+"""
+Testes da aplicação de alterações no PaginatedTableModel
+"""
+import random
+from dataclasses import dataclass
+from typing import Optional
+
+import pytest
+from PySide6.QtCore import QCoreApplication, QPersistentModelIndex
+
+from repositories.base_repository import Alteracoes, Pagina
+from ui.widgets.paginated_table_model import PaginatedTableModel
+
+
+@dataclass
+class Item:
+    id: int
+    valor: Optional[int] = None
+
+
+class Model(PaginatedTableModel):
+    headers = ['id', 'valor']
+
+    def data(self, index, role=None):
+        return None
+
+
+@pytest.fixture(scope='module', autouse=True)
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+def ids(model):
+    return [item.id for item in model.itens]
+
+
+def registrar(model, sinal):
+    eventos = []
+    sinal.connect(lambda *args: eventos.append(args))
+    return eventos
+
+
+def test_inclusao_na_posicao_da_ordenacao():
+    model = Model(itens=[Item(1, 10), Item(2, 20), Item(3, 30)], ordenacao=('valor', 'ASC'))
+    inseridas = registrar(model, model.rowsInserted)
+
+    model.aplicar_alteracoes(Alteracoes(itens=[Item(4, 25), Item(5, 5)]))
+
+    assert ids(model) == [5, 1, 2, 4, 3]
+    assert [(primeira, ultima) for _, primeira, ultima in inseridas] == [(2, 2), (0, 0)]
+
+
+def test_null_vem_antes_em_asc_e_depois_em_desc():
+    asc = Model(itens=[Item(1, 10), Item(2, 20)], ordenacao=('valor', 'ASC'))
+    asc.aplicar_alteracoes(Alteracoes(itens=[Item(3, None)]))
+    assert ids(asc) == [3, 1, 2]
+
+    desc = Model(itens=[Item(2, 20), Item(1, 10)], ordenacao=('valor', 'DESC'))
+    desc.aplicar_alteracoes(Alteracoes(itens=[Item(3, None)]))
+    assert ids(desc) == [2, 1, 3]
+
+
+def test_alteracao_que_muda_a_ordem_move_a_linha():
+    model = Model(itens=[Item(1, 10), Item(2, 20), Item(3, 30), Item(4, 40)],
+                  ordenacao=('valor', 'ASC'))
+    selecionada = QPersistentModelIndex(model.index(0, 0))
+    movidas = registrar(model, model.rowsMoved)
+    alteradas = registrar(model, model.dataChanged)
+
+    model.aplicar_alteracoes(Alteracoes(itens=[Item(1, 35)]))
+
+    assert ids(model) == [2, 3, 1, 4]
+    assert [(inicio, destino) for _, inicio, _, _, destino in movidas] == [(0, 3)]
+    assert alteradas[-1][0].row() == 2
+    # A seleção acompanha a linha movida
+    assert selecionada.row() == 2
+
+
+def test_alteracao_sem_mudar_a_ordem_atualiza_no_lugar():
+    model = Model(itens=[Item(1, 10), Item(2, 20), Item(3, 30)], ordenacao=('valor', 'ASC'))
+    movidas = registrar(model, model.rowsMoved)
+    alteradas = registrar(model, model.dataChanged)
+
+    model.aplicar_alteracoes(Alteracoes(itens=[Item(2, 21)]))
+
+    assert ids(model) == [1, 2, 3]
+    assert model.itens[1].valor == 21
+    assert movidas == []
+    assert [evento[0].row() for evento in alteradas] == [1]
+
+
+def test_remocao_de_varias_linhas():
+    model = Model(itens=[Item(i) for i in range(6, 0, -1)])
+    removidas = registrar(model, model.rowsRemoved)
+
+    model.aplicar_alteracoes(Alteracoes(removidos={5, 2, 4, 99}))
+
+    assert ids(model) == [6, 3, 1]
+    # De baixo para cima, com as linhas da lista original
+    assert [(primeira, ultima) for _, primeira, ultima in removidas] == [(4, 4), (2, 2), (1, 1)]
+
+
+def test_linhas_alem_da_ultima_pagina_ficam_para_o_fetch_more():
+    pagina = Pagina(itens=[Item(1, 10), Item(2, 20), Item(3, 30)], proximo_cursor='mais')
+    model = Model(lambda cursor, limite: pagina, ordenacao=('valor', 'ASC'))
+    model.fetchMore()
+
+    model.aplicar_alteracoes(Alteracoes(itens=[Item(4, 15), Item(5, 50), Item(2, 40)]))
+
+    # 4 entra; 5 fica depois da última linha buscada; 2 passou para depois dela
+    assert ids(model) == [1, 4, 3]
+
+
+def test_resultado_igual_a_ordenar_de_novo():
+    aleatorio = random.Random(25)
+    itens = {i: Item(i, aleatorio.choice([None, *range(10)])) for i in range(1, 41)}
+    chave = lambda item: (item.valor is not None, item.valor or 0, item.id)
+    model = Model(itens=sorted(itens.values(), key=chave), ordenacao=('valor', 'ASC'))
+
+    for rodada in range(5):
+        removidos = set(aleatorio.sample(sorted(itens), 3))
+        for id in removidos:
+            del itens[id]
+        alterados = [Item(id, aleatorio.choice([None, *range(10)]))
+                     for id in aleatorio.sample(sorted(itens), 5)]
+        novos = [Item(100 + rodada * 10 + n, aleatorio.randrange(10)) for n in range(3)]
+        for item in alterados + novos:
+            itens[item.id] = item
+
+        model.aplicar_alteracoes(Alteracoes(itens=alterados + novos, removidos=removidos))
+
+        assert model.itens == sorted(itens.values(), key=chave)
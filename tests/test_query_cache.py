@@ -0,0 +1,79 @@
+"""
+Testes do cache de consultas (core/query_cache.py)
+"""
+from core.query_cache import CacheConsultas, eh_leitura, tabelas_da_query
+
+
+def test_tabelas_da_query_leitura_com_join():
+    query = """
+        SELECT t.*, c.nome FROM tarefas t
+        LEFT JOIN `clientes` c ON c.id = t.cliente_id
+    """
+    assert tabelas_da_query(query) == {'tarefas', 'clientes'}
+
+
+def test_tabelas_da_query_escritas():
+    assert tabelas_da_query("INSERT INTO Interacoes (tipo) VALUES (%s)") == {'interacoes'}
+    assert tabelas_da_query("UPDATE oportunidades SET etapa = %s") == {'oportunidades'}
+    assert tabelas_da_query("DELETE FROM clientes WHERE id = %s") == {'clientes'}
+    assert tabelas_da_query("ALTER TABLE tarefas ADD INDEX idx (status)") == {'tarefas'}
+
+
+def test_eh_leitura():
+    assert eh_leitura("  select 1")
+    assert eh_leitura("WITH x AS (SELECT 1) SELECT * FROM x")
+    assert not eh_leitura("UPDATE clientes SET nome = %s")
+
+
+def test_chave_normaliza_espacos_e_recusa_parametros_nao_hasheaveis():
+    assert CacheConsultas.chave("SELECT *\n   FROM clientes") == CacheConsultas.chave("SELECT * FROM clientes")
+    assert CacheConsultas.chave("SELECT * FROM clientes WHERE id IN %s", ([1, 2],)) is None
+
+
+def test_invalidar_tabela_remove_so_as_entradas_que_a_leem():
+    cache = CacheConsultas()
+    cache.guardar(('a',), {'clientes'}, 1)
+    cache.guardar(('b',), {'tarefas', 'clientes'}, 2)
+    cache.guardar(('c',), {'tarefas'}, 3)
+
+    cache.invalidar_tabelas(['clientes'])
+
+    assert cache.obter(('a',)) == (False, None)
+    assert cache.obter(('b',)) == (False, None)
+    assert cache.obter(('c',)) == (True, 3)
+    assert cache.estatisticas()['invalidacoes'] == 2
+
+
+def test_guardar_descarta_leitura_anterior_a_invalidacao():
+    cache = CacheConsultas()
+    geracao = cache.geracao()
+    cache.invalidar_tabelas(['tarefas'])
+
+    cache.guardar(('a',), {'clientes'}, 'obsoleto', geracao=geracao)
+    assert cache.obter(('a',)) == (False, None)
+
+    cache.guardar(('a',), {'clientes'}, 'atual', geracao=cache.geracao())
+    assert cache.obter(('a',)) == (True, 'atual')
+
+
+def test_limpar_tambem_avanca_a_geracao():
+    cache = CacheConsultas()
+    geracao = cache.geracao()
+    cache.limpar()
+    cache.guardar(('a',), {'clientes'}, 1, geracao=geracao)
+    assert cache.obter(('a',)) == (False, None)
+
+
+def test_expiracao_e_limite_de_entradas():
+    cache = CacheConsultas(tamanho=2)
+    cache.guardar(('expira',), {'clientes'}, 0, ttl=0)
+    assert cache.obter(('expira',)) == (False, None)
+
+    cache.guardar(('a',), {'clientes'}, 1)
+    cache.guardar(('b',), {'clientes'}, 2)
+    cache.obter(('a',))  # 'b' passa a ser a menos usada
+    cache.guardar(('c',), {'clientes'}, 3)
+
+    assert cache.obter(('b',)) == (False, None)
+    assert cache.obter(('a',)) == (True, 1)
+    assert cache.estatisticas()['evictions'] == 1
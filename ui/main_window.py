@@ -6,12 +6,18 @@ from PySide6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                                QListWidget, QListWidgetItem, QFrame)
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QFont
+from typing import Callable, List, Optional, Union
 from core.settings import APP_NAME
+from ui.widgets.base_view import BaseView
 
 
 class MainWindow(QMainWindow):
     """Janela principal do sistema"""
     
+    # Emitido quando uma view altera dados (usado para sincronizar o monitor
+    # de alterações sem recarregar de novo o que já foi recarregado)
+    dados_alterados = Signal()
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle(APP_NAME)
@@ -35,6 +41,9 @@ class MainWindow(QMainWindow):
         self.stacked_widget = QStackedWidget()
         main_layout.addWidget(self.stacked_widget, 1)
         
+        # Fábricas das views ainda não construídas, por índice (None = construída)
+        self._fabricas: List[Optional[Callable[[], QWidget]]] = []
+        
         # Barra superior
         self._criar_barra_superior()
     
@@ -123,13 +132,60 @@ class MainWindow(QMainWindow):
         self.btn_perfil = QPushButton("👤 Perfil")
         toolbar.addWidget(self.btn_perfil)
     
-    def adicionar_view(self, widget: QWidget, nome: str):
-        """Adiciona uma view ao stacked widget"""
-        self.stacked_widget.addWidget(widget)
+    def adicionar_view(self, view: Union[QWidget, Callable[[], QWidget]], nome: str):
+        """Adiciona uma view ao stacked widget.
+        
+        Aceita a view pronta ou uma função que a cria; nesse caso a view só é
+        construída (e seus dados carregados) no primeiro mostrar_view.
+        """
+        if isinstance(view, QWidget):
+            self.stacked_widget.addWidget(view)
+            self._conectar_view(view)
+            self._fabricas.append(None)
+        else:
+            self.stacked_widget.addWidget(QWidget())
+            self._fabricas.append(view)
+    
+    def _obter_view(self, index: int) -> QWidget:
+        """Retorna a view do índice, construindo-a se ainda for só uma fábrica"""
+        fabrica = self._fabricas[index]
+        if fabrica is not None:
+            self._fabricas[index] = None
+            provisorio = self.stacked_widget.widget(index)
+            view = fabrica()
+            self.stacked_widget.insertWidget(index, view)
+            self.stacked_widget.removeWidget(provisorio)
+            provisorio.deleteLater()
+            self._conectar_view(view)
+        return self.stacked_widget.widget(index)
+    
+    def _conectar_view(self, view: QWidget):
+        if isinstance(view, BaseView):
+            view.dados_alterados.connect(lambda: self._marcar_desatualizadas(view))
+    
+    def _marcar_desatualizadas(self, origem: QWidget):
+        """Após uma alteração em uma view, as outras recarregam ao serem exibidas"""
+        for i in range(self.stacked_widget.count()):
+            view = self.stacked_widget.widget(i)
+            if view is not origem and isinstance(view, BaseView):
+                view.marcar_desatualizada()
+        self.dados_alterados.emit()
+    
+    def aplicar_alteracoes(self, tabelas: set):
+        """Repassa às views já construídas as tabelas alteradas por outras
+        estações; cada view decide o que recarregar"""
+        for i in range(self.stacked_widget.count()):
+            view = self.stacked_widget.widget(i)
+            if isinstance(view, BaseView):
+                view.tabelas_alteradas(tabelas)
     
     def mostrar_view(self, index: int):
         """Mostra a view no índice especificado"""
-        self.stacked_widget.setCurrentIndex(index)
+        if index < len(self._fabricas):
+            view = self._obter_view(index)
+            self.stacked_widget.setCurrentIndex(index)
+            if isinstance(view, BaseView):
+                view.atualizar_se_necessario()
         # Atualizar botões do menu
         buttons = [self.btn_dashboard, self.btn_clientes, self.btn_oportunidades,
                   self.btn_tarefas, self.btn_relatorios, self.btn_configuracoes]
@@ -1,37 +1,31 @@
 """
 View de listagem de clientes
 """
-from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
+from PySide6.QtWidgets import (QVBoxLayout, QHBoxLayout, QPushButton,
                                QLineEdit, QTableView, QLabel, QHeaderView, QFileDialog, QDialog)
-from PySide6.QtCore import Qt, QAbstractTableModel
+from PySide6.QtCore import Qt, QTimer
 from services.cliente_service import ClienteService
 from models.cliente import Cliente
 from utils.formatters import Formatters
 from utils.helpers import Helpers
+from utils.workers import Worker
 from ui.views.cliente_form import ClienteForm
 from services.export_service import ExportService
+from ui.widgets.paginated_table_model import PaginatedTableModel
+from ui.widgets.base_view import BaseView
 
 
-class ClientesTableModel(QAbstractTableModel):
+class ClientesTableModel(PaginatedTableModel):
     """Model para tabela de clientes"""
     
-    def __init__(self, clientes: list):
-        super().__init__()
-        self.clientes = clientes
-        self.headers = ['ID', 'Nome', 'Email', 'Telefone', 'Empresa', 'Cidade', 'Data Cadastro']
-    
-    def rowCount(self, parent=None):
-        return len(self.clientes)
-    
-    def columnCount(self, parent=None):
-        return len(self.headers)
+    headers = ['ID', 'Nome', 'Email', 'Telefone', 'Empresa', 'Cidade', 'Data Cadastro']
     
     def data(self, index, role=Qt.DisplayRole):
         if not index.isValid():
             return None
         
         if role == Qt.DisplayRole:
-            cliente = self.clientes[index.row()]
+            cliente = self.itens[index.row()]
             col = index.column()
             
             if col == 0:
@@ -50,21 +44,33 @@ class ClientesTableModel(QAbstractTableModel):
                 return Formatters.formatar_data(cliente.criado_em) if cliente.criado_em else ""
         
         return None
-    
-    def headerData(self, section, orientation, role=Qt.DisplayRole):
-        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
-            return self.headers[section]
-        return None
 
 
-class ClientesView(QWidget):
+class ClientesView(BaseView):
     """Tela de listagem de clientes"""
     
+    TABELAS = frozenset({'clientes'})
+    
+    # Espera após a última tecla antes de disparar a busca (ms)
+    ATRASO_BUSCA_MS = 300
+    
     def __init__(self, cliente_service: ClienteService):
         super().__init__()
         self.cliente_service = cliente_service
+        
+        # Busca assíncrona: só o resultado da requisição mais recente é aplicado
+        self._busca_seq = 0
+        self._worker_busca = None
+        self._timer_busca = QTimer(self)
+        self._timer_busca.setSingleShot(True)
+        self._timer_busca.setInterval(self.ATRASO_BUSCA_MS)
+        self._timer_busca.timeout.connect(self._executar_busca)
+        
         self.setup_ui()
-        self.carregar_dados()
+    
+    def atualizar(self):
+        """Atualiza a lista mantendo a busca atual"""
+        self.atualizar_lista()
     
     def setup_ui(self):
         """Configura a interface"""
@@ -154,32 +160,82 @@ class ClientesView(QWidget):
         layout.addLayout(bottom_layout)
     
     def carregar_dados(self, termo_busca: str = ""):
-        """Carrega os clientes na tabela"""
+        """Carrega os clientes na tabela; com termo, a busca roda em segundo plano"""
+        # Qualquer busca ainda em andamento fica obsoleta
+        self._invalidar_busca()
+        
         if termo_busca:
-            clientes = self.cliente_service.buscar_clientes(termo_busca)
-        else:
-            clientes = self.cliente_service.listar_clientes()
+            self._buscar(termo_busca)
+            return
         
-        model = ClientesTableModel(clientes)
+        # Linhas carregadas em blocos conforme a rolagem; total via COUNT
+        model = ClientesTableModel(self.cliente_service.listar_clientes_resumo,
+                                   carregar_alteracoes=self.cliente_service.alteracoes_clientes)
+        model.fetchMore()
         self.tabela.setModel(model)
-        self.label_total.setText(f"Total: {len(clientes)}")
+        self.label_total.setText(f"Total: {self.cliente_service.contar_clientes()}")
+    
+    def atualizar_lista(self):
+        """Aplica na tabela só as alterações desde a carga, preservando seleção
+        e rolagem; durante uma busca (ou se falhar), refaz a consulta"""
+        model = self.tabela.model()
+        if isinstance(model, PaginatedTableModel) and model.sincronizar():
+            self.label_total.setText(f"Total: {self.cliente_service.contar_clientes()}")
+        else:
+            self.carregar_dados(self.busca_input.text().strip())
     
     def on_busca_changed(self, texto: str):
-        """Callback quando o texto de busca muda"""
-        self.carregar_dados(texto)
+        """Callback quando o texto de busca muda (com debounce)"""
+        self._timer_busca.start()
+    
+    def _executar_busca(self):
+        """Carrega a lista com o texto atual da busca"""
+        self.carregar_dados(self.busca_input.text().strip())
+    
+    def _buscar(self, termo: str):
+        """Dispara a busca em segundo plano (chamado por carregar_dados)"""
+        self.label_total.setText("Buscando...")
+        
+        worker = Worker(self.cliente_service.buscar_clientes, termo, resumo=True,
+                        sequencia=self._busca_seq)
+        worker.signals.concluido.connect(self._on_busca_concluida)
+        worker.signals.erro.connect(self._on_busca_erro)
+        self._worker_busca = worker
+        worker.iniciar()
+    
+    def _invalidar_busca(self):
+        """Descarta a busca em andamento, se houver"""
+        self._busca_seq += 1
+        if self._worker_busca:
+            self._worker_busca.cancelar()
+            self._worker_busca = None
+    
+    def _on_busca_concluida(self, sequencia: int, clientes: list):
+        """Aplica o resultado da busca se ele ainda for o mais recente"""
+        if sequencia != self._busca_seq:
+            return
+        self._worker_busca = None
+        
+        self.tabela.setModel(ClientesTableModel(itens=clientes))
+        self.label_total.setText(f"Total: {len(clientes)}")
+    
+    def _on_busca_erro(self, sequencia: int, mensagem: str):
+        """Callback de erro da busca em segundo plano"""
+        if sequencia != self._busca_seq:
+            return
+        self._worker_busca = None
+        Helpers.mostrar_mensagem("Erro", f"Erro ao buscar clientes: {mensagem}", 'error', self)
     
     def on_novo_cliente_clicked(self):
         """Callback para novo cliente"""
         form = ClienteForm(self.cliente_service, parent=self)
         if form.exec() == QDialog.Accepted:
-            self.carregar_dados()  # Recarregar lista
+            self.dados_alterados.emit()
+            self.atualizar_lista()
     
     def on_exportar_clicked(self):
         """Callback para exportar"""
-        # Obter todos os clientes
-        clientes = self.cliente_service.listar_clientes()
-        
-        if not clientes:
+        if not self.cliente_service.contar_clientes():
             Helpers.mostrar_mensagem("Aviso", "Não há clientes para exportar", 'warning', self)
             return
         
@@ -192,6 +248,9 @@ class ClientesView(QWidget):
         )
         
         if arquivo:
+            # Lê os clientes em streaming (cursor sem buffer, em lotes) durante a
+            # escrita do arquivo; a conexão do pool fica reservada até o fim da exportação
+            clientes = self.cliente_service.iterar_clientes()
             sucesso = ExportService.exportar_clientes_csv(clientes, arquivo)
             if sucesso:
                 Helpers.mostrar_mensagem("Sucesso", f"Clientes exportados para:\n{arquivo}", 'info', self)
@@ -232,7 +291,8 @@ class ClientesView(QWidget):
         
         form = ClienteForm(self.cliente_service, cliente, parent=self)
         if form.exec() == QDialog.Accepted:
-            self.carregar_dados()  # Recarregar lista
+            self.dados_alterados.emit()
+            self.atualizar_lista()
     
     def on_excluir_clicked(self):
         """Callback para excluir"""
@@ -251,7 +311,8 @@ class ClientesView(QWidget):
                 sucesso = self.cliente_service.excluir_cliente(cliente.id)
                 if sucesso:
                     Helpers.mostrar_mensagem("Sucesso", "Cliente excluído com sucesso", 'info', self)
-                    self.carregar_dados()  # Recarregar lista
+                    self.dados_alterados.emit()
+                    self.atualizar_lista()
                 else:
                     Helpers.mostrar_mensagem("Erro", "Erro ao excluir cliente", 'error', self)
             except Exception as e:
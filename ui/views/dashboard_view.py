@@ -3,17 +3,41 @@ View do Dashboard - Versão Melhorada
 """
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                                QFrame, QScrollArea, QGridLayout, QProgressBar)
-from PySide6.QtCore import Qt, QSize
-from datetime import datetime, timedelta, date
-from services.relatorio_service import RelatorioService
+from services.relatorio_service import RelatorioService, DashboardSnapshot
 from services.tarefa_service import TarefaService
 from services.oportunidade_service import OportunidadeService
 from services.cliente_service import ClienteService
 from utils.formatters import Formatters
+from utils.workers import Worker
+from core.settings import STYLES_DIR
+from ui.widgets.base_view import BaseView
+from ui.widgets.dashboard_widgets import (CardMetrica, LinhaEtapa, ItemTarefa,
+                                          ItemOportunidade, ListaItens)
 
 
-class DashboardView(QWidget):
-    """Tela de dashboard com métricas melhoradas"""
+# Etapas na ordem do funil
+ORDEM_ETAPAS = ["Lead", "Qualificação", "Proposta", "Negociação", "Fechado", "Perdido"]
+
+# Itens exibidos nas listas de próximas tarefas e oportunidades
+LIMITE_LISTAS = 5
+
+# Tabelas lidas por cada seção: uma alteração detectada pelo monitor
+# recarrega só as seções que dependem da tabela alterada
+TABELAS_SECOES = {
+    'metricas': {'clientes', 'oportunidades', 'tarefas'},
+    'tarefas': {'tarefas'},
+    'oportunidades_proximas': {'oportunidades', 'clientes'},
+}
+
+
+class DashboardView(BaseView):
+    """Tela de dashboard com métricas melhoradas.
+    
+    Os widgets são criados uma vez em setup_ui; cada atualização só altera
+    textos, valores e propriedades. Estilos em resources/styles/dashboard.qss.
+    """
+    
+    TABELAS = frozenset({'clientes', 'oportunidades', 'tarefas'})
     
     def __init__(self, relatorio_service: RelatorioService, 
                  tarefa_service: TarefaService = None,
@@ -24,18 +48,43 @@ class DashboardView(QWidget):
         self.tarefa_service = tarefa_service
         self.oportunidade_service = oportunidade_service
         self.cliente_service = cliente_service
+        
+        # Carga em segundo plano: de cada seção, só o resultado da carga mais
+        # recente é exibido
+        self._carga_seq = 0
+        self._seq_secoes = {}
+        self._workers = {}
+        
         self.setup_ui()
+    
+    def atualizar(self):
+        """Recarrega métricas e listas"""
         self.carregar_dados()
     
+    def tabelas_alteradas(self, tabelas: set):
+        """Recarrega apenas as seções que leem as tabelas alteradas"""
+        secoes = [secao for secao, lidas in TABELAS_SECOES.items() if lidas & tabelas]
+        if not secoes:
+            return
+        if self.isVisible() and not self.desatualizada:
+            self.carregar_dados(secoes)
+        else:
+            super().tabelas_alteradas(tabelas)
+    
     def setup_ui(self):
         """Configura a interface"""
+        # Regras só do dashboard: aplicadas a esta view e seus filhos
+        estilos = STYLES_DIR / 'dashboard.qss'
+        if estilos.exists():
+            self.setStyleSheet(estilos.read_text(encoding='utf-8'))
+        
         layout = QVBoxLayout(self)
         layout.setContentsMargins(20, 20, 20, 20)
         layout.setSpacing(20)
         
         # Título
         titulo = QLabel("📊 Dashboard")
-        titulo.setStyleSheet("font-size: 28px; font-weight: bold; color: #1f2937; margin-bottom: 10px;")
+        titulo.setObjectName("dashboardTitulo")
         layout.addWidget(titulo)
         
         # Cards de métricas em grid
@@ -43,10 +92,25 @@ class DashboardView(QWidget):
         self.metricas_grid.setSpacing(15)
         layout.addLayout(self.metricas_grid)
         
+        self.card_clientes = CardMetrica("Total de Clientes", "👥", "azul")
+        self.card_oportunidades = CardMetrica("Oportunidades Abertas", "💼", "verde")
+        self.card_valor = CardMetrica("Valor em Negociação", "💰", "ambar")
+        self.card_tarefas = CardMetrica("Tarefas Hoje", "✓", "vermelho")
+        self.card_taxa = CardMetrica("Taxa de Conversão", "📊", "roxo")
+        self.card_total_op = CardMetrica("Total Oportunidades", "📈", "ciano")
+        self.card_tarefas_stats = CardMetrica("Tarefas", "✓", "turquesa")
+        self.card_fechado = CardMetrica("Valor Fechado", "✅", "sucesso")
+        cards = [
+            self.card_clientes, self.card_oportunidades, self.card_valor, self.card_tarefas,
+            self.card_taxa, self.card_total_op, self.card_tarefas_stats, self.card_fechado
+        ]
+        for i, card in enumerate(cards):
+            self.metricas_grid.addWidget(card, i // 4, i % 4)
+        
         # Área de conteúdo com scroll
         scroll = QScrollArea()
+        scroll.setObjectName("dashboardScroll")
         scroll.setWidgetResizable(True)
-        scroll.setStyleSheet("border: none; background: transparent;")
         
         content_widget = QWidget()
         content_layout = QVBoxLayout(content_widget)
@@ -62,10 +126,28 @@ class DashboardView(QWidget):
         
         # Gráfico de oportunidades por etapa
         self.frame_oportunidades = self._criar_secao("💼 Oportunidades por Etapa")
+        secao = self.frame_oportunidades.layout()
+        self.label_etapas = self._criar_mensagem("Carregando...")
+        secao.addWidget(self.label_etapas)
+        self.linhas_etapa = {}
+        for etapa in ORDEM_ETAPAS:
+            linha = LinhaEtapa(etapa)
+            linha.hide()
+            secao.addWidget(linha)
+            self.linhas_etapa[etapa] = linha
         coluna_esquerda.addWidget(self.frame_oportunidades)
         
         # Taxa de conversão
         self.frame_conversao = self._criar_secao("📈 Taxa de Conversão")
+        secao = self.frame_conversao.layout()
+        self.barra_conversao = QProgressBar()
+        self.barra_conversao.setObjectName("barraConversao")
+        self.barra_conversao.setMaximum(100)
+        self.barra_conversao.setFormat("—")
+        secao.addWidget(self.barra_conversao)
+        self.label_conversao = QLabel("")
+        self.label_conversao.setObjectName("conversaoInfo")
+        secao.addWidget(self.label_conversao)
         coluna_esquerda.addWidget(self.frame_conversao)
         
         colunas_layout.addLayout(coluna_esquerda, 1)
@@ -76,10 +158,16 @@ class DashboardView(QWidget):
         
         # Próximas tarefas
         self.frame_tarefas = self._criar_secao("✓ Próximas Tarefas")
+        self.lista_tarefas = ListaItens(ItemTarefa, LIMITE_LISTAS)
+        self.lista_tarefas.mostrar_mensagem("Carregando...")
+        self.frame_tarefas.layout().addWidget(self.lista_tarefas)
         coluna_direita.addWidget(self.frame_tarefas)
         
         # Oportunidades próximas do fechamento
         self.frame_oportunidades_proximas = self._criar_secao("🎯 Oportunidades Próximas")
+        self.lista_oportunidades = ListaItens(ItemOportunidade, LIMITE_LISTAS)
+        self.lista_oportunidades.mostrar_mensagem("Carregando...")
+        self.frame_oportunidades_proximas.layout().addWidget(self.lista_oportunidades)
         coluna_direita.addWidget(self.frame_oportunidades_proximas)
         
         colunas_layout.addLayout(coluna_direita, 1)
@@ -93,457 +181,159 @@ class DashboardView(QWidget):
     def _criar_secao(self, titulo: str) -> QFrame:
         """Cria uma seção com título"""
         frame = QFrame()
-        frame.setStyleSheet("""
-            QFrame {
-                background: white;
-                border-radius: 12px;
-                padding: 20px;
-                border: 1px solid #e5e7eb;
-            }
-        """)
+        frame.setObjectName("secaoDashboard")
         
         layout = QVBoxLayout(frame)
         layout.setSpacing(15)
         
         label_titulo = QLabel(titulo)
-        label_titulo.setStyleSheet("font-size: 18px; font-weight: bold; color: #1f2937;")
+        label_titulo.setObjectName("secaoTitulo")
         layout.addWidget(label_titulo)
         
         return frame
     
-    def criar_card_metrica(self, titulo: str, valor: str, cor: str = "#2563eb", 
-                          icone: str = "", subtitulo: str = "") -> QFrame:
-        """Cria um card de métrica melhorado"""
-        card = QFrame()
-        card.setStyleSheet(f"""
-            QFrame {{
-                background: white;
-                border-radius: 12px;
-                padding: 20px;
-                border-left: 5px solid {cor};
-                border: 1px solid #e5e7eb;
-            }}
-        """)
-        card.setMinimumHeight(130)
-        
-        layout = QVBoxLayout(card)
-        layout.setSpacing(8)
-        
-        # Título e ícone
-        titulo_layout = QHBoxLayout()
-        
-        if icone:
-            label_icone = QLabel(icone)
-            label_icone.setStyleSheet("font-size: 24px;")
-            titulo_layout.addWidget(label_icone)
-        
-        label_titulo = QLabel(titulo)
-        label_titulo.setStyleSheet("color: #6b7280; font-size: 14px; font-weight: 500;")
-        titulo_layout.addWidget(label_titulo)
-        titulo_layout.addStretch()
-        
-        layout.addLayout(titulo_layout)
-        
-        # Valor
-        label_valor = QLabel(valor)
-        label_valor.setStyleSheet(f"color: {cor}; font-size: 32px; font-weight: bold;")
-        layout.addWidget(label_valor)
-        
-        # Subtítulo
-        if subtitulo:
-            label_subtitulo = QLabel(subtitulo)
-            label_subtitulo.setStyleSheet("color: #9ca3af; font-size: 12px;")
-            layout.addWidget(label_subtitulo)
-        
-        layout.addStretch()
-        
-        return card
+    @staticmethod
+    def _criar_mensagem(texto: str) -> QLabel:
+        """Label de aviso de uma seção (carregando, vazia, indisponível)"""
+        label = QLabel(texto)
+        label.setObjectName("dashboardMensagem")
+        return label
     
-    def carregar_dados(self):
-        """Carrega os dados do dashboard"""
-        # Limpar métricas existentes
-        while self.metricas_grid.count():
-            item = self.metricas_grid.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        # Total de clientes
-        total_clientes = self.relatorio_service.total_clientes()
-        card_clientes = self.criar_card_metrica(
-            "Total de Clientes", 
-            str(total_clientes), 
-            "#2563eb",
-            "👥"
-        )
-        self.metricas_grid.addWidget(card_clientes, 0, 0)
-        
-        # Oportunidades abertas
-        op_abertas = self.relatorio_service.total_oportunidades_abertas()
-        card_oportunidades = self.criar_card_metrica(
-            "Oportunidades Abertas", 
-            str(op_abertas), 
-            "#10b981",
-            "💼"
-        )
-        self.metricas_grid.addWidget(card_oportunidades, 0, 1)
-        
-        # Valor em negociação
-        valor_neg = self.relatorio_service.valor_total_negociacao()
-        card_valor = self.criar_card_metrica(
-            "Valor em Negociação", 
-            Formatters.formatar_moeda(valor_neg), 
-            "#f59e0b",
-            "💰"
-        )
-        self.metricas_grid.addWidget(card_valor, 0, 2)
+    def carregar_dados(self, secoes=None):
+        """Carrega os dados do dashboard em segundo plano.
+        
+        Cada seção é buscada por um Worker no QThreadPool e preenchida assim
+        que seus dados chegam; até a primeira carga os widgets mostram "—" e
+        "Carregando...". `secoes` limita a carga a algumas seções (padrão:
+        todas); recarregar uma seção cancela a carga dela em andamento.
+        """
+        for secao in secoes or TABELAS_SECOES:
+            self._cancelar_carga(secao)
+            worker = Worker(self._buscar_secao, secao, sequencia=self._seq_secoes[secao])
+            worker.signals.concluido.connect(self._on_secao_carregada)
+            worker.signals.erro.connect(self._on_secao_erro)
+            self._workers[secao] = worker
+            worker.iniciar()
+    
+    def _cancelar_carga(self, secao: str):
+        """Descarta a carga da seção em andamento, se houver"""
+        self._carga_seq += 1
+        self._seq_secoes[secao] = self._carga_seq
+        worker = self._workers.pop(secao, None)
+        if worker is not None:
+            worker.cancelar()
+    
+    def _buscar_secao(self, secao: str):
+        """Consulta os dados de uma seção (executa fora da thread da interface)"""
+        if secao == 'metricas':
+            # Todas as métricas vêm de uma única consulta agregada
+            return secao, self.relatorio_service.snapshot()
+        if secao == 'tarefas':
+            return secao, self._buscar_proximas_tarefas()
+        return secao, self._buscar_oportunidades_proximas()
+    
+    def _on_secao_carregada(self, sequencia: int, resultado):
+        """Exibe os dados de uma seção se eles ainda forem da carga mais recente"""
+        secao, dados = resultado
+        if sequencia != self._seq_secoes.get(secao):
+            return
+        if secao == 'metricas':
+            self._exibir_metricas(dados)
+        elif secao == 'tarefas':
+            self._atualizar_proximas_tarefas(dados)
+        else:
+            self._atualizar_oportunidades_proximas(dados)
+    
+    def _on_secao_erro(self, sequencia: int, mensagem: str):
+        """Callback de erro da carga de uma seção"""
+        if sequencia not in self._seq_secoes.values():
+            return
+        print(f"Erro ao carregar dashboard: {mensagem}")
+    
+    def _exibir_metricas(self, snapshot: DashboardSnapshot):
+        """Preenche os cards de métricas e as seções derivadas do snapshot"""
+        self.card_clientes.definir_valor(str(snapshot.total_clientes))
+        self.card_oportunidades.definir_valor(str(snapshot.oportunidades_abertas))
+        self.card_valor.definir_valor(Formatters.formatar_moeda(snapshot.valor_negociacao))
         
-        # Tarefas pendentes hoje
-        tarefas_hoje = self.relatorio_service.total_tarefas_pendentes_hoje()
-        tarefas_atrasadas = len(self.tarefa_service.buscar_atrasadas()) if self.tarefa_service else 0
+        tarefas_atrasadas = snapshot.tarefas_atrasadas
         subtitulo_tarefas = f"{tarefas_atrasadas} atrasadas" if tarefas_atrasadas > 0 else "Todas em dia"
-        card_tarefas = self.criar_card_metrica(
-            "Tarefas Hoje", 
-            str(tarefas_hoje), 
-            "#ef4444",
-            "✓",
-            subtitulo_tarefas
-        )
-        self.metricas_grid.addWidget(card_tarefas, 0, 3)
-        
-        # Taxa de conversão
-        taxa = self.relatorio_service.taxa_conversao()
-        card_taxa = self.criar_card_metrica(
-            "Taxa de Conversão",
-            f"{taxa:.1f}%",
-            "#8b5cf6",
-            "📊"
-        )
-        self.metricas_grid.addWidget(card_taxa, 1, 0)
+        self.card_tarefas.definir_valor(str(snapshot.tarefas_pendentes_hoje), subtitulo_tarefas)
         
-        # Total de oportunidades
-        todas_op = len(self.oportunidade_service.listar_oportunidades()) if self.oportunidade_service else 0
-        fechadas = sum(1 for op in self.oportunidade_service.listar_oportunidades() if op.etapa == 'Fechado') if self.oportunidade_service else 0
-        card_total_op = self.criar_card_metrica(
-            "Total Oportunidades",
-            str(todas_op),
-            "#06b6d4",
-            "📈",
-            f"{fechadas} fechadas"
+        self.card_taxa.definir_valor(f"{snapshot.taxa_conversao:.1f}%")
+        self.card_total_op.definir_valor(
+            str(snapshot.total_oportunidades),
+            f"{snapshot.oportunidades_fechadas} fechadas"
         )
-        self.metricas_grid.addWidget(card_total_op, 1, 1)
-        
-        # Tarefas concluídas vs pendentes
-        tarefas_stats = self.relatorio_service.tarefas_concluidas_vs_pendentes()
-        card_tarefas_stats = self.criar_card_metrica(
-            "Tarefas",
-            f"{tarefas_stats['concluidas']}/{tarefas_stats['total']}",
-            "#14b8a6",
-            "✓",
-            f"{tarefas_stats['pendentes']} pendentes"
+        self.card_tarefas_stats.definir_valor(
+            f"{snapshot.tarefas_concluidas}/{snapshot.total_tarefas}",
+            f"{snapshot.tarefas_pendentes} pendentes"
         )
-        self.metricas_grid.addWidget(card_tarefas_stats, 1, 2)
-        
-        # Valor total fechado
-        if self.oportunidade_service:
-            todas = self.oportunidade_service.listar_oportunidades()
-            valor_fechado = sum(op.valor for op in todas if op.etapa == 'Fechado')
-            card_fechado = self.criar_card_metrica(
-                "Valor Fechado",
-                Formatters.formatar_moeda(valor_fechado),
-                "#22c55e",
-                "✅"
-            )
-            self.metricas_grid.addWidget(card_fechado, 1, 3)
+        self.card_fechado.definir_valor(Formatters.formatar_moeda(snapshot.valor_fechado))
         
-        # Atualizar seções
-        self._atualizar_oportunidades_etapa()
-        self._atualizar_taxa_conversao()
-        self._atualizar_proximas_tarefas()
-        self._atualizar_oportunidades_proximas()
+        self._atualizar_oportunidades_etapa(snapshot)
+        self._atualizar_taxa_conversao(snapshot)
     
-    def _atualizar_oportunidades_etapa(self):
+    def _atualizar_oportunidades_etapa(self, snapshot: DashboardSnapshot):
         """Atualiza o gráfico de oportunidades por etapa"""
-        layout = self.frame_oportunidades.layout()
-        # Limpar layout (exceto título)
-        while layout.count() > 1:
-            item = layout.takeAt(1)
-            if item.widget():
-                item.widget().deleteLater()
-            elif item.layout():
-                self._limpar_layout(item.layout())
-        
-        oportunidades_por_etapa = self.relatorio_service.oportunidades_por_etapa()
-        
-        if not oportunidades_por_etapa:
-            label = QLabel("Nenhuma oportunidade cadastrada")
-            label.setStyleSheet("color: #6b7280; padding: 20px;")
-            layout.addWidget(label)
-        else:
-            # Ordenar por ordem do funil
-            ordem_etapas = ["Lead", "Qualificação", "Proposta", "Negociação", "Fechado", "Perdido"]
-            cores = {
-                "Lead": "#3b82f6",
-                "Qualificação": "#10b981",
-                "Proposta": "#f59e0b",
-                "Negociação": "#8b5cf6",
-                "Fechado": "#22c55e",
-                "Perdido": "#ef4444"
-            }
-            
-            max_valor = max(oportunidades_por_etapa.values()) if oportunidades_por_etapa.values() else 1
-            
-            for etapa in ordem_etapas:
-                if etapa not in oportunidades_por_etapa:
-                    continue
-                
-                quantidade = oportunidades_por_etapa[etapa]
-                cor = cores.get(etapa, "#6b7280")
-                
-                linha = QHBoxLayout()
-                linha.setSpacing(10)
-                
-                # Label da etapa
-                label_etapa = QLabel(etapa)
-                label_etapa.setStyleSheet(f"font-weight: bold; min-width: 120px; color: {cor};")
-                linha.addWidget(label_etapa)
-                
-                # Barra de progresso
-                progress = QProgressBar()
-                progress.setMaximum(max_valor)
-                progress.setValue(quantidade)
-                progress.setTextVisible(False)
-                progress.setStyleSheet(f"""
-                    QProgressBar {{
-                        border: none;
-                        border-radius: 6px;
-                        background: #e5e7eb;
-                        height: 25px;
-                    }}
-                    QProgressBar::chunk {{
-                        background: {cor};
-                        border-radius: 6px;
-                    }}
-                """)
-                linha.addWidget(progress, 1)
-                
-                # Label quantidade
-                label_qtd = QLabel(str(quantidade))
-                label_qtd.setStyleSheet(f"font-weight: bold; min-width: 40px; color: {cor}; font-size: 14px;")
-                label_qtd.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-                linha.addWidget(label_qtd)
-                
-                layout.addLayout(linha)
+        oportunidades_por_etapa = snapshot.oportunidades_por_etapa
+        max_valor = max(oportunidades_por_etapa.values()) if oportunidades_por_etapa else 1
+        
+        for etapa, linha in self.linhas_etapa.items():
+            quantidade = oportunidades_por_etapa.get(etapa)
+            if quantidade is None:
+                linha.hide()
+            else:
+                linha.exibir(quantidade, max_valor)
+                linha.show()
+        
+        self.label_etapas.setText("Nenhuma oportunidade cadastrada")
+        self.label_etapas.setVisible(not oportunidades_por_etapa)
     
-    def _atualizar_taxa_conversao(self):
+    def _atualizar_taxa_conversao(self, snapshot: DashboardSnapshot):
         """Atualiza a seção de taxa de conversão"""
-        layout = self.frame_conversao.layout()
-        # Limpar layout (exceto título)
-        while layout.count() > 1:
-            item = layout.takeAt(1)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        taxa = self.relatorio_service.taxa_conversao()
-        
-        # Gráfico circular simples (barra de progresso)
-        progress = QProgressBar()
-        progress.setMaximum(100)
-        progress.setValue(int(taxa))
-        progress.setFormat(f"{taxa:.1f}%")
-        progress.setStyleSheet("""
-            QProgressBar {
-                border: none;
-                border-radius: 8px;
-                background: #e5e7eb;
-                height: 40px;
-                font-size: 18px;
-                font-weight: bold;
-                text-align: center;
-            }
-            QProgressBar::chunk {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #10b981, stop:1 #22c55e);
-                border-radius: 8px;
-            }
-        """)
-        layout.addWidget(progress)
-        
-        # Informações adicionais
-        if self.oportunidade_service:
-            todas = self.oportunidade_service.listar_oportunidades()
-            fechadas = sum(1 for op in todas if op.etapa == 'Fechado')
-            perdidas = sum(1 for op in todas if op.etapa == 'Perdido')
-            
-            info = QLabel(f"Fechadas: {fechadas} | Perdidas: {perdidas} | Total: {len(todas)}")
-            info.setStyleSheet("color: #6b7280; font-size: 12px; margin-top: 10px;")
-            layout.addWidget(info)
+        taxa = snapshot.taxa_conversao
+        self.barra_conversao.setValue(int(taxa))
+        self.barra_conversao.setFormat(f"{taxa:.1f}%")
+        self.label_conversao.setText(
+            f"Fechadas: {snapshot.oportunidades_fechadas} | "
+            f"Perdidas: {snapshot.oportunidades_perdidas} | "
+            f"Total: {snapshot.total_oportunidades}"
+        )
     
-    def _atualizar_proximas_tarefas(self):
-        """Atualiza a lista de próximas tarefas"""
-        layout = self.frame_tarefas.layout()
-        # Limpar layout (exceto título)
-        while layout.count() > 1:
-            item = layout.takeAt(1)
-            if item.widget():
-                item.widget().deleteLater()
-        
+    def _buscar_proximas_tarefas(self):
+        """Tarefas pendentes dos próximos 5 dias (None sem o serviço)"""
         if not self.tarefa_service:
-            label = QLabel("Serviço de tarefas não disponível")
-            label.setStyleSheet("color: #6b7280;")
-            layout.addWidget(label)
-            return
-        
-        # Buscar próximas tarefas (próximos 5 dias)
-        todas = self.tarefa_service.listar_tarefas()
-        hoje = datetime.now().date()
-        proximas = [
-            t for t in todas
-            if t.status == 'Pendente' and t.data_hora and
-            t.data_hora.date() >= hoje and
-            t.data_hora.date() <= (hoje + timedelta(days=5))
-        ]
-        proximas.sort(key=lambda x: x.data_hora if x.data_hora else datetime.max)
-        proximas = proximas[:5]  # Limitar a 5
-        
-        if not proximas:
-            label = QLabel("Nenhuma tarefa nos próximos 5 dias")
-            label.setStyleSheet("color: #6b7280; padding: 10px;")
-            layout.addWidget(label)
+            return None
+        return self.tarefa_service.proximas_tarefas(dias=5, limite=LIMITE_LISTAS)
+    
+    def _atualizar_proximas_tarefas(self, proximas):
+        """Atualiza a lista de próximas tarefas"""
+        if proximas is None:
+            self.lista_tarefas.exibir([], "Serviço de tarefas não disponível")
         else:
-            for tarefa in proximas:
-                item = self._criar_item_tarefa(tarefa)
-                layout.addWidget(item)
+            self.lista_tarefas.exibir(
+                [(tarefa,) for tarefa in proximas],
+                "Nenhuma tarefa nos próximos 5 dias"
+            )
     
-    def _criar_item_tarefa(self, tarefa) -> QFrame:
-        """Cria um item de tarefa para a lista"""
-        frame = QFrame()
-        frame.setStyleSheet("""
-            QFrame {
-                background: #f9fafb;
-                border-radius: 8px;
-                padding: 12px;
-                border-left: 3px solid #3b82f6;
-            }
-        """)
-        
-        layout = QVBoxLayout(frame)
-        layout.setSpacing(5)
-        
-        # Descrição
-        label_desc = QLabel(tarefa.descricao)
-        label_desc.setStyleSheet("font-weight: bold; color: #1f2937;")
-        layout.addWidget(label_desc)
-        
-        # Informações
-        info_layout = QHBoxLayout()
-        
-        # Data/Hora
-        if tarefa.data_hora:
-            data_str = Formatters.formatar_data_hora(tarefa.data_hora)
-            label_data = QLabel(f"📅 {data_str}")
-            label_data.setStyleSheet("color: #6b7280; font-size: 12px;")
-            info_layout.addWidget(label_data)
-        
-        info_layout.addStretch()
-        
-        # Prioridade
-        cores_prioridade = {"Alta": "#ef4444", "Média": "#f59e0b", "Baixa": "#10b981"}
-        cor = cores_prioridade.get(tarefa.prioridade, "#6b7280")
-        label_prioridade = QLabel(tarefa.prioridade)
-        label_prioridade.setStyleSheet(f"color: {cor}; font-weight: bold; font-size: 11px; padding: 2px 8px; background: {cor}20; border-radius: 4px;")
-        info_layout.addWidget(label_prioridade)
+    def _buscar_oportunidades_proximas(self):
+        """Pares (oportunidade, nome do cliente) próximos do fechamento
+        (None sem os serviços)"""
+        if not self.oportunidade_service or not self.cliente_service:
+            return None
         
-        layout.addLayout(info_layout)
+        # Oportunidades em negociação com alta probabilidade
+        proximas = self.oportunidade_service.proximas_fechamento(
+            ["Negociação", "Proposta"], prob_min=70, limite=LIMITE_LISTAS
+        )
         
-        return frame
+        # Nomes resolvidos aqui: o diretório pode precisar ir ao banco
+        return [(op, self.cliente_service.nome_cliente(op.cliente_id)) for op in proximas]
     
-    def _atualizar_oportunidades_proximas(self):
+    def _atualizar_oportunidades_proximas(self, proximas):
         """Atualiza a lista de oportunidades próximas do fechamento"""
-        layout = self.frame_oportunidades_proximas.layout()
-        # Limpar layout (exceto título)
-        while layout.count() > 1:
-            item = layout.takeAt(1)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        if not self.oportunidade_service or not self.cliente_service:
-            label = QLabel("Serviços não disponíveis")
-            label.setStyleSheet("color: #6b7280;")
-            layout.addWidget(label)
-            return
-        
-        # Buscar oportunidades em negociação com alta probabilidade
-        todas = self.oportunidade_service.listar_oportunidades()
-        proximas = [
-            op for op in todas
-            if op.etapa in ["Negociação", "Proposta"] and
-            op.probabilidade >= 70 and
-            op.data_prevista_fechamento and
-            op.data_prevista_fechamento >= date.today()
-        ]
-        proximas.sort(key=lambda x: (x.data_prevista_fechamento, -x.probabilidade))
-        proximas = proximas[:5]  # Limitar a 5
-        
-        if not proximas:
-            label = QLabel("Nenhuma oportunidade próxima do fechamento")
-            label.setStyleSheet("color: #6b7280; padding: 10px;")
-            layout.addWidget(label)
+        if proximas is None:
+            self.lista_oportunidades.exibir([], "Serviços não disponíveis")
         else:
-            for op in proximas:
-                item = self._criar_item_oportunidade(op)
-                layout.addWidget(item)
-    
-    def _criar_item_oportunidade(self, oportunidade) -> QFrame:
-        """Cria um item de oportunidade para a lista"""
-        frame = QFrame()
-        frame.setStyleSheet("""
-            QFrame {
-                background: #f9fafb;
-                border-radius: 8px;
-                padding: 12px;
-                border-left: 3px solid #f59e0b;
-            }
-        """)
-        
-        layout = QVBoxLayout(frame)
-        layout.setSpacing(5)
-        
-        # Título
-        label_titulo = QLabel(oportunidade.titulo)
-        label_titulo.setStyleSheet("font-weight: bold; color: #1f2937;")
-        layout.addWidget(label_titulo)
-        
-        # Informações
-        info_layout = QHBoxLayout()
-        
-        # Valor
-        label_valor = QLabel(f"💰 {Formatters.formatar_moeda(oportunidade.valor)}")
-        label_valor.setStyleSheet("color: #6b7280; font-size: 12px;")
-        info_layout.addWidget(label_valor)
-        
-        info_layout.addStretch()
-        
-        # Probabilidade
-        label_prob = QLabel(f"{oportunidade.probabilidade}%")
-        label_prob.setStyleSheet("color: #f59e0b; font-weight: bold; font-size: 12px;")
-        info_layout.addWidget(label_prob)
-        
-        layout.addLayout(info_layout)
-        
-        # Data
-        if oportunidade.data_prevista_fechamento:
-            data_str = Formatters.formatar_data(oportunidade.data_prevista_fechamento)
-            label_data = QLabel(f"📅 {data_str}")
-            label_data.setStyleSheet("color: #6b7280; font-size: 11px;")
-            layout.addWidget(label_data)
-        
-        return frame
-    
-    def _limpar_layout(self, layout):
-        """Limpa um layout recursivamente"""
-        while layout.count():
-            item = layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-            elif item.layout():
-                self._limpar_layout(item.layout())
+            self.lista_oportunidades.exibir(proximas, "Nenhuma oportunidade próxima do fechamento")
@@ -1,10 +1,11 @@
 """
 View de listagem de oportunidades
 """
-from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
+from typing import Optional
+from PySide6.QtWidgets import (QVBoxLayout, QHBoxLayout, QPushButton,
                                QLineEdit, QTableView, QLabel, QHeaderView, 
                                QComboBox, QDialog, QFileDialog)
-from PySide6.QtCore import Qt, QAbstractTableModel, QDate
+from PySide6.QtCore import Qt, QDate, QTimer
 from datetime import date
 from services.oportunidade_service import OportunidadeService
 from services.cliente_service import ClienteService
@@ -13,29 +14,33 @@ from utils.formatters import Formatters
 from utils.helpers import Helpers
 from ui.views.oportunidade_form import OportunidadeForm
 from services.export_service import ExportService
+from ui.widgets.paginated_table_model import PaginatedTableModel
+from ui.widgets.base_view import BaseView
+from services.cliente_directory import ClienteDirectory
+from repositories.base_repository import mapa_identidade
+from utils.workers import Worker
 
 
-class OportunidadesTableModel(QAbstractTableModel):
+class OportunidadesTableModel(PaginatedTableModel):
     """Model para tabela de oportunidades"""
     
-    def __init__(self, oportunidades: list, cliente_service: ClienteService):
-        super().__init__()
-        self.oportunidades = oportunidades
-        self.cliente_service = cliente_service
-        self.headers = ['ID', 'Título', 'Cliente', 'Etapa', 'Valor', 'Probabilidade', 'Data Prevista', 'Responsável']
+    headers = ['ID', 'Título', 'Cliente', 'Etapa', 'Valor', 'Probabilidade', 'Data Prevista', 'Responsável']
     
-    def rowCount(self, parent=None):
-        return len(self.oportunidades)
+    def __init__(self, *args, clientes: Optional[ClienteDirectory] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Nome do cliente resolvido em memória em vez de um JOIN por página
+        self.clientes = clientes
     
-    def columnCount(self, parent=None):
-        return len(self.headers)
+    def _nome_cliente(self, item) -> str:
+        nome = self.clientes.nome(item.cliente_id) if self.clientes else ''
+        return nome or getattr(item, 'cliente_nome', '') or f"ID: {item.cliente_id}"
     
     def data(self, index, role=Qt.DisplayRole):
         if not index.isValid():
             return None
         
         if role == Qt.DisplayRole:
-            oportunidade = self.oportunidades[index.row()]
+            oportunidade = self.itens[index.row()]
             col = index.column()
             
             if col == 0:
@@ -43,9 +48,7 @@ class OportunidadesTableModel(QAbstractTableModel):
             elif col == 1:
                 return oportunidade.titulo
             elif col == 2:
-                # Buscar nome do cliente
-                cliente = self.cliente_service.buscar_cliente(oportunidade.cliente_id)
-                return cliente.nome if cliente else f"ID: {oportunidade.cliente_id}"
+                return self._nome_cliente(oportunidade)
             elif col == 3:
                 return oportunidade.etapa
             elif col == 4:
@@ -58,22 +61,36 @@ class OportunidadesTableModel(QAbstractTableModel):
                 return oportunidade.responsavel
         
         return None
-    
-    def headerData(self, section, orientation, role=Qt.DisplayRole):
-        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
-            return self.headers[section]
-        return None
 
 
-class OportunidadesView(QWidget):
+class OportunidadesView(BaseView):
     """Tela de listagem de oportunidades"""
     
+    # Tabelas exibidas (a coluna de cliente vem de clientes)
+    TABELAS = frozenset({'oportunidades', 'clientes'})
+    
+    # Espera após a última tecla antes de disparar a busca (ms)
+    ATRASO_BUSCA_MS = 300
+    
     def __init__(self, oportunidade_service: OportunidadeService, cliente_service: ClienteService):
         super().__init__()
         self.oportunidade_service = oportunidade_service
         self.cliente_service = cliente_service
+        self._filtros = {}  # filtros da listagem exibida (para o total)
+        
+        # Busca assíncrona: só o resultado da requisição mais recente é aplicado
+        self._busca_seq = 0
+        self._worker_busca = None
+        self._timer_busca = QTimer(self)
+        self._timer_busca.setSingleShot(True)
+        self._timer_busca.setInterval(self.ATRASO_BUSCA_MS)
+        self._timer_busca.timeout.connect(self.on_filtro_changed)
+        
         self.setup_ui()
-        self.carregar_dados()
+    
+    def atualizar(self):
+        """Atualiza a lista mantendo os filtros atuais"""
+        self.atualizar_lista()
     
     def setup_ui(self):
         """Configura a interface"""
@@ -177,47 +194,110 @@ class OportunidadesView(QWidget):
         layout.addLayout(bottom_layout)
     
     def carregar_dados(self, termo_busca: str = "", etapa: str = ""):
-        """Carrega as oportunidades na tabela"""
-        if etapa:
-            oportunidades = self.oportunidade_service.buscar_por_etapa(etapa)
-        else:
-            oportunidades = self.oportunidade_service.listar_oportunidades()
+        """Carrega as oportunidades na tabela, com os filtros aplicados no banco;
+        com texto de busca, a primeira página e o total vêm em segundo plano"""
+        filtros = {'texto': termo_busca or None, 'etapa': etapa or None}
+        
+        # Linhas carregadas em blocos conforme a rolagem; total via COUNT
+        model = OportunidadesTableModel(
+            lambda cursor, limite: self.oportunidade_service.buscar_filtrado(
+                limite=limite, cursor=cursor, **filtros
+            ),
+            clientes=self.cliente_service.diretorio,
+            carregar_alteracoes=lambda marca: self.oportunidade_service.alteracoes_filtradas(
+                marca, **filtros
+            )
+        )
+        
+        # Qualquer busca ainda em andamento fica obsoleta
+        self._invalidar_busca()
         
-        # Filtrar por busca se houver termo
         if termo_busca:
-            termo_lower = termo_busca.lower()
-            oportunidades = [
-                op for op in oportunidades
-                if termo_lower in op.titulo.lower() or 
-                (op.responsavel and termo_lower in op.responsavel.lower())
-            ]
-        
-        model = OportunidadesTableModel(oportunidades, self.cliente_service)
+            self._buscar(model, filtros)
+            return
+        
+        model.fetchMore()
+        # O model só lê nomes da memória: o diretório vai ao banco aqui, fora do paint
+        self.cliente_service.diretorio.atualizar()
+        self.tabela.setModel(model)
+        self._filtros = filtros
+        self.label_total.setText(f"Total: {self.oportunidade_service.contar_filtrado(**filtros)}")
+    
+    def _buscar(self, model: OportunidadesTableModel, filtros: dict):
+        """Dispara a busca por texto em segundo plano (chamado por carregar_dados)"""
+        self.label_total.setText("Buscando...")
+        
+        worker = Worker(self._carregar_busca, model, filtros, sequencia=self._busca_seq)
+        worker.signals.concluido.connect(self._on_busca_concluida)
+        worker.signals.erro.connect(self._on_busca_erro)
+        self._worker_busca = worker
+        worker.iniciar()
+    
+    def _carregar_busca(self, model: OportunidadesTableModel, filtros: dict) -> tuple:
+        """Executa no worker as consultas da busca, sem tocar na interface"""
+        marca, pagina = model.buscar_primeira_pagina()
+        self.cliente_service.diretorio.atualizar()
+        return model, filtros, marca, pagina, self.oportunidade_service.contar_filtrado(**filtros)
+    
+    def _invalidar_busca(self):
+        """Descarta a busca em andamento, se houver"""
+        self._busca_seq += 1
+        if self._worker_busca:
+            self._worker_busca.cancelar()
+            self._worker_busca = None
+    
+    def _on_busca_concluida(self, sequencia: int, resultado: tuple):
+        """Aplica o resultado da busca se ele ainda for o mais recente"""
+        if sequencia != self._busca_seq:
+            return
+        self._worker_busca = None
+        
+        model, filtros, marca, pagina, total = resultado
+        model.exibir_primeira_pagina(marca, pagina)
         self.tabela.setModel(model)
-        self.label_total.setText(f"Total: {len(oportunidades)}")
+        self._filtros = filtros
+        self.label_total.setText(f"Total: {total}")
+    
+    def _on_busca_erro(self, sequencia: int, mensagem: str):
+        """Callback de erro da busca em segundo plano"""
+        if sequencia != self._busca_seq:
+            return
+        self._worker_busca = None
+        Helpers.mostrar_mensagem("Erro", f"Erro ao buscar oportunidades: {mensagem}", 'error', self)
+    
+    def atualizar_lista(self):
+        """Aplica na tabela só as alterações desde a carga, preservando seleção
+        e rolagem; se falhar, refaz a consulta com os filtros atuais"""
+        model = self.tabela.model()
+        if isinstance(model, PaginatedTableModel) and model.sincronizar():
+            self.cliente_service.diretorio.atualizar()
+            self.label_total.setText(f"Total: {self.oportunidade_service.contar_filtrado(**self._filtros)}")
+            # Nomes de clientes vêm do diretório e podem ter mudado
+            self.tabela.viewport().update()
+        else:
+            self.on_filtro_changed()
     
     def on_busca_changed(self, texto: str):
-        """Callback quando o texto de busca muda"""
-        etapa = self.filtro_etapa.currentData()
-        self.carregar_dados(texto, etapa)
+        """Callback quando o texto de busca muda (com debounce)"""
+        self._timer_busca.start()
     
     def on_filtro_changed(self):
         """Callback quando o filtro de etapa muda"""
+        self._timer_busca.stop()
         etapa = self.filtro_etapa.currentData()
-        texto = self.busca_input.text()
+        texto = self.busca_input.text().strip()
         self.carregar_dados(texto, etapa)
     
     def on_nova_oportunidade_clicked(self):
         """Callback para nova oportunidade"""
         form = OportunidadeForm(self.oportunidade_service, self.cliente_service, parent=self)
         if form.exec() == QDialog.Accepted:
-            self.carregar_dados()
+            self.dados_alterados.emit()
+            self.atualizar_lista()
     
     def on_exportar_clicked(self):
         """Callback para exportar"""
-        oportunidades = self.oportunidade_service.listar_oportunidades()
-        
-        if not oportunidades:
+        if not self.oportunidade_service.contar_oportunidades():
             Helpers.mostrar_mensagem("Aviso", "Não há oportunidades para exportar", 'warning', self)
             return
         
@@ -229,6 +309,9 @@ class OportunidadesView(QWidget):
         )
         
         if arquivo:
+            # Lê as oportunidades em streaming (cursor sem buffer, em lotes) durante a
+            # escrita do arquivo; a conexão do pool fica reservada até o fim da exportação
+            oportunidades = self.oportunidade_service.iterar_oportunidades()
             sucesso = ExportService.exportar_oportunidades_csv(oportunidades, arquivo)
             if sucesso:
                 Helpers.mostrar_mensagem("Sucesso", f"Oportunidades exportadas para:\n{arquivo}", 'info', self)
@@ -248,7 +331,10 @@ class OportunidadesView(QWidget):
     
     def on_mover_etapa_clicked(self):
         """Callback para mover etapa"""
-        oportunidade = self._obter_oportunidade_selecionada()
+        # Mapa só na carga da linha selecionada: não atravessa o diálogo modal,
+        # e mover_etapa relê a oportunidade dentro da sua transação
+        with mapa_identidade():
+            oportunidade = self._obter_oportunidade_selecionada()
         if not oportunidade:
             Helpers.mostrar_mensagem("Aviso", "Selecione uma oportunidade", 'warning', self)
             return
@@ -272,7 +358,8 @@ class OportunidadesView(QWidget):
                 sucesso = self.oportunidade_service.mover_etapa(oportunidade.id, nova_etapa)
                 if sucesso:
                     Helpers.mostrar_mensagem("Sucesso", "Etapa atualizada com sucesso", 'info', self)
-                    self.carregar_dados()
+                    self.dados_alterados.emit()
+                    self.atualizar_lista()
                 else:
                     Helpers.mostrar_mensagem("Erro", "Erro ao atualizar etapa", 'error', self)
             except Exception as e:
@@ -287,7 +374,8 @@ class OportunidadesView(QWidget):
         
         form = OportunidadeForm(self.oportunidade_service, self.cliente_service, oportunidade, parent=self)
         if form.exec() == QDialog.Accepted:
-            self.carregar_dados()
+            self.dados_alterados.emit()
+            self.atualizar_lista()
     
     def on_excluir_clicked(self):
         """Callback para excluir"""
@@ -305,7 +393,8 @@ class OportunidadesView(QWidget):
                 sucesso = self.oportunidade_service.excluir_oportunidade(oportunidade.id)
                 if sucesso:
                     Helpers.mostrar_mensagem("Sucesso", "Oportunidade excluída com sucesso", 'info', self)
-                    self.carregar_dados()
+                    self.dados_alterados.emit()
+                    self.atualizar_lista()
                 else:
                     Helpers.mostrar_mensagem("Erro", "Erro ao excluir oportunidade", 'error', self)
             except Exception as e:
@@ -119,10 +119,9 @@ class TarefaForm(QDialog):
     
     def _carregar_clientes(self):
         """Carrega clientes no combo"""
-        clientes = self.cliente_service.listar_clientes()
         self.cliente_combo.clear()
-        for cliente in clientes:
-            self.cliente_combo.addItem(cliente.nome, cliente.id)
+        for cliente_id, nome in self.cliente_service.listar_nomes_clientes():
+            self.cliente_combo.addItem(nome, cliente_id)
     
     def preencher_formulario(self):
         """Preenche o formulário com dados da tarefa"""
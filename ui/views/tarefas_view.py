@@ -1,11 +1,12 @@
 """
 View de listagem de tarefas
 """
-from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
+from typing import Optional
+from PySide6.QtWidgets import (QVBoxLayout, QHBoxLayout, QPushButton,
                                QLineEdit, QTableView, QLabel, QHeaderView, 
                                QComboBox, QDialog, QFileDialog, QCheckBox)
-from PySide6.QtCore import Qt, QAbstractTableModel
-from datetime import datetime, date
+from PySide6.QtCore import Qt, QTimer
+from datetime import datetime, date, timedelta
 from services.tarefa_service import TarefaService
 from services.cliente_service import ClienteService
 from models.tarefa import Tarefa
@@ -13,28 +14,32 @@ from utils.formatters import Formatters
 from utils.helpers import Helpers
 from ui.views.tarefa_form import TarefaForm
 from services.export_service import ExportService
+from ui.widgets.paginated_table_model import PaginatedTableModel
+from ui.widgets.base_view import BaseView
+from services.cliente_directory import ClienteDirectory
+from repositories.tarefa_repository import TarefaRepository
+from utils.workers import Worker
 
 
-class TarefasTableModel(QAbstractTableModel):
+class TarefasTableModel(PaginatedTableModel):
     """Model para tabela de tarefas"""
     
-    def __init__(self, tarefas: list, cliente_service: ClienteService):
-        super().__init__()
-        self.tarefas = tarefas
-        self.cliente_service = cliente_service
-        self.headers = ['✓', 'Descrição', 'Cliente', 'Tipo', 'Data/Hora', 'Prioridade', 'Status']
+    headers = ['✓', 'Descrição', 'Cliente', 'Tipo', 'Data/Hora', 'Prioridade', 'Status']
     
-    def rowCount(self, parent=None):
-        return len(self.tarefas)
+    def __init__(self, *args, clientes: Optional[ClienteDirectory] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Nome do cliente resolvido em memória em vez de um JOIN por página
+        self.clientes = clientes
     
-    def columnCount(self, parent=None):
-        return len(self.headers)
+    def _nome_cliente(self, item) -> str:
+        nome = self.clientes.nome(item.cliente_id) if self.clientes else ''
+        return nome or getattr(item, 'cliente_nome', '') or f"ID: {item.cliente_id}"
     
     def data(self, index, role=Qt.DisplayRole):
         if not index.isValid():
             return None
         
-        tarefa = self.tarefas[index.row()]
+        tarefa = self.itens[index.row()]
         col = index.column()
         
         if col == 0:  # Checkbox
@@ -46,9 +51,7 @@ class TarefasTableModel(QAbstractTableModel):
             if col == 1:
                 return tarefa.descricao
             elif col == 2:
-                # Buscar nome do cliente
-                cliente = self.cliente_service.buscar_cliente(tarefa.cliente_id)
-                return cliente.nome if cliente else f"ID: {tarefa.cliente_id}"
+                return self._nome_cliente(tarefa)
             elif col == 3:
                 return tarefa.tipo
             elif col == 4:
@@ -87,22 +90,36 @@ class TarefasTableModel(QAbstractTableModel):
             # Não altera aqui, será tratado na view
             return True
         return False
-    
-    def headerData(self, section, orientation, role=Qt.DisplayRole):
-        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
-            return self.headers[section]
-        return None
 
 
-class TarefasView(QWidget):
+class TarefasView(BaseView):
     """Tela de listagem de tarefas"""
     
+    # Tabelas exibidas (a coluna de cliente vem de clientes)
+    TABELAS = frozenset({'tarefas', 'clientes'})
+    
+    # Espera após a última tecla antes de disparar a busca (ms)
+    ATRASO_BUSCA_MS = 300
+    
     def __init__(self, tarefa_service: TarefaService, cliente_service: ClienteService):
         super().__init__()
         self.tarefa_service = tarefa_service
         self.cliente_service = cliente_service
+        self._filtros = {}  # filtros da listagem exibida (para o total)
+        
+        # Busca assíncrona: só o resultado da requisição mais recente é aplicado
+        self._busca_seq = 0
+        self._worker_busca = None
+        self._timer_busca = QTimer(self)
+        self._timer_busca.setSingleShot(True)
+        self._timer_busca.setInterval(self.ATRASO_BUSCA_MS)
+        self._timer_busca.timeout.connect(self._aplicar_filtros)
+        
         self.setup_ui()
-        self.carregar_dados()
+    
+    def atualizar(self):
+        """Atualiza a lista mantendo os filtros atuais"""
+        self.atualizar_lista()
     
     def setup_ui(self):
         """Configura a interface"""
@@ -214,35 +231,122 @@ class TarefasView(QWidget):
     
     def carregar_dados(self, termo_busca: str = "", filtro_data: str = "", 
                        filtro_status: str = "", filtro_prioridade: str = ""):
-        """Carrega as tarefas na tabela"""
+        """Carrega as tarefas na tabela, com todos os filtros aplicados no banco;
+        com texto de busca, a primeira página e o total vêm em segundo plano"""
+        status = filtro_status or None
+        intervalo = None
+        ordem = 'data_hora'
+        agora = datetime.now()
+        hoje = datetime.combine(agora.date(), datetime.min.time())
+        
         if filtro_data == "Hoje":
-            tarefas = self.tarefa_service.buscar_pendentes_hoje()
+            # Como a antiga lista de pendentes de hoje: sem status escolhido, só pendentes
+            intervalo = (hoje, hoje + timedelta(days=1))
+            status = filtro_status or 'Pendente'
+        elif filtro_data == "Esta Semana":
+            inicio_semana = hoje - timedelta(days=hoje.weekday())
+            intervalo = (inicio_semana, inicio_semana + timedelta(days=7))
         elif filtro_data == "Atrasadas":
-            tarefas = self.tarefa_service.buscar_atrasadas()
-        elif filtro_status:
-            tarefas = self.tarefa_service.buscar_por_status(filtro_status)
+            # Atrasadas são sempre pendentes; combinada com outro status não há resultado
+            intervalo = (None, agora)
+            status = [s for s in ['Pendente'] if not filtro_status or s == filtro_status]
         else:
-            tarefas = self.tarefa_service.listar_tarefas()
+            ordem = 'id'
+        
+        filtros = {
+            'texto': termo_busca or None,
+            'status': status,
+            'prioridade': filtro_prioridade or None,
+            'intervalo_data': intervalo
+        }
+        
+        # Linhas carregadas em blocos conforme a rolagem; total via COUNT
+        model = TarefasTableModel(
+            lambda cursor, limite: self.tarefa_service.buscar_filtrado(
+                limite=limite, cursor=cursor, ordem=ordem, resumo=True, **filtros
+            ),
+            clientes=self.cliente_service.diretorio,
+            carregar_alteracoes=lambda marca: self.tarefa_service.alteracoes_filtradas(
+                marca, **filtros
+            ),
+            ordenacao=TarefaRepository.ORDENACOES[ordem]
+        )
+        
+        # Qualquer busca ainda em andamento fica obsoleta
+        self._invalidar_busca()
         
-        # Filtrar por busca
         if termo_busca:
-            termo_lower = termo_busca.lower()
-            tarefas = [t for t in tarefas if termo_lower in t.descricao.lower()]
+            self._buscar(model, filtros)
+            return
         
-        # Filtrar por prioridade
-        if filtro_prioridade:
-            tarefas = [t for t in tarefas if t.prioridade == filtro_prioridade]
+        model.fetchMore()
+        # O model só lê nomes da memória: o diretório vai ao banco aqui, fora do paint
+        self.cliente_service.diretorio.atualizar()
+        self.tabela.setModel(model)
+        self._filtros = filtros
+        self.label_total.setText(f"Total: {self.tarefa_service.contar_filtrado(**filtros)}")
+    
+    def _buscar(self, model: TarefasTableModel, filtros: dict):
+        """Dispara a busca por texto em segundo plano (chamado por carregar_dados)"""
+        self.label_total.setText("Buscando...")
+        
+        worker = Worker(self._carregar_busca, model, filtros, sequencia=self._busca_seq)
+        worker.signals.concluido.connect(self._on_busca_concluida)
+        worker.signals.erro.connect(self._on_busca_erro)
+        self._worker_busca = worker
+        worker.iniciar()
+    
+    def _carregar_busca(self, model: TarefasTableModel, filtros: dict) -> tuple:
+        """Executa no worker as consultas da busca, sem tocar na interface"""
+        marca, pagina = model.buscar_primeira_pagina()
+        self.cliente_service.diretorio.atualizar()
+        return model, filtros, marca, pagina, self.tarefa_service.contar_filtrado(**filtros)
+    
+    def _invalidar_busca(self):
+        """Descarta a busca em andamento, se houver"""
+        self._busca_seq += 1
+        if self._worker_busca:
+            self._worker_busca.cancelar()
+            self._worker_busca = None
+    
+    def _on_busca_concluida(self, sequencia: int, resultado: tuple):
+        """Aplica o resultado da busca se ele ainda for o mais recente"""
+        if sequencia != self._busca_seq:
+            return
+        self._worker_busca = None
         
-        model = TarefasTableModel(tarefas, self.cliente_service)
+        model, filtros, marca, pagina, total = resultado
+        model.exibir_primeira_pagina(marca, pagina)
         self.tabela.setModel(model)
-        self.label_total.setText(f"Total: {len(tarefas)}")
+        self._filtros = filtros
+        self.label_total.setText(f"Total: {total}")
+    
+    def _on_busca_erro(self, sequencia: int, mensagem: str):
+        """Callback de erro da busca em segundo plano"""
+        if sequencia != self._busca_seq:
+            return
+        self._worker_busca = None
+        Helpers.mostrar_mensagem("Erro", f"Erro ao buscar tarefas: {mensagem}", 'error', self)
+    
+    def atualizar_lista(self):
+        """Aplica na tabela só as alterações desde a carga, preservando seleção
+        e rolagem; se falhar, refaz a consulta com os filtros atuais"""
+        model = self.tabela.model()
+        if isinstance(model, PaginatedTableModel) and model.sincronizar():
+            self.cliente_service.diretorio.atualizar()
+            self.label_total.setText(f"Total: {self.tarefa_service.contar_filtrado(**self._filtros)}")
+            # Nomes de clientes vêm do diretório e podem ter mudado
+            self.tabela.viewport().update()
+        else:
+            self._aplicar_filtros()
     
     def on_busca_changed(self, texto: str):
-        """Callback quando o texto de busca muda"""
-        self._aplicar_filtros()
+        """Callback quando o texto de busca muda (com debounce)"""
+        self._timer_busca.start()
     
     def on_filtro_changed(self):
         """Callback quando algum filtro muda"""
+        self._timer_busca.stop()
         self._aplicar_filtros()
     
     def _aplicar_filtros(self):
@@ -250,21 +354,22 @@ class TarefasView(QWidget):
         filtro_data = self.filtro_data.currentText()
         filtro_status = self.filtro_status.currentData()
         filtro_prioridade = self.filtro_prioridade.currentData()
-        texto = self.busca_input.text()
+        texto = self.busca_input.text().strip()
         self.carregar_dados(texto, filtro_data, filtro_status, filtro_prioridade)
     
     def on_tabela_clicked(self, index):
         """Callback quando clica na tabela (para checkbox)"""
         if index.column() == 0:  # Coluna do checkbox
             model = self.tabela.model()
-            tarefa = model.tarefas[index.row()]
+            tarefa = model.item(index.row())
             
             if tarefa.status == 'Pendente':
                 # Marcar como concluída
                 try:
                     sucesso = self.tarefa_service.marcar_concluida(tarefa.id)
                     if sucesso:
-                        self.carregar_dados()  # Recarregar
+                        self.dados_alterados.emit()
+                        self.atualizar_lista()
                 except Exception as e:
                     Helpers.mostrar_mensagem("Erro", f"Erro: {str(e)}", 'error', self)
     
@@ -272,7 +377,8 @@ class TarefasView(QWidget):
         """Callback para nova tarefa"""
         form = TarefaForm(self.tarefa_service, self.cliente_service, parent=self)
         if form.exec() == QDialog.Accepted:
-            self.carregar_dados()
+            self.dados_alterados.emit()
+            self.atualizar_lista()
     
     def _obter_tarefa_selecionada(self) -> Tarefa:
         """Obtém a tarefa selecionada na tabela"""
@@ -282,7 +388,7 @@ class TarefasView(QWidget):
         
         row = indexes[0].row()
         model = self.tabela.model()
-        tarefa = model.tarefas[row]
+        tarefa = model.item(row)
         return self.tarefa_service.buscar_tarefa(tarefa.id)
     
     def on_editar_clicked(self):
@@ -294,7 +400,8 @@ class TarefasView(QWidget):
         
         form = TarefaForm(self.tarefa_service, self.cliente_service, tarefa, parent=self)
         if form.exec() == QDialog.Accepted:
-            self.carregar_dados()
+            self.dados_alterados.emit()
+            self.atualizar_lista()
     
     def on_excluir_clicked(self):
         """Callback para excluir"""
@@ -312,7 +419,8 @@ class TarefasView(QWidget):
                 sucesso = self.tarefa_service.excluir_tarefa(tarefa.id)
                 if sucesso:
                     Helpers.mostrar_mensagem("Sucesso", "Tarefa excluída com sucesso", 'info', self)
-                    self.carregar_dados()
+                    self.dados_alterados.emit()
+                    self.atualizar_lista()
                 else:
                     Helpers.mostrar_mensagem("Erro", "Erro ao excluir tarefa", 'error', self)
             except Exception as e:
@@ -0,0 +1,50 @@
+"""
+View base com carregamento sob demanda
+"""
+from PySide6.QtWidgets import QWidget
+from PySide6.QtCore import Signal
+
+
+class BaseView(QWidget):
+    """View que só consulta o banco quando é exibida.
+
+    O construtor apenas monta a interface; os dados são carregados por
+    atualizar() na primeira exibição (ver MainWindow.mostrar_view) e depois
+    somente quando a view estiver desatualizada. Uma view que altera dados
+    emite dados_alterados, e a MainWindow marca as demais como
+    desatualizadas em vez de recarregá-las na hora.
+
+    Alterações feitas por outras estações chegam por tabelas_alteradas(),
+    chamado pela MainWindow com as tabelas que o monitor de alterações viu
+    mudar; TABELAS lista as tabelas que a view exibe.
+    """
+
+    dados_alterados = Signal()
+    TABELAS: frozenset = frozenset()
+
+    def __init__(self):
+        super().__init__()
+        self.desatualizada = True
+
+    def atualizar(self):
+        """Recarrega os dados exibidos; as views com dados sobrescrevem.
+        O padrão não faz nada (view sem dados do banco)."""
+
+    def marcar_desatualizada(self):
+        """Faz a próxima exibição recarregar os dados"""
+        self.desatualizada = True
+
+    def atualizar_se_necessario(self):
+        """Recarrega os dados se a view estiver desatualizada"""
+        if self.desatualizada:
+            self.desatualizada = False
+            self.atualizar()
+
+    def tabelas_alteradas(self, tabelas: set):
+        """Reage a alterações externas: recarrega agora se a view estiver
+        visível, senão apenas a marca como desatualizada"""
+        if not self.TABELAS & tabelas:
+            return
+        self.marcar_desatualizada()
+        if self.isVisible():
+            self.atualizar_se_necessario()
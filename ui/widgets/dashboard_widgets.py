@@ -0,0 +1,208 @@
+"""
+Widgets do dashboard, criados uma vez e atualizados no lugar.
+
+A aparência fica em resources/styles/dashboard.qss, selecionada pelo objectName
+de cada widget e por propriedades dinâmicas (cor, etapa, prioridade).
+"""
+import unicodedata
+from typing import Callable, List, Sequence
+from PySide6.QtWidgets import QFrame, QHBoxLayout, QLabel, QProgressBar, QVBoxLayout, QWidget
+from PySide6.QtCore import Qt
+from utils.formatters import Formatters
+
+
+def chave_estilo(texto: str) -> str:
+    """Valor de propriedade usado no qss: minúsculas e sem acentos"""
+    sem_acentos = unicodedata.normalize('NFKD', texto).encode('ascii', 'ignore').decode()
+    return sem_acentos.lower()
+
+
+def definir_propriedade(widget: QWidget, nome: str, valor: str):
+    """Altera uma propriedade dinâmica e reaplica o estilo, se ela mudou"""
+    if widget.property(nome) == valor:
+        return
+    widget.setProperty(nome, valor)
+    widget.style().unpolish(widget)
+    widget.style().polish(widget)
+
+
+def _label(texto: str, nome: str) -> QLabel:
+    label = QLabel(texto)
+    label.setObjectName(nome)
+    return label
+
+
+class CardMetrica(QFrame):
+    """Card com título, valor e subtítulo de uma métrica"""
+
+    def __init__(self, titulo: str, icone: str = "", cor: str = "azul"):
+        super().__init__()
+        self.setObjectName("cardMetrica")
+        self.setMinimumHeight(130)
+
+        layout = QVBoxLayout(self)
+        layout.setSpacing(8)
+
+        titulo_layout = QHBoxLayout()
+        if icone:
+            titulo_layout.addWidget(_label(icone, "metricaIcone"))
+        titulo_layout.addWidget(_label(titulo, "metricaTitulo"))
+        titulo_layout.addStretch()
+        layout.addLayout(titulo_layout)
+
+        # "—" até a primeira carga
+        self.label_valor = _label("—", "metricaValor")
+        layout.addWidget(self.label_valor)
+
+        self.label_subtitulo = _label("", "metricaSubtitulo")
+        self.label_subtitulo.hide()
+        layout.addWidget(self.label_subtitulo)
+
+        layout.addStretch()
+        self.definir_cor(cor)
+
+    def definir_valor(self, valor: str, subtitulo: str = ""):
+        self.label_valor.setText(valor)
+        self.label_subtitulo.setText(subtitulo)
+        self.label_subtitulo.setVisible(bool(subtitulo))
+
+    def definir_cor(self, cor: str):
+        definir_propriedade(self.label_valor, 'cor', cor)
+
+
+class LinhaEtapa(QWidget):
+    """Linha do gráfico de oportunidades por etapa"""
+
+    def __init__(self, etapa: str):
+        super().__init__()
+        chave = chave_estilo(etapa)
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(10)
+
+        self.label_etapa = _label(etapa, "etapaNome")
+        self.barra = QProgressBar()
+        self.barra.setObjectName("etapaBarra")
+        self.barra.setTextVisible(False)
+        self.label_quantidade = _label("", "etapaQuantidade")
+        self.label_quantidade.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+
+        for widget in (self.label_etapa, self.barra, self.label_quantidade):
+            widget.setProperty('etapa', chave)
+        layout.addWidget(self.label_etapa)
+        layout.addWidget(self.barra, 1)
+        layout.addWidget(self.label_quantidade)
+
+    def exibir(self, quantidade: int, maximo: int):
+        self.barra.setMaximum(maximo)
+        self.barra.setValue(quantidade)
+        self.label_quantidade.setText(str(quantidade))
+
+
+class ItemTarefa(QFrame):
+    """Item da lista de próximas tarefas"""
+
+    def __init__(self):
+        super().__init__()
+        self.setObjectName("itemTarefa")
+
+        layout = QVBoxLayout(self)
+        layout.setSpacing(5)
+
+        self.label_descricao = _label("", "itemTitulo")
+        layout.addWidget(self.label_descricao)
+
+        info_layout = QHBoxLayout()
+        self.label_data = _label("", "itemInfo")
+        info_layout.addWidget(self.label_data)
+        info_layout.addStretch()
+        self.label_prioridade = _label("", "itemPrioridade")
+        info_layout.addWidget(self.label_prioridade)
+        layout.addLayout(info_layout)
+
+    def exibir(self, tarefa):
+        self.label_descricao.setText(tarefa.descricao)
+        if tarefa.data_hora:
+            self.label_data.setText(f"📅 {Formatters.formatar_data_hora(tarefa.data_hora)}")
+        self.label_data.setVisible(bool(tarefa.data_hora))
+        self.label_prioridade.setText(tarefa.prioridade)
+        definir_propriedade(self.label_prioridade, 'prioridade', chave_estilo(tarefa.prioridade or ''))
+
+
+class ItemOportunidade(QFrame):
+    """Item da lista de oportunidades próximas do fechamento"""
+
+    def __init__(self):
+        super().__init__()
+        self.setObjectName("itemOportunidade")
+
+        layout = QVBoxLayout(self)
+        layout.setSpacing(5)
+
+        self.label_titulo = _label("", "itemTitulo")
+        layout.addWidget(self.label_titulo)
+
+        self.label_cliente = _label("", "itemInfo")
+        layout.addWidget(self.label_cliente)
+
+        info_layout = QHBoxLayout()
+        self.label_valor = _label("", "itemInfo")
+        info_layout.addWidget(self.label_valor)
+        info_layout.addStretch()
+        self.label_probabilidade = _label("", "itemProbabilidade")
+        info_layout.addWidget(self.label_probabilidade)
+        layout.addLayout(info_layout)
+
+        self.label_data = _label("", "itemData")
+        layout.addWidget(self.label_data)
+
+    def exibir(self, oportunidade, nome_cliente: str = ""):
+        self.label_titulo.setText(oportunidade.titulo)
+        self.label_cliente.setText(f"👤 {nome_cliente}")
+        self.label_cliente.setVisible(bool(nome_cliente))
+        self.label_valor.setText(f"💰 {Formatters.formatar_moeda(oportunidade.valor)}")
+        self.label_probabilidade.setText(f"{oportunidade.probabilidade}%")
+        data = oportunidade.data_prevista_fechamento
+        if data:
+            self.label_data.setText(f"📅 {Formatters.formatar_data(data)}")
+        self.label_data.setVisible(bool(data))
+
+
+class ListaItens(QWidget):
+    """Lista com um número fixo de itens reaproveitados e uma mensagem.
+
+    Os itens são criados uma vez por `fabrica`; exibir() preenche os
+    primeiros e esconde o restante. A mensagem aparece quando a lista está
+    vazia (ou enquanto carrega).
+    """
+
+    def __init__(self, fabrica: Callable[[], QWidget], limite: int):
+        super().__init__()
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(10)
+
+        self.label_mensagem = _label("", "dashboardMensagem")
+        layout.addWidget(self.label_mensagem)
+
+        self.itens: List[QWidget] = []
+        for _ in range(limite):
+            item = fabrica()
+            item.hide()
+            layout.addWidget(item)
+            self.itens.append(item)
+
+    def exibir(self, dados: Sequence[tuple], mensagem_vazia: str = ""):
+        """Mostra um item por tupla de argumentos de item.exibir"""
+        for i, item in enumerate(self.itens):
+            if i < len(dados):
+                item.exibir(*dados[i])
+                item.show()
+            else:
+                item.hide()
+        self.mostrar_mensagem(mensagem_vazia if not dados else "")
+
+    def mostrar_mensagem(self, mensagem: str):
+        self.label_mensagem.setText(mensagem)
+        self.label_mensagem.setVisible(bool(mensagem))
@@ -0,0 +1,208 @@
+"""
+Model de tabela com carregamento sob demanda (canFetchMore/fetchMore)
+"""
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from repositories.base_repository import Alteracoes, Pagina
+
+
+class PaginatedTableModel(QAbstractTableModel):
+    """Model base que carrega as linhas em blocos conforme a rolagem.
+
+    Recebe uma função carregar_pagina(cursor, limite) -> Pagina, normalmente
+    um listar_*_pagina dos services. O QTableView chama fetchMore quando o
+    usuário rola até o fim das linhas já carregadas. Também aceita uma lista
+    pronta (ex.: resultado de uma busca), sem carregamento adicional.
+
+    Com carregar_alteracoes(marca) -> Alteracoes (ver
+    BaseRepository.alteradas_desde), sincronizar() aplica só as linhas
+    alteradas desde a carga, sem trocar o model. `ordenacao` é a (coluna,
+    direção) da listagem, usada para posicionar as linhas incluídas.
+    """
+
+    headers: List[str] = []
+    TAMANHO_PAGINA = 100
+
+    def __init__(self, carregar_pagina: Optional[Callable[[Optional[str], int], Pagina]] = None,
+                 itens: Optional[list] = None,
+                 carregar_alteracoes: Optional[Callable[[Optional[datetime]], Optional[Alteracoes]]] = None,
+                 ordenacao: Tuple[str, str] = ('id', 'DESC')):
+        super().__init__()
+        self.itens = list(itens or [])
+        self._carregar_pagina = carregar_pagina
+        self._cursor: Optional[str] = None
+        self._tem_mais = carregar_pagina is not None
+        self._carregar_alteracoes = carregar_alteracoes
+        self._marca: Optional[datetime] = None
+        self._coluna_ordem, self._direcao = ordenacao
+        self._ultima_chave: Optional[tuple] = None  # chave da última linha buscada
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.itens)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.headers)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return self._tem_mais
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or not self._tem_mais:
+            return
+
+        if self._cursor is None and not self.itens:
+            self.exibir_primeira_pagina(*self.buscar_primeira_pagina())
+        else:
+            self._receber_pagina(self._carregar_pagina(self._cursor, self.TAMANHO_PAGINA))
+
+    def buscar_primeira_pagina(self) -> Tuple[Optional[datetime], Pagina]:
+        """Lê a marca d'água e a primeira página sem alterar o model.
+
+        Não toca em nada do Qt e pode rodar em um Worker; o resultado é
+        entregue a exibir_primeira_pagina na thread da interface.
+        """
+        marca = None
+        if self._carregar_alteracoes is not None:
+            # Marca lida antes da primeira página: o que mudar a partir daqui
+            # é aplicado pelo próximo sincronizar()
+            alteracoes = self._carregar_alteracoes(None)
+            marca = alteracoes.marca if alteracoes else None
+        return marca, self._carregar_pagina(None, self.TAMANHO_PAGINA)
+
+    def exibir_primeira_pagina(self, marca: Optional[datetime], pagina: Pagina):
+        """Exibe o resultado de buscar_primeira_pagina"""
+        self._marca = marca
+        self._receber_pagina(pagina)
+
+    def _receber_pagina(self, pagina: Pagina):
+        self._cursor = pagina.proximo_cursor
+        self._tem_mais = pagina.proximo_cursor is not None
+
+        if pagina.itens:
+            self._ultima_chave = self._chave(pagina.itens[-1])
+            inicio = len(self.itens)
+            self.beginInsertRows(QModelIndex(), inicio, inicio + len(pagina.itens) - 1)
+            self.itens.extend(pagina.itens)
+            self.endInsertRows()
+
+    def sincronizar(self) -> bool:
+        """Aplica as alterações feitas desde a carga (ou a última sincronização).
+
+        Retorna False se o model não acompanha alterações (lista pronta) ou
+        se elas não puderam ser lidas; nesse caso, recarregue a listagem.
+        """
+        if self._carregar_alteracoes is None or self._marca is None:
+            return False
+        alteracoes = self._carregar_alteracoes(self._marca)
+        if alteracoes is None:
+            return False
+        self._marca = alteracoes.marca
+        self.aplicar_alteracoes(alteracoes)
+        return True
+
+    def aplicar_alteracoes(self, alteracoes: Alteracoes):
+        """Remove, atualiza, move e inclui apenas as linhas alteradas.
+
+        As mudanças são sinalizadas com beginRemoveRows, dataChanged,
+        beginMoveRows e beginInsertRows, o que preserva a seleção e a rolagem
+        da tabela. Linhas que ficam depois da última página buscada não entram
+        no model: fetchMore as traz quando o usuário rolar até elas.
+
+        As linhas são localizadas por um índice id -> linha montado uma vez;
+        ele só é refeito depois de incluir, retirar ou mover uma linha, que
+        já custam uma passada pela lista.
+        """
+        linhas = self._indice()
+        # De baixo para cima: retirar uma linha não desloca as anteriores
+        for linha in sorted((linhas[id] for id in alteracoes.removidos if id in linhas), reverse=True):
+            self._remover_linha(linha)
+        linhas = None
+
+        for item in alteracoes.itens:
+            if linhas is None:
+                linhas = self._indice()
+            linha = linhas.get(item.id)
+            if linha is None:
+                if self._carregada(item):
+                    destino = self._posicao(item)
+                    self.beginInsertRows(QModelIndex(), destino, destino)
+                    self.itens.insert(destino, item)
+                    self.endInsertRows()
+                    linhas = None
+            elif not self._carregada(item):
+                self._remover_linha(linha)
+                linhas = None
+            elif self._atualizar_linha(linha, item):
+                linhas = None
+
+    def _atualizar_linha(self, linha: int, item) -> bool:
+        """Troca o item da linha, movendo-a se a posição na ordenação mudou.
+
+        Retorna True se a linha foi movida.
+        """
+        del self.itens[linha]
+        destino = self._posicao(item)
+        self.itens.insert(linha, item)
+        moveu = False
+        # Para beginMoveRows o destino é contado antes de retirar a linha
+        if destino != linha and self.beginMoveRows(QModelIndex(), linha, linha, QModelIndex(),
+                                                   destino if destino < linha else destino + 1):
+            self.itens.insert(destino, self.itens.pop(linha))
+            self.endMoveRows()
+            linha = destino
+            moveu = True
+        self.dataChanged.emit(self.index(linha, 0), self.index(linha, self.columnCount() - 1))
+        return moveu
+
+    def _remover_linha(self, linha: int):
+        self.beginRemoveRows(QModelIndex(), linha, linha)
+        del self.itens[linha]
+        self.endRemoveRows()
+
+    def _indice(self) -> Dict[int, int]:
+        """Mapa id -> linha dos itens carregados"""
+        return {item.id: linha for linha, item in enumerate(self.itens)}
+
+    def _chave(self, item) -> tuple:
+        """Chave de ordenação do item: (coluna da ordenação, id)"""
+        valor = getattr(item, self._coluna_ordem)
+        # Como no MySQL, NULL vem antes dos demais valores em ASC
+        return (valor is not None, valor if valor is not None else 0, item.id)
+
+    def _antes(self, chave_a: tuple, chave_b: tuple) -> bool:
+        """Indica se chave_a vem antes de chave_b na ordenação da listagem"""
+        return chave_a < chave_b if self._direcao == 'ASC' else chave_a > chave_b
+
+    def _carregada(self, item) -> bool:
+        """Indica se o item cai na parte da listagem já buscada"""
+        if not self._tem_mais:
+            return True
+        return self._ultima_chave is not None and not self._antes(self._ultima_chave, self._chave(item))
+
+    def _posicao(self, item) -> int:
+        """Índice em que o item deve ser inserido para manter a ordenação"""
+        chave = self._chave(item)
+        inicio, fim = 0, len(self.itens)
+        while inicio < fim:
+            meio = (inicio + fim) // 2
+            if self._antes(self._chave(self.itens[meio]), chave):
+                inicio = meio + 1
+            else:
+                fim = meio
+        return inicio
+
+    def item(self, row: int):
+        """Retorna o objeto exibido na linha"""
+        return self.itens[row]
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return None
@@ -0,0 +1,74 @@
+"""
+Verificação periódica de alterações no banco (QTimer + QThreadPool)
+"""
+from PySide6.QtCore import QObject, QTimer, Signal
+from services.alteracoes_service import AlteracoesService
+from utils.workers import Worker
+
+
+class MonitorAlteracoes(QObject):
+    """Dispara AlteracoesService.verificar a cada intervalo, fora da thread
+    da interface, e emite tabelas_alteradas quando alguma tabela mudou.
+
+    Se a verificação anterior ainda não terminou, o ciclo é pulado. Após uma
+    escrita feita pela própria aplicação, sincronizar() registra o novo
+    estado sem emitir o sinal: quem escreveu já recarregou o que exibe.
+    """
+
+    tabelas_alteradas = Signal(object)  # set com os nomes das tabelas
+
+    def __init__(self, service: AlteracoesService, intervalo_s: float, parent: QObject = None):
+        super().__init__(parent)
+        self.service = service
+        self._worker = None
+        self._em_andamento = False
+        self._seq = 0
+        self._descartar = 0  # resultados até esta sequência não são emitidos
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(int(intervalo_s * 1000))
+        self.timer.timeout.connect(self.verificar)
+
+    def iniciar(self):
+        """Registra o estado inicial e começa a verificar periodicamente"""
+        self.sincronizar()
+        self.timer.start()
+
+    def parar(self):
+        self.timer.stop()
+        if self._em_andamento:
+            self._worker.cancelar()
+            self._em_andamento = False
+
+    def verificar(self):
+        """Inicia uma verificação, se não houver outra em andamento"""
+        if not self._em_andamento:
+            self._disparar()
+
+    def sincronizar(self):
+        """Absorve as alterações atuais sem emitir tabelas_alteradas"""
+        if self._em_andamento:
+            self._worker.cancelar()
+        self._disparar()
+        self._descartar = self._seq
+
+    def _disparar(self):
+        self._seq += 1
+        self._worker = Worker(self.service.verificar, sequencia=self._seq)
+        self._worker.signals.concluido.connect(self._on_verificado)
+        self._worker.signals.erro.connect(self._on_erro)
+        self._em_andamento = True
+        self._worker.iniciar()
+
+    def _on_verificado(self, sequencia: int, alteradas):
+        if sequencia != self._seq:
+            return
+        self._em_andamento = False
+        if alteradas and sequencia > self._descartar:
+            self.tabelas_alteradas.emit(alteradas)
+
+    def _on_erro(self, sequencia: int, mensagem: str):
+        if sequencia != self._seq:
+            return
+        self._em_andamento = False
+        print(f"Erro ao verificar alterações: {mensagem}")
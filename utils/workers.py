@@ -0,0 +1,53 @@
+"""
+Execução de consultas em segundo plano (QThreadPool)
+"""
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+
+class WorkerSignals(QObject):
+    """Sinais emitidos por um Worker (entregues na thread da interface)"""
+    concluido = Signal(int, object)  # sequência, resultado
+    erro = Signal(int, str)  # sequência, mensagem
+
+
+class Worker(QRunnable):
+    """Executa uma função fora da thread da interface.
+
+    Cada worker carrega um número de sequência; quem o dispara compara esse
+    número com o da requisição mais recente para descartar resultados
+    obsoletos. Um worker cancelado antes de começar não executa a função, e
+    um cancelado durante a execução não emite sinais.
+    """
+
+    def __init__(self, funcao, *args, sequencia: int = 0, **kwargs):
+        super().__init__()
+        self.funcao = funcao
+        self.args = args
+        self.kwargs = kwargs
+        self.sequencia = sequencia
+        self.signals = WorkerSignals()
+        self._cancelado = False
+
+    def cancelar(self):
+        """Marca o worker como cancelado"""
+        self._cancelado = True
+
+    @property
+    def cancelado(self) -> bool:
+        return self._cancelado
+
+    def run(self):
+        if self._cancelado:
+            return
+        try:
+            resultado = self.funcao(*self.args, **self.kwargs)
+        except Exception as e:
+            if not self._cancelado:
+                self.signals.erro.emit(self.sequencia, str(e))
+            return
+        if not self._cancelado:
+            self.signals.concluido.emit(self.sequencia, resultado)
+
+    def iniciar(self, pool: QThreadPool = None):
+        """Enfileira o worker no pool (o global, por padrão)"""
+        (pool or QThreadPool.globalInstance()).start(self)